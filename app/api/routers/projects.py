@@ -1,19 +1,27 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request, Response
 from fastapi.responses import JSONResponse
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 import json
 import os
+import hashlib
 from datetime import datetime
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Polygon, LineString
 
-from app.models.project import Project, ProjectCreate, ProjectUpdate
+from app.models.project import Project, ProjectCreate, ProjectUpdate, ProjectSummary
 from app.services.excel_validator import validate_excel
-from app.services.project_service import create_project, get_project, update_project, get_all_projects, delete_project
+from app.services.upload_store import receive_upload, store_upload, discard_upload
+from app.services.project_service import (
+    create_project, get_project, get_project_by_name, update_project, get_all_projects, delete_project,
+    list_projects_page, project_store_version
+)
 
 router = APIRouter()
 
+# Page size of the project list when a cursor is given without a limit
+DEFAULT_PAGE_SIZE = 100
+
 def process_geojson(geojson_data):
     """
     Process GeoJSON data to ensure it's in the expected format.
@@ -64,22 +72,7 @@ async def create_project_endpoint(
 ):
     """Create a new construction site project"""
     try:
-        # Get file content
-        file_content = await file.read()
-        
-        # Determine file extension
-        file_extension = file.filename.split(".")[-1].lower()
-        
-        # Validate the file (Excel or CSV)
-        validation_result = validate_excel(file_content)
-        
-        if not validation_result["valid"]:
-            return JSONResponse(
-                status_code=400,
-                content={"message": "Invalid file", "errors": validation_result["errors"]}
-            )
-        
-        # Parse and process GeoJSON data to ensure correct format
+        # Parse the form fields before the upload is received, so a malformed request stores no file
         polygon_data = process_geojson(json.loads(polygon))
         map_bounds_data = process_geojson(json.loads(map_bounds))
         
@@ -134,22 +127,64 @@ async def create_project_endpoint(
             delivery_hours=delivery_hours_data
         )
         
-        # Save file to disk
-        file_path = f"data/projects/{name}/{file.filename}"
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        # Copy the upload to disk in chunks
+        try:
+            tmp_path, file_hash = await receive_upload(file)
+        except ValueError as e:
+            return JSONResponse(status_code=413, content={"message": "File too large", "errors": [str(e)]})
         
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        # Validate the file (Excel or CSV)
+        validation_result = validate_excel(tmp_path)
         
-        return create_project(project_data, file_path)
+        if not validation_result["valid"]:
+            discard_upload(tmp_path)
+            return JSONResponse(
+                status_code=400,
+                content={"message": "Invalid file", "errors": validation_result["errors"]}
+            )
+        
+        # Store the file once per content
+        file_path = store_upload(tmp_path, file_hash)
+        
+        return create_project(project_data, file_path, file_hash)
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create project: {str(e)}")
 
-@router.get("/", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
-    return get_all_projects()
+@router.get("/", response_model=List[Union[Project, ProjectSummary]])
+async def get_projects(
+    request: Request,
+    response: Response,
+    fields: str = Query("full", pattern="^(full|summary)$", description="full: complete projects, summary: ID, name, file and timestamps"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page from the Link header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size, enables pagination")
+):
+    """Get all projects, or one page of them ordered by creation time"""
+    # The store version changes with every write, so in-sync clients get a 304 without a body
+    version = project_store_version()
+    etag = '"' + hashlib.sha1(f"{version}|{fields}|{cursor}|{limit}".encode("utf-8")).hexdigest()[:20] + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    if fields == "full" and cursor is None and limit is None:
+        return get_all_projects()
+
+    if cursor is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        page, next_cursor = list_projects_page(cursor, limit, fields == "summary")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor, limit=limit)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return page
+
+@router.get("/check_name/{name}")
+async def check_project_name(name: str):
+    """Check whether a project with the name exists"""
+    return {"exists": get_project_by_name(name) is not None}
 
 @router.get("/{project_id}", response_model=Project)
 async def get_project_by_id(project_id: str):
@@ -185,28 +220,6 @@ async def update_project_endpoint(
         if name:
             update_data["name"] = name
         
-        # Process new file if uploaded
-        if file:
-            file_content = await file.read()
-            validation_result = validate_excel(file_content)
-            
-            if not validation_result["valid"]:
-                return JSONResponse(
-                    status_code=400,
-                    content={"message": "Invalid file", "errors": validation_result["errors"]}
-                )
-            
-            # Save new file
-            project_name = name or existing_project.name
-            file_path = f"data/projects/{project_name}/{file.filename}"
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            
-            with open(file_path, "wb") as f:
-                f.write(file_content)
-            
-            update_data["file_name"] = file.filename
-            update_data["file_path"] = file_path
-        
         # Process GeoJSON data
         if polygon:
             update_data["polygon"] = process_geojson(json.loads(polygon))
@@ -249,8 +262,30 @@ async def update_project_endpoint(
         if simulation_interval:
             update_data["simulation_interval"] = simulation_interval
         
-        # Update project
+        # Validate the form fields before the upload is received, so a malformed request stores no file
         project_update = ProjectUpdate(**update_data)
+        
+        # Process new file if uploaded
+        if file:
+            try:
+                tmp_path, file_hash = await receive_upload(file)
+            except ValueError as e:
+                return JSONResponse(status_code=413, content={"message": "File too large", "errors": [str(e)]})
+            validation_result = validate_excel(tmp_path)
+            
+            if not validation_result["valid"]:
+                discard_upload(tmp_path)
+                return JSONResponse(
+                    status_code=400,
+                    content={"message": "Invalid file", "errors": validation_result["errors"]}
+                )
+            
+            # Store new file once per content
+            project_update.file_name = file.filename
+            project_update.file_path = store_upload(tmp_path, file_hash)
+            project_update.file_hash = file_hash
+        
+        # Update project
         return update_project(project_id, project_update)
         
     except Exception as e:
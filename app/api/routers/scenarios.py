@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List
+from datetime import datetime
+
+from app.models.scenario import Scenario, ScenarioComparison
+from app.services.scenario_service import (
+    list_scenarios, get_scenario, save_scenario, delete_scenario, evaluate_scenario
+)
+
+router = APIRouter()
+
+@router.get("/{project_id}", response_model=List[Scenario])
+async def list_scenarios_endpoint(project_id: str):
+    """Get all scenarios of a project"""
+    return list_scenarios(project_id)
+
+@router.post("/{project_id}", response_model=Scenario)
+async def save_scenario_endpoint(project_id: str, scenario: Scenario):
+    """Create or replace a named scenario of a project"""
+    try:
+        return save_scenario(project_id, scenario)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/{project_id}/{name}", response_model=Scenario)
+async def get_scenario_endpoint(project_id: str, name: str):
+    """Get a scenario by name"""
+    scenario = get_scenario(project_id, name)
+    if not scenario:
+        raise HTTPException(status_code=404, detail=f"Scenario {name} not found")
+    return scenario
+
+@router.delete("/{project_id}/{name}")
+async def delete_scenario_endpoint(project_id: str, name: str):
+    """Delete a scenario"""
+    if not delete_scenario(project_id, name):
+        raise HTTPException(status_code=404, detail=f"Scenario {name} not found")
+    return {"message": f"Scenario {name} deleted successfully"}
+
+@router.post("/{project_id}/{name}/evaluate", response_model=ScenarioComparison)
+def evaluate_scenario_endpoint(
+    project_id: str,
+    name: str,
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    end_date: str = Query(..., description="End date in YYYY-MM-DD format")
+):
+    """Compare a scenario with the stored simulation of the project"""
+    scenario = get_scenario(project_id, name)
+    if not scenario:
+        raise HTTPException(status_code=404, detail=f"Scenario {name} not found")
+    try:
+        parsed_start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        parsed_end = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    try:
+        return evaluate_scenario(project_id, scenario, parsed_start, parsed_end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scenario evaluation failed: {str(e)}")
@@ -1,27 +1,140 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Dict, Any, Optional
+import json
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from typing import List, Dict, Any, Optional, Union, Iterator
 from datetime import datetime, time, timedelta
 
-from app.models.simulation import SimulationRequest, SimulationResult
-from app.services.simulation_service import run_simulation, get_simulation_results
+from app.models.simulation import (
+    SimulationRequest, SimulationResult, SimulationJob, CompactSimulationResult, SimulationNetwork
+)
+from app.services.simulation_service import (
+    get_simulation_results, get_day_results, get_compact_simulation_results, get_compact_day_results,
+    get_simulation_network, iter_compact_simulation_range, summarize_steps
+)
+from app.models.schedule import ScheduleOptimizationRequest, ScheduleOptimizationResult
+from app.services.schedule_optimizer import optimize_delivery_schedule
+from app.services.project_service import get_project
+from app.services.job_service import submit_simulation_job, get_job, get_jobs, cancel_job
 
 router = APIRouter()
 
-@router.post("/run", response_model=SimulationResult)
+@router.post("/run", response_model=SimulationJob, status_code=202)
 async def run_simulation_endpoint(request: SimulationRequest):
-    """Run a traffic simulation for a construction site project"""
+    """Queue a traffic simulation for a construction site project and return its job"""
     try:
-        return run_simulation(request)
+        return submit_simulation_job(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
-@router.get("/{project_id}/results", response_model=SimulationResult)
+@router.post("/run/stream")
+async def run_simulation_stream_endpoint(request: SimulationRequest):
+    """
+    Run a traffic simulation and stream its results as NDJSON while it runs.
+    
+    Every line is a JSON object: {"type": "result", "result": <compact result>} per
+    time step as soon as its day is stored, then {"type": "summary", "summary": ...},
+    or {"type": "error", "detail": ...} if the run fails after the stream started.
+    """
+    if not get_project(request.project_id):
+        raise HTTPException(status_code=400, detail=f"Project {request.project_id} not found")
+    if request.end_date < request.start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    
+    return StreamingResponse(_stream_simulation(request), media_type="application/x-ndjson")
+
+def _stream_simulation(request: SimulationRequest) -> Iterator[str]:
+    """NDJSON lines of a streamed simulation run (iterated in a worker thread by Starlette)"""
+    run_stats = {}
+    steps = []
+    try:
+        for result in iter_compact_simulation_range(request, run_stats):
+            steps.append({"id": result.id, "time": result.time, "stats": result.stats})
+            yield f'{{"type": "result", "result": {result.model_dump_json()}}}\n'
+        yield json.dumps(jsonable_encoder({"type": "summary", "summary": summarize_steps(steps, run_stats)})) + "\n"
+    except Exception as e:
+        yield json.dumps({"type": "error", "detail": f"Simulation failed: {str(e)}"}) + "\n"
+
+@router.post("/optimize-schedule", response_model=ScheduleOptimizationResult)
+def optimize_schedule_endpoint(request: ScheduleOptimizationRequest):
+    """Propose delivery slots that flatten peak access-route congestion or waiting-area overflow"""
+    try:
+        return optimize_delivery_schedule(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Schedule optimization failed: {str(e)}")
+
+@router.get("/jobs", response_model=List[SimulationJob])
+async def get_simulation_jobs_endpoint(
+    project_id: Optional[str] = Query(None, description="Only return jobs of this project")
+):
+    """Get all simulation jobs, newest first"""
+    return get_jobs(project_id)
+
+@router.get("/jobs/{job_id}", response_model=SimulationJob)
+async def get_simulation_job_endpoint(job_id: str):
+    """Get the status and progress (days done / total) of a simulation job"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Simulation job {job_id} not found")
+    return job
+
+@router.post("/jobs/{job_id}/cancel", response_model=SimulationJob)
+async def cancel_simulation_job_endpoint(job_id: str):
+    """Cancel a queued or running simulation job"""
+    job = cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Simulation job {job_id} not found")
+    return job
+
+@router.get("/jobs/{job_id}/result", response_model=Dict[str, Any])
+async def get_simulation_job_result_endpoint(job_id: str):
+    """Get the summary of a completed simulation job"""
+    job = get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Simulation job {job_id} not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Simulation job {job_id} is {job.status}")
+    return job.summary
+
+# Response formats: "verbose" embeds the geometry in every result, "compact" returns
+# arrays indexed by segment position in the network from /{project_id}/network
+RESULT_FORMAT_PATTERN = "^(verbose|compact)$"
+
+@router.get("/{project_id}/network", response_model=SimulationNetwork)
+async def get_simulation_network_endpoint(
+    project_id: str,
+    request: Request,
+    response: Response,
+    network_hash: Optional[str] = Query(None, description="Network hash from a compact result, defaults to the latest network")
+):
+    """Get the road network geometry referenced by compact simulation results"""
+    network = get_simulation_network(project_id, network_hash)
+    if not network:
+        raise HTTPException(status_code=404, detail=f"No simulation network found for project {project_id}")
+
+    # The hash identifies the geometry, so clients only need to download it once
+    etag = f'"{network.network_hash}"'
+    cache_control = "public, max-age=31536000, immutable" if network_hash else "no-cache"
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return network
+
+@router.get("/{project_id}/results", response_model=Union[SimulationResult, CompactSimulationResult])
 async def get_simulation_results_endpoint(
     project_id: str,
     date: Optional[str] = Query(None, description="Date in YYYY-MM-DD format"),
-    hour: Optional[int] = Query(None, description="Hour of the day (0-23)")
+    hour: Optional[int] = Query(None, description="Hour of the day (0-23)"),
+    time: Optional[str] = Query(None, description="Start of the time step in HH:MM format, takes precedence over hour"),
+    format: str = Query("verbose", pattern=RESULT_FORMAT_PATTERN, description="Response format: verbose or compact")
 ):
-    """Get simulation results for a project, optionally filtered by date and hour"""
+    """Get simulation results for a project, optionally filtered by date and time step"""
     try:
         # Parse date if provided
         parsed_date = None
@@ -34,17 +147,30 @@ async def get_simulation_results_endpoint(
         # Validate hour if provided
         if hour is not None and (hour < 0 or hour > 23):
             raise HTTPException(status_code=400, detail="Hour must be between 0 and 23")
-            
-        return get_simulation_results(project_id, parsed_date, hour)
+        
+        # Parse step time if provided
+        step_time = None
+        if time:
+            try:
+                step_time = datetime.strptime(time, "%H:%M").time()
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid time format. Use HH:MM")
+        
+        if format == "compact":
+            return get_compact_simulation_results(project_id, parsed_date, hour, step_time)
+        return get_simulation_results(project_id, parsed_date, hour, step_time)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve simulation results: {str(e)}")
 
 @router.get("/{project_id}/daily-traffic", response_model=Dict[str, Any])
 async def get_daily_traffic_endpoint(
     project_id: str,
-    date: str = Query(..., description="Date in YYYY-MM-DD format")
+    date: str = Query(..., description="Date in YYYY-MM-DD format"),
+    format: str = Query("verbose", pattern=RESULT_FORMAT_PATTERN, description="Response format: verbose or compact")
 ):
-    """Get hourly traffic data for a specific day"""
+    """Get the traffic data of every time step of a specific day, keyed by HH:MM"""
     try:
         # Parse date
         try:
@@ -52,18 +178,30 @@ async def get_daily_traffic_endpoint(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
             
-        # Get hourly results for the entire day
-        results = {}
-        for hour in range(24):
-            hour_results = get_simulation_results(project_id, parsed_date, hour)
-            if hour_results:
-                results[hour] = hour_results
+        if format == "compact":
+            # One read of the day file, geometry is served by /{project_id}/network
+            return {
+                "project_id": project_id,
+                "date": date,
+                "hourly_traffic": {
+                    step_time.strftime("%H:%M"): result
+                    for step_time, result in get_compact_day_results(project_id, parsed_date).items()
+                }
+            }
+        
+        # Get the results of all time steps of the day
+        results = {
+            step_time.strftime("%H:%M"): result
+            for step_time, result in get_day_results(project_id, parsed_date).items()
+        }
                 
         return {
             "project_id": project_id,
             "date": date,
             "hourly_traffic": results
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve daily traffic data: {str(e)}")
 
@@ -94,16 +232,18 @@ async def get_weekly_traffic_endpoint(
                 "hourly_data": {}
             }
             
-            for hour in range(6, 19):  # 6 AM to 6 PM
-                hour_results = get_simulation_results(project_id, current_date, hour)
-                if hour_results:
-                    traffic_volume = sum(hour_results.get("traffic_volumes", {}).values())
-                    daily_stats["hourly_data"][hour] = traffic_volume
-                    daily_stats["total_vehicles"] += traffic_volume
-                    
-                    if traffic_volume > daily_stats["peak_traffic"]:
-                        daily_stats["peak_traffic"] = traffic_volume
-                        daily_stats["peak_hour"] = hour
+            # Volumes are vehicles per hour, weight every time step by its length
+            for step_time, step_result in get_day_results(project_id, current_date).items():
+                step_hours = step_result.stats.get("interval_minutes", 60) / 60
+                traffic_volume = int(round(step_result.stats.get("total_traffic", 0) * step_hours))
+                hourly_data = daily_stats["hourly_data"]
+                hourly_data[step_time.hour] = hourly_data.get(step_time.hour, 0) + traffic_volume
+                daily_stats["total_vehicles"] += traffic_volume
+            
+            for hour, traffic_volume in daily_stats["hourly_data"].items():
+                if traffic_volume > daily_stats["peak_traffic"]:
+                    daily_stats["peak_traffic"] = traffic_volume
+                    daily_stats["peak_hour"] = hour
             
             results[date_str] = daily_stats
                 
@@ -113,5 +253,7 @@ async def get_weekly_traffic_endpoint(
             "end_date": (parsed_start_date + timedelta(days=6)).strftime("%Y-%m-%d"),
             "daily_traffic": results
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve weekly traffic data: {str(e)}") 
\ No newline at end of file
@@ -2,7 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-from app.api.routers import projects, simulation, export
+from app.api.routers import projects, simulation, export, scenarios
+from app.services.job_service import recover_jobs
 
 app = FastAPI(
     title="Construction Site Traffic Management System",
@@ -23,6 +24,12 @@ app.add_middleware(
 app.include_router(projects.router, prefix="/api/projects", tags=["Projects"])
 app.include_router(simulation.router, prefix="/api/simulation", tags=["Simulation"])
 app.include_router(export.router, prefix="/api/export", tags=["Export"])
+app.include_router(scenarios.router, prefix="/api/scenarios", tags=["Scenarios"])
+
+@app.on_event("startup")
+def resume_simulation_jobs():
+    # Resume queued jobs here rather than at import, so importing the app has no side effects
+    recover_jobs()
 
 @app.get("/")
 async def root():
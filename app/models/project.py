@@ -52,14 +52,25 @@ class ProjectUpdate(ProjectBase):
     name: Optional[str] = None # Make all fields optional for update
     file_name: Optional[str] = None
     # file_path will be updated by the service if file_name changes
+    file_path: Optional[str] = None
+    file_hash: Optional[str] = None
 
 class Project(ProjectBase):
     """Model for a project as stored in the database"""
     id: str
     file_name: str
     file_path: str
+    file_hash: Optional[str] = None  # SHA-256 of the uploaded file, None for projects created before content-addressed uploads
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True # Replaces orm_mode for Pydantic V2 
\ No newline at end of file
+        from_attributes = True # Replaces orm_mode for Pydantic V2 
+
+class ProjectSummary(BaseModel):
+    """Model for a project in lists, without geometries and traffic data"""
+    id: str
+    name: str
+    file_name: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
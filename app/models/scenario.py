@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from datetime import datetime, date
+
+class Scenario(BaseModel):
+    """Model for a named delivery scenario compared against the stored simulation of a project"""
+    name: str = Field(..., pattern=r"^[\w\- ]{1,64}$")
+    description: Optional[str] = None
+    shift_minutes: int = Field(0, ge=-720, le=720)  # Move every delivery time window by this many minutes
+    avoid_peak_hours: bool = False  # Move windows overlapping the peak hours to the closest off-peak slot
+    delivery_factor: float = Field(1.0, ge=0.0, le=10.0)  # Scale the number of deliveries
+    access_routes: Optional[List[Dict[str, Any]]] = None  # Alternative access routes (GeoJSON), None keeps the project's
+    created_at: datetime = Field(default_factory=datetime.now)
+
+class ScenarioStepDelta(BaseModel):
+    """Changes of one time step against the baseline, only for segments that changed"""
+    time: datetime
+    segment_indices: List[int]  # Positions in the network of the baseline's network_hash
+    traffic_volume_deltas: List[int]
+    congestion_level_deltas: List[float]
+
+class ScenarioComparison(BaseModel):
+    """Model for the comparison of a scenario with the stored baseline simulation"""
+    project_id: str
+    scenario: Scenario
+    start_date: date
+    end_date: date
+    network_hash: str
+    baseline: Dict[str, Any]  # KPIs of the stored simulation
+    variant: Dict[str, Any]  # KPIs of the scenario
+    difference: Dict[str, Any]  # variant - baseline
+    steps: List[ScenarioStepDelta]
+    execution_seconds: float
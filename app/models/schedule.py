@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from datetime import date
+
+class ScheduleOptimizationRequest(BaseModel):
+    """Model for a delivery schedule optimization request"""
+    project_id: str
+    start_date: date
+    end_date: date
+    objective: str = Field("congestion", pattern="^(congestion|waiting)$")  # Peak access-route congestion or waiting-area overflow
+    max_iterations: int = Field(500, ge=0, le=10000)  # Local search moves per day
+
+class ScheduledDelivery(BaseModel):
+    """Proposed slot of one delivery of the Deliveries sheet"""
+    row: int  # Row of the delivery in the Deliveries sheet
+    vehicle_type: Optional[str] = None
+    original_date: date
+    original_time_window: str
+    date: date
+    time_window: str
+    moved: bool
+
+class ScheduleOptimizationResult(BaseModel):
+    """Model for a proposed delivery schedule and its KPIs compared with the current schedule"""
+    project_id: str
+    objective: str
+    start_date: date
+    end_date: date
+    schedule: List[ScheduledDelivery]
+    baseline: Dict[str, Any]  # KPIs of the current schedule
+    optimized: Dict[str, Any]  # KPIs of the proposed schedule
+    improvement: Dict[str, Any]  # baseline - optimized, positive is better
+    candidates_evaluated: int
+    execution_seconds: float
@@ -8,7 +8,11 @@ class SimulationRequest(BaseModel):
     project_id: str
     start_date: date
     end_date: date
-    time_interval: str = "1h"  # e.g., "1h", "30m"
+    time_interval: Optional[str] = None  # e.g., "1h", "30m", "15m"; defaults to the project's simulation_interval
+    force_recompute: bool = False  # Simulate all days even if their inputs are unchanged
+    replications: int = Field(1, ge=1, le=1000)  # Ensemble size, more than 1 stores p10/p50/p90
+    seed: Optional[int] = None  # Base seed for reproducible runs
+    engine: str = Field("statistical", pattern="^(statistical|link_queue)$")  # Traffic model, link_queue propagates queues between edges
     
 class TrafficSegment(BaseModel):
     """Model for a road segment with traffic data"""
@@ -20,6 +24,11 @@ class TrafficSegment(BaseModel):
     traffic_volume: int
     congestion_level: float  # 0.0 - 1.0
     coordinates: List[List[float]]  # [[lon1, lat1], [lon2, lat2], ...]
+    # Ensemble runs only: traffic_volume and congestion_level hold the median, these the 10th/90th percentile
+    traffic_volume_p10: Optional[int] = None
+    traffic_volume_p90: Optional[int] = None
+    congestion_level_p10: Optional[float] = None
+    congestion_level_p90: Optional[float] = None
     
 class SimulationTimeStep(BaseModel):
     """Model for simulation data at a specific time step"""
@@ -46,4 +55,47 @@ class SimulationSummary(BaseModel):
     peak_hour: int
     peak_traffic_volume: int
     average_congestion: float
-    congestion_hotspots: List[str] 
\ No newline at end of file
+    congestion_hotspots: List[str] 
+
+class SimulationJob(BaseModel):
+    """Model for a simulation running in the background"""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    project_id: str
+    request: SimulationRequest
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    days_total: int = 0
+    days_done: int = 0
+    created_at: datetime = Field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None  # Set when the job has completed
+
+class SimulationNetwork(BaseModel):
+    """Model for the road network geometry shared by all time steps of a simulation"""
+    project_id: str
+    network_hash: str
+    segment_ids: List[str]
+    start_nodes: List[str]
+    end_nodes: List[str]
+    lengths: List[float]
+    speed_limits: List[float]
+    coordinates: List[List[List[float]]]  # Per segment: [[lon1, lat1], [lon2, lat2], ...]
+
+class CompactSimulationResult(BaseModel):
+    """Model for simulation results without geometry, arrays are indexed by segment position in the network"""
+    id: str
+    project_id: str
+    execution_time: datetime
+    time: datetime
+    network_hash: str  # Identifies the SimulationNetwork the arrays refer to
+    traffic_volumes: List[int]
+    congestion_levels: List[float]
+    congestion_points: List[int]  # Positions of highly congested segments
+    waiting_areas_status: Dict[str, Any]
+    stats: Dict[str, Any]
+    # Ensemble runs only: 10th/90th percentiles, the arrays above hold the median
+    traffic_volumes_p10: Optional[List[int]] = None
+    traffic_volumes_p90: Optional[List[int]] = None
+    congestion_levels_p10: Optional[List[float]] = None
+    congestion_levels_p90: Optional[List[float]] = None
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+# Matches time windows like "08:00-10:30" or "8-10", capturing start and end hour and minute
+TIME_WINDOW_PATTERN = r"^\s*(\d{1,2})(?::(\d{2}))?\s*-\s*(\d{1,2})(?::(\d{2}))?\s*$"
+
+def minute_of_day(value: Optional[str], default: str) -> int:
+    """
+    Minute of the day of a "HH:MM" time (seconds are ignored), or of the default if no time is set.
+
+    Raises:
+        ValueError: If the time is set but not given as HH:MM
+    """
+    try:
+        parsed = datetime.strptime(str(value)[:5] if value else default, "%H:%M")
+    except ValueError:
+        raise ValueError(f"Time must be given as HH:MM, got {value!r}")
+    return parsed.hour * 60 + parsed.minute
+
+def parse_time_windows(deliveries: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add integer StartMinute and EndMinute columns (minutes of the day) parsed from the TimeWindow strings.
+
+    Deliveries without a readable time window get StartMinute -1 and EndMinute -2,
+    so they are not active in any time step.
+
+    Args:
+        deliveries: Deliveries sheet with a TimeWindow column
+
+    Returns:
+        Copy of the deliveries with the StartMinute and EndMinute columns
+    """
+    deliveries = deliveries.copy()
+    if "TimeWindow" in deliveries.columns:
+        parts = deliveries["TimeWindow"].astype(str).str.extract(TIME_WINDOW_PATTERN)
+    else:
+        parts = pd.DataFrame(np.nan, index=deliveries.index, columns=[0, 1, 2, 3])
+    parts = parts.apply(pd.to_numeric, errors="coerce")
+
+    start = parts[0] * 60 + parts[1].fillna(0)
+    end = parts[2] * 60 + parts[3].fillna(0)
+    deliveries["StartMinute"] = start.fillna(-1).astype(np.int64)
+    deliveries["EndMinute"] = end.fillna(-2).astype(np.int64)
+    return deliveries
+
+def step_incidence(deliveries: pd.DataFrame, step_starts: np.ndarray, step_minutes: int) -> np.ndarray:
+    """
+    Build the delivery x time step incidence matrix.
+
+    A delivery is active in a step if its time window (end inclusive) overlaps the
+    step, so hourly steps count a "08:00-10:00" window in the hours 8, 9 and 10.
+
+    Args:
+        deliveries: Deliveries with StartMinute and EndMinute columns, shape (D,)
+        step_starts: Start of every time step in minutes of the day, shape (T,)
+        step_minutes: Length of a time step in minutes
+
+    Returns:
+        Boolean matrix of shape (D, T)
+    """
+    start = deliveries["StartMinute"].to_numpy()[:, None]
+    end = deliveries["EndMinute"].to_numpy()[:, None]
+    step_starts = np.asarray(step_starts)[None, :]
+    return (step_starts <= end) & (step_starts + step_minutes > start)
+
+def step_delivery_counts(deliveries: pd.DataFrame, step_starts: np.ndarray, step_minutes: int) -> Dict[str, Any]:
+    """
+    Count the deliveries of each time step, in total and per vehicle type.
+
+    Args:
+        deliveries: Deliveries of one day with StartMinute, EndMinute and VehicleType columns
+        step_starts: Start of every time step in minutes of the day, shape (T,)
+        step_minutes: Length of a time step in minutes
+
+    Returns:
+        Dictionary with "deliveries" (T,) counting all deliveries, "vehicles" (T,)
+        counting deliveries with a known vehicle type and "by_vehicle_type"
+        (vehicle type -> (T,) counts)
+    """
+    incidence = step_incidence(deliveries, step_starts, step_minutes).astype(np.int64)
+
+    if "VehicleType" in deliveries.columns:
+        codes, vehicle_types = pd.factorize(deliveries["VehicleType"])
+    else:
+        codes, vehicle_types = np.full(len(deliveries), -1), pd.Index([])
+
+    # One-hot (V, D) matrix times the (D, T) incidence gives the (V, T) counts per type
+    known = codes >= 0
+    one_hot = np.zeros((len(vehicle_types), len(deliveries)), dtype=np.int64)
+    one_hot[codes[known], np.flatnonzero(known)] = 1
+    by_type = one_hot @ incidence
+
+    return {
+        "deliveries": incidence.sum(axis=0),
+        "vehicles": by_type.sum(axis=0),
+        "by_vehicle_type": {str(vehicle_type): by_type[i] for i, vehicle_type in enumerate(vehicle_types)}
+    }
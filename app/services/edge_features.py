@@ -0,0 +1,231 @@
+import os
+import glob
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import osmnx as ox
+from shapely.geometry import shape
+from shapely.ops import unary_union
+from typing import Dict, List, Any, Optional
+
+from app.services.network_cache import get_network, bbox_polygon
+from app.services.truck_routing import compute_route_shares
+
+# Per-project edge feature tables, one GeoParquet file per project and geometry hash
+EDGE_FEATURES_DIR = "data/prepared/edge_features"
+
+# Bump when the columns or their computation change to invalidate existing tables
+EDGE_FEATURES_VERSION = 3
+
+# Metric CRS used for lengths and distances (Swiss LV95)
+METRIC_CRS = "EPSG:2056"
+
+# Edges closer than this to a drawn access route count as part of it (in metres)
+ACCESS_ROUTE_TOLERANCE_M = 40.0
+
+# Capacity mapping for OSM highway types (vehicles per hour)
+CAPACITY_MAP = {
+    'motorway': 2000, 'trunk': 1800, 'primary': 1500,
+    'secondary': 1000, 'tertiary': 700,
+    'motorway_link': 1000, 'trunk_link': 900, 'primary_link': 750,
+    'secondary_link': 500, 'tertiary_link': 350,
+    'residential': 400, 'unclassified': 300, 'road': 300,
+    'living_street': 100, 'service': 150, 'track': 50, 'path': 30,
+    'cycleway': 50, 'footway': 20, 'pedestrian': 20, 'steps': 10
+}
+DEFAULT_CAPACITY = 200
+
+_build_lock = threading.Lock()
+
+def geometry_hash(
+    polygon: Optional[Dict[str, Any]],
+    map_bounds: Optional[Dict[str, Any]],
+    access_routes: Optional[List[Dict[str, Any]]]
+) -> str:
+    """Hash of all project geometries the edge features depend on."""
+    payload = json.dumps(
+        {
+            "version": EDGE_FEATURES_VERSION,
+            "polygon": polygon,
+            "map_bounds": map_bounds,
+            "access_routes": access_routes or []
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def edge_features_path(project_id: str, geom_hash: str) -> str:
+    """Path of the edge feature table for a project and geometry hash."""
+    return os.path.join(EDGE_FEATURES_DIR, f"{project_id}_{geom_hash}.parquet")
+
+def capacity_for_highway(highway: Any) -> int:
+    """Capacity of an OSM highway type (first entry if OSM returned a list)."""
+    if isinstance(highway, list):
+        highway = highway[0] if highway else None
+    return CAPACITY_MAP.get(highway, DEFAULT_CAPACITY)
+
+def build_edge_features(
+    project_id: str,
+    polygon: Dict[str, Any],
+    map_bounds: Dict[str, Any],
+    access_routes: Optional[List[Dict[str, Any]]] = None
+) -> Optional[gpd.GeoDataFrame]:
+    """
+    Fetch the road network of a project and write its per-edge feature table.
+
+    Args:
+        project_id: ID of the project
+        polygon: GeoJSON polygon of the construction site
+        map_bounds: GeoJSON polygon of the simulated area
+        access_routes: GeoJSON geometries of the access routes
+
+    Returns:
+        GeoDataFrame with one row per edge, or None if the geometries are incomplete
+    """
+    if not _has_coordinates(polygon) or not _has_coordinates(map_bounds):
+        return None
+
+    G = get_network(bbox_polygon(map_bounds), network_type="drive")
+    G = ox.add_edge_speeds(G)
+    edges = ox.graph_to_gdfs(G, nodes=False, edges=True, fill_edge_geometry=True)
+
+    features = compute_edge_features(edges, polygon, access_routes)
+
+    geom_hash = geometry_hash(polygon, map_bounds, access_routes)
+    with _build_lock:
+        os.makedirs(EDGE_FEATURES_DIR, exist_ok=True)
+        # Drop tables of previous geometries
+        for stale_path in glob.glob(os.path.join(EDGE_FEATURES_DIR, f"{project_id}_*.parquet")):
+            os.remove(stale_path)
+        features.to_parquet(edge_features_path(project_id, geom_hash))
+
+    return features
+
+def compute_edge_features(
+    edges: gpd.GeoDataFrame,
+    polygon: Dict[str, Any],
+    access_routes: Optional[List[Dict[str, Any]]] = None
+) -> gpd.GeoDataFrame:
+    """Compute the per-edge feature columns from an OSMnx edge GeoDataFrame (u, v, key index)."""
+    edges_metric = edges.to_crs(METRIC_CRS)
+    site_metric = gpd.GeoSeries([shape(polygon)], crs="EPSG:4326").to_crs(METRIC_CRS).iloc[0]
+
+    highway = edges["highway"] if "highway" in edges.columns else pd.Series(None, index=edges.index)
+    name = edges["name"] if "name" in edges.columns else pd.Series("", index=edges.index)
+    if "speed_kph" in edges.columns:
+        speed_kph = pd.to_numeric(edges["speed_kph"], errors="coerce").fillna(50.0)
+    else:
+        speed_kph = pd.Series(50.0, index=edges.index)
+
+    u, v, key = (edges.index.get_level_values(i) for i in range(3))
+
+    features = gpd.GeoDataFrame(
+        {
+            # The key tells parallel edges apart (e.g. two carriageways between the same nodes)
+            "segment_id": [f"{a}_{b}_{k}" for a, b, k in zip(u, v, key)],
+            "u": np.asarray(u, dtype=np.int64),
+            "v": np.asarray(v, dtype=np.int64),
+            "key": np.asarray(key, dtype=np.int64),
+            "highway": [h[0] if isinstance(h, list) and h else (str(h) if pd.notnull(h) else "unknown") for h in highway],
+            "name": [n[0] if isinstance(n, list) and n else (str(n) if pd.notnull(n) else "") for n in name],
+            "capacity": [capacity_for_highway(h) for h in highway],
+            "speed_kph": speed_kph.to_numpy(dtype=float),
+            "length_m": edges_metric.geometry.length.to_numpy(dtype=float),
+            "distance_to_site_m": edges_metric.geometry.distance(site_metric).to_numpy(dtype=float),
+            "on_access_route": _access_route_mask(edges_metric, access_routes)
+        },
+        geometry=edges.geometry.to_numpy(),
+        crs=edges.crs
+    )
+
+    # Share of the delivery trips on each edge, from the routes between the network boundary and the site
+    route_shares = compute_route_shares(features.to_crs(METRIC_CRS), site_metric)
+    features["inbound_route_share"] = route_shares["inbound"]
+    features["outbound_route_share"] = route_shares["outbound"]
+    return features.to_crs("EPSG:4326")
+
+def reroute_edge_features(
+    features: gpd.GeoDataFrame,
+    polygon: Dict[str, Any],
+    access_routes: Optional[List[Dict[str, Any]]]
+) -> Dict[str, np.ndarray]:
+    """
+    Route shares of an existing edge feature table for other access routes, without fetching the network.
+
+    Returns:
+        Dictionary with the "inbound" and "outbound" route share per edge, shape (E,)
+    """
+    edges_metric = features.to_crs(METRIC_CRS)
+    edges_metric["on_access_route"] = _access_route_mask(edges_metric, access_routes)
+    site_metric = gpd.GeoSeries([shape(polygon)], crs="EPSG:4326").to_crs(METRIC_CRS).iloc[0]
+    return compute_route_shares(edges_metric, site_metric)
+
+def load_edge_features(
+    project_id: str,
+    polygon: Dict[str, Any],
+    map_bounds: Dict[str, Any],
+    access_routes: Optional[List[Dict[str, Any]]] = None,
+    build: bool = True
+) -> Optional[gpd.GeoDataFrame]:
+    """
+    Load the edge feature table of a project.
+
+    The table is only used if it was built from the current geometries. Otherwise it
+    is rebuilt (if build is True) or None is returned.
+    """
+    path = edge_features_path(project_id, geometry_hash(polygon, map_bounds, access_routes))
+    if os.path.exists(path):
+        try:
+            return gpd.read_parquet(path)
+        except Exception as e:
+            print(f"Error loading edge features for project {project_id}: {str(e)}")
+
+    if not build:
+        return None
+    return build_edge_features(project_id, polygon, map_bounds, access_routes)
+
+def refresh_edge_features_async(
+    project_id: str,
+    polygon: Dict[str, Any],
+    map_bounds: Dict[str, Any],
+    access_routes: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """Rebuild the edge feature table of a project in a background thread if it is stale."""
+    if not _has_coordinates(polygon) or not _has_coordinates(map_bounds):
+        return
+    if os.path.exists(edge_features_path(project_id, geometry_hash(polygon, map_bounds, access_routes))):
+        return
+
+    def _build():
+        try:
+            build_edge_features(project_id, polygon, map_bounds, access_routes)
+        except Exception as e:
+            print(f"Error building edge features for project {project_id}: {str(e)}")
+
+    threading.Thread(target=_build, daemon=True).start()
+
+def _access_route_mask(
+    edges_metric: gpd.GeoDataFrame,
+    access_routes: Optional[List[Dict[str, Any]]]
+) -> np.ndarray:
+    """Flag edges that lie on one of the drawn access routes."""
+    route_geoms = []
+    for route in access_routes or []:
+        try:
+            geom = shape(route)
+        except Exception:
+            continue  # Skip invalid geometries silently
+        route_geoms.append(geom.exterior if geom.geom_type == "Polygon" else geom)
+
+    if not route_geoms:
+        return np.zeros(len(edges_metric), dtype=bool)
+
+    routes_metric = gpd.GeoSeries([unary_union(route_geoms)], crs="EPSG:4326").to_crs(METRIC_CRS).iloc[0]
+    return (edges_metric.geometry.distance(routes_metric) <= ACCESS_ROUTE_TOLERANCE_M).to_numpy()
+
+def _has_coordinates(geojson: Optional[Dict[str, Any]]) -> bool:
+    return bool(geojson and geojson.get("coordinates"))
@@ -1,32 +1,35 @@
 import pandas as pd
 import io
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 
-def validate_excel(file_content: bytes) -> Dict[str, Any]:
+def validate_excel(file_content: Union[bytes, str]) -> Dict[str, Any]:
     """
-    Validate Excel or CSV file
+    Validate Excel or CSV file (its content or the path of a stored upload)
     """
     try:
         # Try to detect file type from first few bytes
-        file_obj = io.BytesIO(file_content)
+        file_obj = io.BytesIO(file_content) if isinstance(file_content, bytes) else open(file_content, "rb")
         
-        # Try to read as Excel first
         try:
-            df = pd.read_excel(file_obj, engine='openpyxl')
-            file_format = "excel"
-        except Exception as excel_err:
-            # If Excel fails, try as CSV
-            file_obj.seek(0)  # Reset file pointer
+            # Try to read as Excel first
             try:
-                df = pd.read_csv(file_obj)
-                file_format = "csv"
-            except Exception as csv_err:
-                return {
-                    "valid": False,
-                    "errors": [
-                        f"File is neither a valid Excel nor CSV file. Excel error: {str(excel_err)}. CSV error: {str(csv_err)}"
-                    ]
-                }
+                df = pd.read_excel(file_obj, engine='openpyxl')
+                file_format = "excel"
+            except Exception as excel_err:
+                # If Excel fails, try as CSV
+                file_obj.seek(0)  # Reset file pointer
+                try:
+                    df = pd.read_csv(file_obj)
+                    file_format = "csv"
+                except Exception as csv_err:
+                    return {
+                        "valid": False,
+                        "errors": [
+                            f"File is neither a valid Excel nor CSV file. Excel error: {str(excel_err)}. CSV error: {str(csv_err)}"
+                        ]
+                    }
+        finally:
+            file_obj.close()
         
         # Lowercase column names for case-insensitive comparison
         df_columns_lower = [col.lower() for col in df.columns]
@@ -70,6 +73,12 @@ def validate_excel(file_content: bytes) -> Dict[str, Any]:
                 "errors": [f"Invalid numeric format in 'material' column: {str(e)}"]
             }
         
+        # Check the optional UnloadingMinutes column of the Vehicles sheet used by the waiting area model
+        if file_format == "excel":
+            vehicle_errors = _check_vehicles_sheet(file_content)
+            if vehicle_errors:
+                return {"valid": False, "errors": vehicle_errors}
+        
         return {
             "valid": True,
             "data": df_standardized,
@@ -80,4 +89,30 @@ def validate_excel(file_content: bytes) -> Dict[str, Any]:
         return {
             "valid": False,
             "errors": [f"Invalid file: {str(e)}"]
-        } 
\ No newline at end of file
+        } 
+
+def _check_vehicles_sheet(file_content: Union[bytes, str]) -> List[str]:
+    """
+    Check the optional UnloadingMinutes column of the Vehicles sheet, if the workbook has one.
+
+    Empty cells are allowed (the simulation uses its default unloading time), other
+    values must be a positive number of minutes.
+    """
+    file_obj = io.BytesIO(file_content) if isinstance(file_content, bytes) else open(file_content, "rb")
+    try:
+        try:
+            vehicles = pd.read_excel(file_obj, sheet_name="Vehicles", engine='openpyxl')
+        except Exception:
+            return []  # Workbooks without a Vehicles sheet are checked by the simulation
+    finally:
+        file_obj.close()
+    
+    if "UnloadingMinutes" not in vehicles.columns:
+        return []
+    
+    minutes = pd.to_numeric(vehicles["UnloadingMinutes"], errors="coerce")
+    invalid = vehicles["UnloadingMinutes"].notna() & ~(minutes > 0)
+    if invalid.any():
+        rows = ", ".join(str(i + 2) for i in vehicles.index[invalid]) # Excel row numbers below the header
+        return [f"Invalid 'UnloadingMinutes' in Vehicles sheet rows {rows}: must be a positive number of minutes"]
+    return []
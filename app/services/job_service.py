@@ -0,0 +1,246 @@
+import os
+import json
+import tempfile
+import threading
+from filelock import FileLock, Timeout
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from app.models.simulation import SimulationRequest, SimulationJob
+from app.services.project_service import get_project
+from app.services.simulation_service import iter_simulation_range, summarize_steps, SimulationCancelled
+
+# Job table, persisted so job states survive an API restart
+JOBS_FILE = "data/simulations/jobs.json"
+
+# Number of simulation jobs executed at the same time
+SIMULATION_JOB_WORKERS = int(os.getenv("SIMULATION_JOB_WORKERS", "1"))
+
+# Statuses of jobs that will not change anymore
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+
+# In-memory job table: job_id -> SimulationJob
+JOBS: Dict[str, SimulationJob] = {}
+
+_CANCEL_EVENTS: Dict[str, threading.Event] = {}
+_JOBS_LOCK = threading.Lock()
+_EXECUTOR = ThreadPoolExecutor(max_workers=SIMULATION_JOB_WORKERS, thread_name_prefix="simulation-job")
+_OWNER_LOCK = FileLock(f"{JOBS_FILE}.owner.lock")  # Held for its lifetime by the process that resumed the jobs
+
+def recover_jobs() -> None:
+    """
+    Load the job table and resume it, called once from the API startup hook.
+
+    Jobs run inside the API process, so only one process may resume them. An API
+    worker that cannot claim the table leaves the jobs of the owning worker alone.
+    """
+    os.makedirs(os.path.dirname(JOBS_FILE), exist_ok=True)
+    try:
+        _OWNER_LOCK.acquire(timeout=0)
+    except Timeout:
+        print("Simulation jobs are resumed by another API process, run the API with a single worker")
+        return
+    _load_jobs_from_disk()
+
+def submit_simulation_job(request: SimulationRequest) -> SimulationJob:
+    """
+    Queue a simulation run and return immediately.
+
+    Runs are deterministic, so a request identical to a queued or running job
+    returns that job instead of simulating the same days twice.
+
+    Args:
+        request: SimulationRequest with simulation parameters
+
+    Returns:
+        The queued SimulationJob
+
+    Raises:
+        ValueError: If the project is not found or the date range is invalid
+    """
+    if not get_project(request.project_id):
+        raise ValueError(f"Project {request.project_id} not found")
+    if request.end_date < request.start_date:
+        raise ValueError("End date must be after start date")
+
+    with _JOBS_LOCK:
+        for existing in JOBS.values():
+            cancelling = existing.id in _CANCEL_EVENTS and _CANCEL_EVENTS[existing.id].is_set()
+            if existing.status not in FINISHED_STATUSES and not cancelling and existing.request == request:
+                return existing
+
+        job = SimulationJob(
+            project_id=request.project_id,
+            request=request,
+            days_total=(request.end_date - request.start_date).days + 1
+        )
+        JOBS[job.id] = job
+        _save_jobs_to_disk()
+
+    _enqueue(job)
+    return job
+
+def get_job(job_id: str) -> Optional[SimulationJob]:
+    """
+    Get a simulation job by ID.
+
+    Args:
+        job_id: The ID of the job
+
+    Returns:
+        The SimulationJob if found, None otherwise
+    """
+    return JOBS.get(job_id)
+
+def get_jobs(project_id: Optional[str] = None) -> List[SimulationJob]:
+    """
+    Get all simulation jobs, newest first, optionally filtered by project.
+
+    Args:
+        project_id: ID of the project to filter by
+
+    Returns:
+        List of SimulationJob objects
+    """
+    jobs = [job for job in JOBS.values() if project_id is None or job.project_id == project_id]
+    return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+def cancel_job(job_id: str) -> Optional[SimulationJob]:
+    """
+    Cancel a queued or running simulation job.
+
+    A running job stops after the days that are currently being simulated.
+
+    Args:
+        job_id: The ID of the job to cancel
+
+    Returns:
+        The SimulationJob if found, None otherwise
+    """
+    with _JOBS_LOCK:
+        job = JOBS.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+
+        if job_id in _CANCEL_EVENTS:
+            _CANCEL_EVENTS[job_id].set()
+
+        if job.status == "queued":
+            # Not started yet, the worker will skip it
+            job.status = "cancelled"
+            job.finished_at = datetime.now()
+            _save_jobs_to_disk()
+    return job
+
+def _enqueue(job: SimulationJob) -> None:
+    """Hand a queued job to the worker pool."""
+    _CANCEL_EVENTS[job.id] = threading.Event()
+    _EXECUTOR.submit(_run_job, job.id)
+
+def _run_job(job_id: str) -> None:
+    """Execute a simulation job in a worker thread."""
+    cancel_event = _CANCEL_EVENTS[job_id]
+
+    with _JOBS_LOCK:
+        job = JOBS[job_id]
+        if job.status != "queued" or cancel_event.is_set():
+            _CANCEL_EVENTS.pop(job_id, None)
+            return
+        job.status = "running"
+        job.started_at = datetime.now()
+        _save_jobs_to_disk()
+
+    def on_progress(days_done: int, days_total: int) -> None:
+        with _JOBS_LOCK:
+            job.days_done = days_done
+            job.days_total = days_total
+            _save_jobs_to_disk()
+
+    try:
+        run_stats: Dict[str, Any] = {}
+        steps = []
+        for day_results in iter_simulation_range(
+            job.request, progress_callback=on_progress, cancel_event=cancel_event, run_stats=run_stats
+        ):
+            # The days are stored already, keep only what the summary needs and drop the results
+            steps.extend(
+                {"id": result.id, "time": result.time_steps[0].time, "stats": result.stats} for result in day_results
+            )
+        summary = summarize_steps(steps, run_stats)
+        with _JOBS_LOCK:
+            job.status = "completed"
+            job.days_done = job.days_total
+            job.summary = summary
+    except SimulationCancelled:
+        with _JOBS_LOCK:
+            job.status = "cancelled"
+    except Exception as e:
+        print(f"Error in simulation job {job_id}: {str(e)}")
+        with _JOBS_LOCK:
+            job.status = "failed"
+            job.error = str(e)
+    finally:
+        with _JOBS_LOCK:
+            job.finished_at = datetime.now()
+            _CANCEL_EVENTS.pop(job_id, None)
+            _save_jobs_to_disk()
+
+def _save_jobs_to_disk() -> None:
+    """Save the job table to disk, keeping the jobs of other processes (caller holds _JOBS_LOCK)"""
+    try:
+        os.makedirs(os.path.dirname(JOBS_FILE), exist_ok=True)
+
+        with FileLock(f"{JOBS_FILE}.lock"):
+            jobs_data = {job_dict["id"]: job_dict for job_dict in _read_jobs_file()}
+            jobs_data.update((job.id, job.model_dump()) for job in JOBS.values())
+
+            # Write to a temporary file first so a crash never leaves a truncated table
+            fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(JOBS_FILE), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(list(jobs_data.values()), f, default=str, indent=2)
+                os.replace(tmp_file, JOBS_FILE)
+            except Exception:
+                os.remove(tmp_file)
+                raise
+
+    except Exception as e:
+        print(f"Error saving simulation jobs: {str(e)}")
+
+def _load_jobs_from_disk() -> None:
+    """
+    Load the job table from disk.
+
+    Jobs that were queued or running when the API stopped are queued again; days a
+    running job had already stored are reused when it runs again.
+    """
+    try:
+        with FileLock(f"{JOBS_FILE}.lock"):
+            jobs_data = _read_jobs_file()
+
+        requeue = []
+        with _JOBS_LOCK:
+            for job_dict in jobs_data:
+                job = SimulationJob(**job_dict)
+                if job.status == "running":
+                    job.status = "queued"
+                    job.started_at = None
+                    job.days_done = 0
+                if job.status == "queued":
+                    requeue.append(job)
+                JOBS[job.id] = job
+            _save_jobs_to_disk()
+
+        for job in requeue:
+            _enqueue(job)
+
+    except Exception as e:
+        print(f"Error loading simulation jobs: {str(e)}")
+
+def _read_jobs_file() -> List[Dict[str, Any]]:
+    """Read the job table from disk as dictionaries (caller holds the file lock)"""
+    if not os.path.exists(JOBS_FILE):
+        return []
+    with open(JOBS_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
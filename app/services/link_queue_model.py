@@ -0,0 +1,224 @@
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, List, Any, Optional
+
+from app.services.traffic_model import compute_edge_traffic
+
+# Share of the vehicles leaving an edge that leave the network at its end node
+# (reach their destination or turn into roads outside the graph)
+EXIT_SHARE = 0.3
+
+# Storage of an edge: vehicles per metre of road at jam density, at least a few vehicles per edge
+JAM_DENSITY_PER_M = 0.15
+MIN_STORAGE_VEHICLES = 2.0
+
+# Minutes simulated before the first reported step so the queues start filled
+WARMUP_MINUTES = 30
+
+def build_turning_matrix(
+    start_nodes: List[str],
+    end_nodes: List[str],
+    capacity: np.ndarray,
+    exit_share: float = EXIT_SHARE
+) -> sp.csr_matrix:
+    """
+    Build the sparse turning matrix of a road network.
+
+    Entry (i, j) is the share of the vehicles leaving edge i that turn into edge j.
+    Vehicles are split over the successor edges in proportion to their capacity;
+    U-turns are only used at dead ends. Each row sums to 1 - exit_share, edges
+    without successors send all vehicles out of the network.
+
+    Args:
+        start_nodes: Start node of every edge, shape (E,)
+        end_nodes: End node of every edge, shape (E,)
+        capacity: Capacity of every edge in vehicles per hour, shape (E,)
+        exit_share: Share of the vehicles leaving the network at every node
+
+    Returns:
+        Sparse (E, E) matrix in CSR format
+    """
+    n_edges = len(start_nodes)
+    _, codes = np.unique(np.concatenate([np.asarray(start_nodes), np.asarray(end_nodes)]), return_inverse=True)
+    u, v = codes[:n_edges], codes[n_edges:]
+
+    # Edges grouped by start node, so the successors of edge i are one slice of by_start
+    by_start = np.argsort(u, kind="stable")
+    starts_per_node = np.bincount(u, minlength=codes.max() + 1)
+    node_offset = np.cumsum(starts_per_node) - starts_per_node
+
+    # All (edge, successor) pairs without a Python loop
+    n_successors = starts_per_node[v]
+    rows = np.repeat(np.arange(n_edges), n_successors)
+    position = np.arange(len(rows)) - np.repeat(np.cumsum(n_successors) - n_successors, n_successors)
+    cols = by_start[np.repeat(node_offset[v], n_successors) + position]
+
+    # Drop U-turns unless they are the only way to continue
+    u_turn = v[cols] == u[rows]
+    other_turns = np.bincount(rows[~u_turn], minlength=n_edges)
+    keep = ~u_turn | (other_turns[rows] == 0)
+    rows, cols = rows[keep], cols[keep]
+
+    weights = np.maximum(np.asarray(capacity, dtype=float)[cols], 1.0)
+    row_total = np.bincount(rows, weights=weights, minlength=n_edges)
+    weights = weights / row_total[rows] * (1.0 - exit_share)
+
+    return sp.csr_matrix((weights, (rows, cols)), shape=(n_edges, n_edges))
+
+def prepare_link_queue_network(
+    start_nodes: List[str],
+    end_nodes: List[str],
+    length: np.ndarray,
+    speed_limit: np.ndarray,
+    capacity: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Precompute the network arrays of the link-queue model once per run.
+
+    Args:
+        start_nodes: Start node of every edge, shape (E,)
+        end_nodes: End node of every edge, shape (E,)
+        length: Length of every edge in metres, shape (E,)
+        speed_limit: Free-flow speed of every edge in km/h, shape (E,)
+        capacity: Capacity of every edge in vehicles per hour, shape (E,)
+
+    Returns:
+        Dictionary with the turning matrix, its transpose and the per-edge
+        (E, 1) columns used by simulate_link_queue
+    """
+    capacity = np.asarray(capacity, dtype=float)
+    length = np.asarray(length, dtype=float)
+    speed_m_per_min = np.maximum(np.asarray(speed_limit, dtype=float), 5.0) * 1000 / 60
+    travel_time = length / speed_m_per_min  # minutes
+
+    turning = build_turning_matrix(start_nodes, end_nodes, capacity)
+    return {
+        "turning": turning,
+        "turning_t": turning.T.tocsr(),
+        "exit_share": (1.0 - np.asarray(turning.sum(axis=1)).ravel())[:, None],
+        "leave_share": np.minimum(1.0, 1.0 / np.maximum(travel_time, 1e-6))[:, None],
+        "capacity_per_minute": (capacity / 60)[:, None],
+        "storage": np.maximum(length * JAM_DENSITY_PER_M, MIN_STORAGE_VEHICLES)[:, None]
+    }
+
+def simulate_link_queue(
+    network: Dict[str, Any],
+    step_starts: np.ndarray,
+    step_minutes: int,
+    demand: np.ndarray,
+    warmup_minutes: int = WARMUP_MINUTES
+) -> Dict[str, np.ndarray]:
+    """
+    Propagate vehicles through the network in 1-minute steps and aggregate them per time step.
+
+    Every minute each edge sends the vehicles that reached its end (at most its
+    capacity), the turning matrix distributes them over the successor edges, and
+    each edge admits only as many as it has room for. Blocked vehicles stay on the
+    upstream edge, so queues spill back through the network. All edges (and
+    replications) are updated together with two sparse matrix products per minute.
+
+    Args:
+        network: Network arrays from prepare_link_queue_network
+        step_starts: Start of every reported time step in minutes of the day, shape (T,)
+        step_minutes: Length of a reported time step in minutes
+        demand: Vehicles entering the network on every edge in vehicles per hour,
+            shape (T, E, R) for R replications
+
+    Returns:
+        Dictionary with "traffic_volume" (vehicles per hour leaving each edge) and
+        "congestion_level" (vehicles ready to leave relative to the capacity), both (T, E, R)
+    """
+    turning, turning_t = network["turning"], network["turning_t"]
+    exit_share, leave_share = network["exit_share"], network["leave_share"]
+    capacity, storage = network["capacity_per_minute"], network["storage"]
+    has_capacity = np.broadcast_to(capacity > 0, demand.shape[1:])
+
+    n_steps = len(step_starts)
+    demand_per_minute = np.asarray(demand, dtype=float) / 60
+    vehicles = np.zeros(demand.shape[1:])
+    waiting = np.zeros(demand.shape[1:])  # Vehicles that could not enter their first edge yet
+    outflow = np.zeros(demand.shape[1:])
+    admitted = np.ones(demand.shape[1:])
+    ready_ratio = np.zeros(demand.shape[1:])
+    traffic_volume = np.zeros(demand.shape)
+    congestion_level = np.zeros(demand.shape)
+
+    first_minute = int(step_starts[0])
+    last_minute = int(step_starts[-1]) + step_minutes
+    for minute in range(first_minute - warmup_minutes, last_minute):
+        step = min(max((minute - first_minute) // step_minutes, 0), n_steps - 1)
+        entering = waiting + demand_per_minute[step]
+
+        # Sending: vehicles that reached the end of the edge, limited by its capacity
+        sending = np.minimum(vehicles * leave_share, capacity)
+        arriving = turning_t @ sending
+
+        # Receiving: free storage plus the space freed in the previous minute
+        receiving = np.minimum(capacity, np.maximum(storage - vehicles, 0) + outflow)
+        requested = arriving + entering
+        admitted.fill(1.0)
+        np.divide(receiving, requested, out=admitted, where=requested > receiving)
+
+        # Vehicles leave an edge only if the edge they turn into admits them
+        outflow = sending * (turning @ admitted + exit_share)
+        vehicles += requested * admitted - outflow
+        waiting = entering * (1.0 - admitted)
+
+        if minute >= first_minute:
+            traffic_volume[step] += outflow
+            ready_ratio.fill(0.0)
+            np.divide(sending, capacity, out=ready_ratio, where=has_capacity)
+            congestion_level[step] += ready_ratio
+
+    traffic_volume *= 60 / step_minutes
+    congestion_level /= step_minutes
+    np.minimum(congestion_level, 1.0, out=congestion_level)
+    return {"traffic_volume": traffic_volume, "congestion_level": congestion_level}
+
+def compute_link_queue_traffic(
+    network: Dict[str, Any],
+    step_starts: np.ndarray,
+    step_minutes: int,
+    deliveries_per_hour: np.ndarray,
+    delivery_share: np.ndarray,
+    capacity: np.ndarray,
+    replications: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute traffic volumes and congestion of a day with the link-queue model.
+
+    The statistical model's per-edge volumes are used as the uncongested demand:
+    each edge generates EXIT_SHARE of its volume, which with EXIT_SHARE of the
+    vehicles leaving at every node gives the same volumes on average while the
+    network is below capacity. Above capacity the queues propagate upstream.
+
+    Args:
+        network: Network arrays from prepare_link_queue_network
+        step_starts: Start of every time step in minutes of the day, shape (T,)
+        step_minutes: Length of a time step in minutes
+        deliveries_per_hour: Number of construction deliveries active in each step, shape (T,)
+        delivery_share: Delivery trips (entry plus exit) driving on every edge per delivery, shape (E,)
+        capacity: Capacity of every edge in vehicles per hour, shape (E,)
+        replications: Number of ensemble members R, simulated together
+        rng: Random generator (a fresh unseeded one if not given)
+
+    Returns:
+        Dictionary with "traffic_volume" (int) and "congestion_level", shape (T, E)
+        or (R, T, E) with replications
+    """
+    hours = np.asarray(step_starts) / 60
+    uncongested = compute_edge_traffic(
+        hours, deliveries_per_hour, delivery_share, capacity, replications=replications, rng=rng
+    )["traffic_volume"]
+
+    # (T, E, R) layout, so each minute works on contiguous (E, R) blocks
+    samples = uncongested[None] if replications is None else uncongested
+    demand = np.ascontiguousarray(np.moveaxis(samples, 0, -1) * EXIT_SHARE, dtype=float)
+
+    traffic = simulate_link_queue(network, step_starts, step_minutes, demand)
+    traffic_volume = np.moveaxis(np.rint(traffic["traffic_volume"]).astype(np.int64), -1, 0)
+    congestion_level = np.moveaxis(traffic["congestion_level"], -1, 0)
+    if replications is None:
+        return {"traffic_volume": traffic_volume[0], "congestion_level": congestion_level[0]}
+    return {"traffic_volume": traffic_volume, "congestion_level": congestion_level}
@@ -0,0 +1,177 @@
+import os
+import re
+import glob
+import json
+import pickle
+import hashlib
+import networkx as nx
+import osmnx as ox
+from filelock import FileLock
+from shapely.geometry import shape, box, mapping
+from typing import Dict, List, Any, Optional
+
+# Road network graphs shared by the API simulation and the dashboard, one pickle per key
+NETWORK_CACHE_DIR = "data/prepared/network_cache"
+
+# Bump when the stored graphs change to invalidate existing files
+NETWORK_CACHE_VERSION = 1
+
+# Parses the clauses of an OSMnx Overpass filter, e.g. ["highway"] or ["service"!~"parking|private"]
+_FILTER_CLAUSE = re.compile(r'\["([^"]+)"(?:(!?~)"([^"]*)")?\]')
+
+def network_key(bounds: Dict[str, Any], network_type: str, simplify: bool, truncate_by_edge: bool) -> str:
+    """Cache key of a road network (bounds geometry, network type and simplification settings)."""
+    payload = json.dumps(
+        {
+            "version": NETWORK_CACHE_VERSION,
+            "bounds": bounds.get("coordinates"),
+            "network_type": network_type,
+            "simplify": simplify,
+            "truncate_by_edge": truncate_by_edge
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def network_path(key: str) -> str:
+    """Path of a cached road network."""
+    return os.path.join(NETWORK_CACHE_DIR, f"{key}.pickle")
+
+def bbox_polygon(bounds: Dict[str, Any], buffer: float = 0.0) -> Dict[str, Any]:
+    """GeoJSON rectangle around a geometry, optionally grown by buffer degrees."""
+    west, south, east, north = shape(bounds).bounds
+    return mapping(box(west - buffer, south - buffer, east + buffer, north + buffer))
+
+def get_network(
+    bounds: Dict[str, Any],
+    network_type: str = "drive",
+    simplify: bool = True,
+    truncate_by_edge: bool = False
+) -> nx.MultiDiGraph:
+    """
+    Get the road network inside a GeoJSON polygon from the cache, fetching it on a miss.
+
+    If Overpass cannot be reached, the network is rebuilt from the raw Overpass
+    responses OSMnx keeps in its cache folder.
+
+    Args:
+        bounds: GeoJSON polygon of the area
+        network_type: OSMnx network type, e.g. "drive" or "drive_service"
+        simplify: Whether to simplify the graph topology
+        truncate_by_edge: Keep edges with at least one node inside the polygon
+
+    Returns:
+        OSMnx MultiDiGraph in EPSG:4326
+
+    Raises:
+        ValueError: If the network can neither be fetched nor rebuilt offline
+    """
+    path = network_path(network_key(bounds, network_type, simplify, truncate_by_edge))
+    os.makedirs(NETWORK_CACHE_DIR, exist_ok=True)
+
+    with FileLock(path + ".lock"):
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:
+                print(f"Error loading cached road network {path}: {str(e)}")
+
+        polygon = shape(bounds)
+        try:
+            G = _download_graph(polygon, network_type, simplify, truncate_by_edge)
+        except Exception as e:
+            print(f"Fetching road network failed ({str(e)}), rebuilding from the Overpass cache")
+            G = graph_from_overpass_cache(polygon, network_type, simplify, truncate_by_edge)
+
+        # Write to a temporary file first so readers never see a partial graph
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return G
+
+def graph_from_overpass_cache(
+    polygon: Any,
+    network_type: str = "drive",
+    simplify: bool = True,
+    truncate_by_edge: bool = False
+) -> nx.MultiDiGraph:
+    """
+    Build a road network from the cached Overpass responses without network access.
+
+    Ways are filtered with the same Overpass filter OSMnx uses for the network type.
+    This relies on private OSMnx 1.x helpers (pinned in requirements.txt); if they
+    are missing or fail, a normal download is attempted instead.
+
+    Args:
+        polygon: Shapely polygon of the area
+        network_type: OSMnx network type
+        simplify: Whether to simplify the graph topology
+        truncate_by_edge: Keep edges with at least one node inside the polygon
+
+    Returns:
+        OSMnx MultiDiGraph in EPSG:4326
+
+    Raises:
+        ValueError: If the cache holds no road data inside the polygon
+    """
+    try:
+        clauses = _FILTER_CLAUSE.findall(ox._overpass._get_osm_filter(network_type))
+    except Exception as e:
+        print(f"Overpass filter of OSMnx unavailable ({str(e)}), downloading the road network instead")
+        return _download_graph(polygon, network_type, simplify, truncate_by_edge)
+
+    response_jsons = []
+    for path in sorted(glob.glob(os.path.join(ox.settings.cache_folder, "*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                response = json.load(f)
+        except Exception:
+            continue  # Skip unreadable files silently
+
+        # Geocoder responses are lists, only Overpass responses carry elements
+        if not isinstance(response, dict) or "elements" not in response:
+            continue
+        response_jsons.append({
+            **response,
+            "elements": [
+                element for element in response["elements"]
+                if element.get("type") != "way" or _matches_filter(element.get("tags", {}), clauses)
+            ]
+        })
+
+    if not response_jsons:
+        raise ValueError(f"No cached Overpass responses found in {ox.settings.cache_folder}")
+
+    bidirectional = network_type in ox.settings.bidirectional_network_types
+    try:
+        G = ox.graph._create_graph(response_jsons, retain_all=True, bidirectional=bidirectional)
+    except Exception as e:
+        print(f"Building the graph with OSMnx failed ({str(e)}), downloading the road network instead")
+        return _download_graph(polygon, network_type, simplify, truncate_by_edge)
+    G = ox.truncate.truncate_graph_polygon(G, polygon, retain_all=False, truncate_by_edge=truncate_by_edge)
+    if simplify:
+        G = ox.simplify_graph(G)
+    return G
+
+def _download_graph(polygon: Any, network_type: str, simplify: bool, truncate_by_edge: bool) -> nx.MultiDiGraph:
+    """Fetch the road network through the public OSMnx API."""
+    return ox.graph_from_polygon(
+        polygon, network_type=network_type, simplify=simplify, truncate_by_edge=truncate_by_edge
+    )
+
+def _matches_filter(tags: Dict[str, str], clauses: List[tuple]) -> bool:
+    """Whether the tags of a way pass all clauses of an Overpass filter."""
+    for key, operator, pattern in clauses:
+        value = tags.get(key)
+        if not operator:
+            if value is None:
+                return False
+        elif operator == "~":
+            if value is None or not re.search(pattern, value):
+                return False
+        elif value is not None and re.search(pattern, value):
+            return False
+    return True
@@ -0,0 +1,251 @@
+import os
+import json
+import threading
+from filelock import FileLock
+from typing import Callable, Dict, List, Any, Optional
+
+# Snapshot of all projects (same format as the former projects.json store)
+PROJECTS_FILE = "data/projects/projects.json"
+
+# Compact the journal into the snapshot once it grows beyond this size (bytes)
+JOURNAL_COMPACT_BYTES = int(os.getenv("PROJECTS_JOURNAL_COMPACT_BYTES", str(1024 * 1024)))
+
+# Projects of this process: snapshot plus the journal records replayed so far
+_STATE: Dict[str, Dict[str, Any]] = {}
+_STATE_FILES: Optional[tuple] = None  # (snapshot identity, journal inode) the state was built from
+_STATE_OFFSET = 0  # Journal bytes replayed into _STATE
+_STATE_LOCK = threading.Lock()  # Guards _STATE between threads, the file lock between processes
+_COMPACTION_THREAD: Optional[threading.Thread] = None
+
+def journal_path(snapshot_path: str) -> str:
+    """Journal file next to a snapshot, e.g. projects.json -> projects.journal"""
+    return os.path.splitext(snapshot_path)[0] + ".journal"
+
+def store_version() -> tuple:
+    """Identity, modification time and size of snapshot and journal, changes with every write."""
+    return (_file_identity(PROJECTS_FILE), _file_identity(journal_path(PROJECTS_FILE)))
+
+def get_project(project_id: str) -> Optional[Dict[str, Any]]:
+    """Get the stored fields of a project by ID, None if it does not exist."""
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        project = _STATE.get(project_id)
+        return dict(project) if project is not None else None
+
+def list_projects() -> List[Dict[str, Any]]:
+    """Get the stored fields of all projects in creation order."""
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        return [dict(project) for project in _STATE.values()]
+
+def put_project(project: Dict[str, Any]) -> int:
+    """Insert or replace a project (a model_dump of Project) by appending a journal record, returns the bytes appended."""
+    with _STATE_LOCK, _file_lock():
+        appended = _write_record({"op": "put", "project": project})
+        _refresh_state()
+    _schedule_compaction()
+    return appended
+
+def update_project(project_id: str, apply: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[tuple]:
+    """
+    Read, change and write back a project while holding the file lock, so concurrent updates are not lost.
+
+    Args:
+        project_id: The ID of the project
+        apply: Function returning the new stored fields from the current ones
+
+    Returns:
+        Tuple (new stored fields, bytes appended to the journal), None if the project does not exist
+    """
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        current = _STATE.get(project_id)
+        if current is None:
+            return None
+        project = apply(dict(current))
+        appended = _write_record({"op": "put", "project": project})
+        _refresh_state()
+    _schedule_compaction()
+    return project, appended
+
+def delete_project(project_id: str) -> int:
+    """Delete a project by appending a journal record, returns the bytes appended (0 if it does not exist)."""
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        if project_id not in _STATE:
+            return 0
+        appended = _write_record({"op": "delete", "id": project_id})
+        _refresh_state()
+    _schedule_compaction()
+    return appended
+
+def read_projects(snapshot_path: str) -> List[Dict[str, Any]]:
+    """
+    Read the projects of a snapshot and replay its journal, without touching the state of this process.
+
+    Args:
+        snapshot_path: Path of the snapshot (a list of project dictionaries)
+
+    Returns:
+        List of project dictionaries in creation order
+    """
+    with FileLock(journal_path(snapshot_path) + ".lock"):
+        projects = {project["id"]: project for project in _read_snapshot(snapshot_path) if project.get("id")}
+        _replay(journal_path(snapshot_path), 0, projects)
+    return list(projects.values())
+
+def compact() -> int:
+    """
+    Write the current projects to a new snapshot and drop the replayed journal records.
+
+    The snapshot is written without holding the file lock; only the journal
+    records appended meanwhile are copied while the lock is held. Replaying
+    records that are already in the snapshot is harmless (puts carry the whole
+    project), so a crash between the two renames loses nothing.
+
+    Returns:
+        Number of projects in the snapshot
+    """
+    journal = journal_path(PROJECTS_FILE)
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        projects = list(_STATE.values())
+        offset = _STATE_OFFSET
+        files = _STATE_FILES
+
+    snapshot_tmp = f"{PROJECTS_FILE}.{os.getpid()}.tmp"
+    with open(snapshot_tmp, "w", encoding="utf-8") as f:
+        json.dump(projects, f, indent=2, default=str, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    with _STATE_LOCK, _file_lock():
+        _refresh_state()
+        if _STATE_FILES != files:
+            # Another process compacted meanwhile
+            os.remove(snapshot_tmp)
+            return len(_STATE)
+        tail = b""
+        if os.path.exists(journal):
+            with open(journal, "rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        journal_tmp = f"{journal}.{os.getpid()}.tmp"
+        with open(journal_tmp, "wb") as f:
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(snapshot_tmp, PROJECTS_FILE)
+        os.replace(journal_tmp, journal)
+        _reset_state()
+        _refresh_state()
+    return len(projects)
+
+def _write_record(record: Dict[str, Any]) -> int:
+    """Append one record as a single write, returns the bytes written (caller holds the file lock)"""
+    journal = journal_path(PROJECTS_FILE)
+    os.makedirs(os.path.dirname(journal) or ".", exist_ok=True)
+    line = json.dumps(record, default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+    fd = os.open(journal, os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        if os.fstat(fd).st_size and os.lseek(fd, -1, os.SEEK_END) >= 0 and os.read(fd, 1) != b"\n":
+            # Terminate a record torn by a crash, so it does not swallow this one
+            line = b"\n" + line
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return len(line)
+
+def _refresh_state() -> None:
+    """Bring _STATE up to date with the files, replaying only new journal records (caller holds both locks)"""
+    global _STATE_FILES, _STATE_OFFSET
+    journal = journal_path(PROJECTS_FILE)
+    snapshot_identity = _file_identity(PROJECTS_FILE)
+    journal_identity = _file_identity(journal)
+    journal_inode = journal_identity[0] if journal_identity else None
+    journal_size = journal_identity[2] if journal_identity else 0
+
+    # A new snapshot or a replaced journal (compaction by another process) needs a full rebuild
+    if (
+        _STATE_FILES is None
+        or _STATE_FILES[0] != snapshot_identity
+        or _STATE_FILES[1] != journal_inode
+        or journal_size < _STATE_OFFSET
+    ):
+        _reset_state()
+        _STATE.update((project["id"], project) for project in _read_snapshot(PROJECTS_FILE) if project.get("id"))
+
+    if journal_size > _STATE_OFFSET:
+        _STATE_OFFSET = _replay(journal, _STATE_OFFSET, _STATE)
+    _STATE_FILES = (snapshot_identity, journal_inode)
+
+def _reset_state() -> None:
+    global _STATE_FILES, _STATE_OFFSET
+    _STATE.clear()
+    _STATE_FILES = None
+    _STATE_OFFSET = 0
+
+def _replay(journal: str, offset: int, projects: Dict[str, Dict[str, Any]]) -> int:
+    """Apply the complete journal records after offset to projects, returns the new offset"""
+    if not os.path.exists(journal):
+        return offset
+    with open(journal, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    # A record without its newline is still being written (or was torn by a crash)
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Skipping invalid record in {journal}: {str(e)}")
+            continue
+        if record.get("op") == "put":
+            project = record["project"]
+            projects[project["id"]] = project
+        elif record.get("op") == "delete":
+            projects.pop(record["id"], None)
+    return offset + end
+
+def _read_snapshot(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"Error reading projects from {path}: {str(e)}")
+            return []
+
+def _schedule_compaction() -> None:
+    """Compact in a background thread once the journal exceeds JOURNAL_COMPACT_BYTES"""
+    global _COMPACTION_THREAD
+    identity = _file_identity(journal_path(PROJECTS_FILE))
+    if identity is None or identity[2] < JOURNAL_COMPACT_BYTES:
+        return
+    with _STATE_LOCK:
+        if _COMPACTION_THREAD is not None and _COMPACTION_THREAD.is_alive():
+            return
+        _COMPACTION_THREAD = threading.Thread(target=_compact_in_background, daemon=True)
+        _COMPACTION_THREAD.start()
+
+def _compact_in_background() -> None:
+    try:
+        compact()
+    except Exception as e:
+        print(f"Error compacting project journal: {str(e)}")
+
+def _file_lock() -> FileLock:
+    os.makedirs(os.path.dirname(PROJECTS_FILE) or ".", exist_ok=True)
+    return FileLock(journal_path(PROJECTS_FILE) + ".lock")
+
+def _file_identity(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
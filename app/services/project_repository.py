@@ -0,0 +1,223 @@
+import os
+import json
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from app.services.project_journal import read_projects, journal_path
+
+# SQLite database of the projects
+PROJECTS_DB = os.getenv("PROJECTS_DB", "data/projects/projects.db")
+
+# Legacy JSON store, imported once into an empty database
+PROJECTS_JSON_FILE = "data/projects/projects.json"
+
+# GeoJSON fields stored as separate JSON blobs, so listing projects does not parse them
+GEOMETRY_COLUMNS = ("polygon", "map_bounds", "waiting_areas", "access_routes")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    polygon BLOB,
+    map_bounds BLOB,
+    waiting_areas BLOB,
+    access_routes BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_projects_name ON projects(name);
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '0');
+CREATE TRIGGER IF NOT EXISTS projects_version_insert AFTER INSERT ON projects BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS projects_version_update AFTER UPDATE ON projects BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS projects_version_delete AFTER DELETE ON projects BEGIN
+    UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'version';
+END;
+"""
+
+# One connection per thread (API worker threads, job threads)
+_LOCAL = threading.local()
+_INIT_LOCK = threading.Lock()
+_INITIALIZED_PATHS = set()
+
+def store_version() -> int:
+    """Counter increased by every write to the projects table (by triggers, so also by other processes)."""
+    return int(_connection().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0])
+
+def get_project_row(project_id: str) -> Optional[Dict[str, Any]]:
+    """Get the stored fields of a project by ID, None if it does not exist."""
+    row = _connection().execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+    return _row_to_dict(row) if row else None
+
+def get_project_row_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Get the stored fields of the first project with a name, None if there is none."""
+    row = _connection().execute("SELECT * FROM projects WHERE name = ? ORDER BY rowid LIMIT 1", (name,)).fetchone()
+    return _row_to_dict(row) if row else None
+
+def list_project_rows() -> List[Dict[str, Any]]:
+    """Get the stored fields of all projects in creation order."""
+    return [_row_to_dict(row) for row in _connection().execute("SELECT * FROM projects ORDER BY rowid")]
+
+def list_project_page(after: Optional[Tuple[str, str]], limit: Optional[int], summary: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get one page of projects ordered by creation time and ID.
+
+    Args:
+        after: (created_at, id) of the last project of the previous page, None for the first page
+        limit: Maximum number of projects, None for no limit
+        summary: Only read the summary fields (id, name, file_name, created_at, updated_at)
+
+    Returns:
+        List of project dictionaries
+    """
+    columns = (
+        "id, name, json_extract(data, '$.file_name') AS file_name, created_at, updated_at"
+        if summary else "*"
+    )
+    where, params = ("WHERE (created_at, id) > (?, ?)", list(after)) if after else ("", [])
+    rows = _connection().execute(
+        f"SELECT {columns} FROM projects {where} ORDER BY created_at, id LIMIT ?",
+        params + [limit if limit is not None else -1]
+    )
+    if summary:
+        return [dict(row) for row in rows]
+    # created_at as stored in the indexed column, which the cursor of the next page refers to
+    return [{**_row_to_dict(row), "created_at": row["created_at"]} for row in rows]
+
+_UPSERT = """
+INSERT INTO projects (id, name, created_at, updated_at, data, polygon, map_bounds, waiting_areas, access_routes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name, created_at = excluded.created_at, updated_at = excluded.updated_at,
+    data = excluded.data, polygon = excluded.polygon, map_bounds = excluded.map_bounds,
+    waiting_areas = excluded.waiting_areas, access_routes = excluded.access_routes
+"""
+
+def put_project_row(project: Dict[str, Any]) -> None:
+    """Insert or replace a project (a model_dump of Project)."""
+    connection = _connection()
+    with connection:
+        connection.execute(_UPSERT, _dict_to_row(project))
+
+def update_project_row(project_id: str, apply: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Read, change and write back a project in one write transaction, so concurrent updates are not lost.
+
+    Args:
+        project_id: The ID of the project
+        apply: Function returning the new fields (a model_dump of Project) from the stored ones
+
+    Returns:
+        The new fields, None if the project does not exist
+    """
+    connection = _connection()
+    # IMMEDIATE takes the write lock before reading, other writers wait until the commit
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        row = connection.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if row is None:
+            connection.rollback()
+            return None
+        project = apply(_row_to_dict(row))
+        connection.execute(_UPSERT, _dict_to_row(project))
+        connection.commit()
+        return project
+    except Exception:
+        connection.rollback()
+        raise
+
+def delete_project_row(project_id: str) -> bool:
+    """Delete a project, returns False if it does not exist."""
+    connection = _connection()
+    with connection:
+        return connection.execute("DELETE FROM projects WHERE id = ?", (project_id,)).rowcount > 0
+
+def import_json_file(path: str = PROJECTS_JSON_FILE) -> int:
+    """
+    Import the projects of a projects.json file (and its journal), replacing stored projects with the same ID.
+
+    Args:
+        path: Path of the JSON file (a list of project dictionaries)
+
+    Returns:
+        Number of imported projects
+    """
+    if not os.path.exists(path) and not os.path.exists(journal_path(path)):
+        return 0
+
+    rows = [_dict_to_row(project) for project in read_projects(path)]
+    connection = _connection()
+    with connection:
+        connection.executemany(
+            """
+            INSERT OR REPLACE INTO projects (id, name, created_at, updated_at, data, polygon, map_bounds, waiting_areas, access_routes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_json', ?)", (os.path.abspath(path),))
+    return len(rows)
+
+def _connection() -> sqlite3.Connection:
+    """Connection of the current thread, creating the database (and importing the JSON store) on first use."""
+    connection = getattr(_LOCAL, "connection", None)
+    if connection is not None and _LOCAL.path == PROJECTS_DB:
+        return connection
+
+    os.makedirs(os.path.dirname(PROJECTS_DB) or ".", exist_ok=True)
+    connection = sqlite3.connect(PROJECTS_DB, timeout=30)
+    connection.row_factory = sqlite3.Row
+    # WAL lets readers continue while a project is written
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    _LOCAL.connection, _LOCAL.path = connection, PROJECTS_DB
+
+    with _INIT_LOCK:
+        if PROJECTS_DB not in _INITIALIZED_PATHS:
+            connection.executescript(_SCHEMA)
+            _import_legacy_store(connection)
+            _INITIALIZED_PATHS.add(PROJECTS_DB)
+    return connection
+
+def _import_legacy_store(connection: sqlite3.Connection) -> None:
+    """Import projects.json once into a new database."""
+    imported = connection.execute("SELECT value FROM meta WHERE key = 'imported_json'").fetchone()
+    empty = connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0] == 0
+    if imported is None and empty and (os.path.exists(PROJECTS_JSON_FILE) or os.path.exists(journal_path(PROJECTS_JSON_FILE))):
+        count = import_json_file(PROJECTS_JSON_FILE)
+        print(f"Imported {count} projects from {PROJECTS_JSON_FILE} into {PROJECTS_DB}")
+
+def _dict_to_row(project: Dict[str, Any]) -> tuple:
+    data = {key: value for key, value in project.items() if key not in GEOMETRY_COLUMNS}
+    return (
+        project["id"],
+        project.get("name") or "",
+        _to_text(project.get("created_at")),
+        _to_text(project.get("updated_at")),
+        json.dumps(data, default=str, ensure_ascii=False),
+        *(
+            json.dumps(project[column], ensure_ascii=False).encode("utf-8") if project.get(column) is not None else None
+            for column in GEOMETRY_COLUMNS
+        )
+    )
+
+def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    project = json.loads(row["data"])
+    for column in GEOMETRY_COLUMNS:
+        project[column] = json.loads(row[column]) if row[column] is not None else None
+    return project
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
@@ -1,57 +1,176 @@
 import os
 import json
-from typing import Dict, List, Any, Optional
+import base64
+import threading
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import uuid
 
-from app.models.project import Project, ProjectCreate, ProjectUpdate
+from app.models.project import Project, ProjectCreate, ProjectUpdate, ProjectSummary
+from app.services.edge_features import refresh_edge_features_async
+from app.services import project_repository, project_journal
 
-# In-memory store for development, could be replaced with a database
-# Dictionary: project_id -> Project
-PROJECTS = {}
+# Storage backend of the projects: "sqlite" (indexed database, see project_repository)
+# or "json" (projects.json snapshot plus an append-only journal, see project_journal)
+PROJECT_STORE = os.getenv("PROJECT_STORE", "sqlite")
 
-PROJECTS_FILE = "data/projects/projects.json"
+# Project fields the precomputed edge features depend on
+GEOMETRY_FIELDS = {"polygon", "map_bounds", "access_routes"}
 
-def _load_projects() -> List[Dict[str, Any]]:
-    """Load all projects from the JSON file"""
-    if not os.path.exists(PROJECTS_FILE):
-        return []
-    with open(PROJECTS_FILE, "r", encoding='utf-8') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return []
+# Validated projects of one store version: project_id -> Project. The objects are
+# shared between callers and must not be modified.
+_PROJECT_CACHE: Dict[str, Project] = {}
+_ALL_PROJECTS: Optional[List[Project]] = None  # All projects in store order, once listed
+_CACHE_VERSION: Any = None  # Store version the cache belongs to
+_CACHE_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
+_CACHE_LOCK = threading.Lock()
 
-def _save_projects(projects: List[Dict[str, Any]]):
-    """Save all projects to the JSON file"""
-    os.makedirs(os.path.dirname(PROJECTS_FILE), exist_ok=True)
-    with open(PROJECTS_FILE, "w", encoding='utf-8') as f:
-        json.dump(projects, f, indent=2, default=str, ensure_ascii=False)
+def _store_version() -> Any:
+    """Version of the store: write counter of the database or modification time and size of snapshot and journal"""
+    if PROJECT_STORE == "json":
+        return project_journal.store_version()
+    return project_repository.store_version()
 
-def create_project(project_data: ProjectCreate, file_path: str) -> Project:
+def _validate_cache() -> Any:
+    """Drop the cache if the store changed since it was filled (caller holds _CACHE_LOCK), returns the version"""
+    global _CACHE_VERSION, _ALL_PROJECTS
+    version = _store_version()
+    if version != _CACHE_VERSION:
+        if _PROJECT_CACHE or _ALL_PROJECTS is not None:
+            _CACHE_STATS["invalidations"] += 1
+        _PROJECT_CACHE.clear()
+        _ALL_PROJECTS = None
+        _CACHE_VERSION = version
+    return version
+
+def project_cache_info() -> Dict[str, Any]:
+    """Hit and miss counters of the project cache and the number of cached projects."""
+    with _CACHE_LOCK:
+        return {**_CACHE_STATS, "projects": len(_PROJECT_CACHE), "all_projects_cached": _ALL_PROJECTS is not None}
+
+def _read_project(project_id: str) -> Optional[Dict[str, Any]]:
+    """Load the stored fields of one project"""
+    if PROJECT_STORE == "json":
+        return project_journal.get_project(project_id)
+    return project_repository.get_project_row(project_id)
+
+def _read_all_projects() -> List[Dict[str, Any]]:
+    """Load the stored fields of all projects"""
+    if PROJECT_STORE == "json":
+        return project_journal.list_projects()
+    return project_repository.list_project_rows()
+
+def _write_project(project: Project) -> None:
+    """Insert or replace a project in the store and the cache"""
+    with _CACHE_LOCK:
+        version = _validate_cache()
+        appended = _write_project_to_store(project)
+        _update_cache(project.id, project, version, appended)
+
+def _modify_project(project_id: str, apply: Callable[[Dict[str, Any]], Project]) -> Optional[Project]:
+    """Read, change and write a project atomically in the store, then update the cache"""
+    changed = {}
+
+    def apply_stored(stored: Dict[str, Any]) -> Dict[str, Any]:
+        changed["project"] = apply(stored)
+        return changed["project"].model_dump()
+
+    with _CACHE_LOCK:
+        version = _validate_cache()
+        appended = None
+        if PROJECT_STORE == "json":
+            result = project_journal.update_project(project_id, apply_stored)
+            if result is not None:
+                appended = result[1]
+        else:
+            result = project_repository.update_project_row(project_id, apply_stored)
+        if result is None:
+            return None
+        _update_cache(project_id, changed["project"], version, appended)
+    return changed["project"]
+
+def _remove_project(project_id: str) -> None:
+    """Remove a project from the store and the cache"""
+    with _CACHE_LOCK:
+        version = _validate_cache()
+        appended = _remove_project_from_store(project_id)
+        _update_cache(project_id, None, version, appended)
+
+def _only_own_write(version_before: Any, version_after: Any, appended: Optional[int]) -> bool:
+    """Whether the store changed only by the write of this process between the two versions"""
+    if PROJECT_STORE != "json":
+        return version_after == version_before + 1
+    if appended is None:
+        return False
+    # JSON store: same snapshot, same journal file, grown by exactly our record
+    snapshot_before, journal_before = version_before
+    snapshot_after, journal_after = version_after
+    if snapshot_before != snapshot_after or journal_after is None:
+        return False
+    if journal_before is None:
+        return journal_after[2] == appended
+    return journal_after[0] == journal_before[0] and journal_after[2] == journal_before[2] + appended
+
+def _update_cache(project_id: str, project: Optional[Project], version_before: Any, appended: Optional[int] = None) -> None:
+    """Apply a write of this process to the cache (caller holds _CACHE_LOCK)"""
+    global _CACHE_VERSION, _ALL_PROJECTS
+    _CACHE_VERSION = _store_version()
+    if not _only_own_write(version_before, _CACHE_VERSION, appended):
+        # Another process wrote in between, so the cache cannot be patched
+        _PROJECT_CACHE.clear()
+        _ALL_PROJECTS = None
+        return
+
+    _PROJECT_CACHE.pop(project_id, None)
+    if project is not None:
+        _PROJECT_CACHE[project_id] = project
+    if _ALL_PROJECTS is not None:
+        index = next((i for i, cached in enumerate(_ALL_PROJECTS) if cached.id == project_id), None)
+        if project is None:
+            _ALL_PROJECTS = [cached for cached in _ALL_PROJECTS if cached.id != project_id]
+        elif index is None:
+            _ALL_PROJECTS = _ALL_PROJECTS + [project]
+        else:
+            _ALL_PROJECTS = _ALL_PROJECTS[:index] + [project] + _ALL_PROJECTS[index + 1:]
+
+def _write_project_to_store(project: Project) -> Optional[int]:
+    """Insert or replace a project in the store, returns the bytes appended to the JSON journal"""
+    if PROJECT_STORE == "json":
+        return project_journal.put_project(project.model_dump())
+    project_repository.put_project_row(project.model_dump())
+    return None
+
+def _remove_project_from_store(project_id: str) -> Optional[int]:
+    """Remove a project from the store, returns the bytes appended to the JSON journal"""
+    if PROJECT_STORE == "json":
+        return project_journal.delete_project(project_id)
+    else:
+        project_repository.delete_project_row(project_id)
+
+def create_project(project_data: ProjectCreate, file_path: str, file_hash: Optional[str] = None) -> Project:
     """
     Create a new construction site project.
     
     Args:
         project_data: ProjectCreate model with project details
         file_path: Path to the saved Excel file
+        file_hash: SHA-256 of the saved file
         
     Returns:
         The created Project
     """
-    projects = _load_projects()
-    
     project_dict = project_data.model_dump() # Use model_dump for Pydantic V2
     project_dict["id"] = str(uuid.uuid4()) # Generate new ID
     project_dict["file_path"] = file_path
+    project_dict["file_hash"] = file_hash
     project_dict["updated_at"] = None # Explicitly set to None
     
     # Ensure all fields from Project model are present
     # This will use defaults from ProjectBase if not provided in ProjectCreate
     full_project_data = Project(**project_dict) 
     
-    projects.append(full_project_data.model_dump())
-    _save_projects(projects)
+    _write_project(full_project_data)
+    _refresh_edge_features(full_project_data)
     return full_project_data
 
 def get_project(project_id: str) -> Optional[Project]:
@@ -64,11 +183,36 @@ def get_project(project_id: str) -> Optional[Project]:
     Returns:
         The Project if found, None otherwise
     """
-    projects = _load_projects()
-    for proj_dict in projects:
-        if proj_dict.get("id") == project_id:
-            return Project(**proj_dict)
-    return None
+    with _CACHE_LOCK:
+        version = _validate_cache()
+        project = _PROJECT_CACHE.get(project_id)
+        _CACHE_STATS["hits" if project is not None else "misses"] += 1
+    if project is not None:
+        return project
+
+    proj_dict = _read_project(project_id)
+    project = Project(**proj_dict) if proj_dict else None
+    if project is not None:
+        with _CACHE_LOCK:
+            if _CACHE_VERSION == version:
+                _PROJECT_CACHE[project_id] = project
+    return project
+
+def get_project_by_name(name: str) -> Optional[Project]:
+    """
+    Get a project by name.
+    
+    Args:
+        name: The name of the project
+        
+    Returns:
+        The first Project with that name if found, None otherwise
+    """
+    if PROJECT_STORE == "json":
+        proj_dict = next((proj for proj in project_journal.list_projects() if proj.get("name") == name), None)
+    else:
+        proj_dict = project_repository.get_project_row_by_name(name)
+    return Project(**proj_dict) if proj_dict else None
 
 def update_project(project_id: str, project_update_data: ProjectUpdate) -> Optional[Project]:
     """
@@ -84,33 +228,22 @@ def update_project(project_id: str, project_update_data: ProjectUpdate) -> Optio
     Raises:
         KeyError: If the project is not found
     """
-    projects = _load_projects()
-    project_index = -1
-    
-    for i, proj_dict in enumerate(projects):
-        if proj_dict.get("id") == project_id:
-            project_index = i
-            break
-            
-    if project_index == -1:
-        return None # Project not found
-
-    # Get existing project data
-    existing_project_dict = projects[project_index]
-    
     # Update with new data, excluding unset fields to keep existing values
     update_data_dict = project_update_data.model_dump(exclude_unset=True)
-    
-    for key, value in update_data_dict.items():
-        existing_project_dict[key] = value
-    
-    existing_project_dict["updated_at"] = datetime.now()
-    
-    # Validate and create the updated Project object
-    updated_project = Project(**existing_project_dict)
-    projects[project_index] = updated_project.model_dump()
-    
-    _save_projects(projects)
+
+    def apply_update(existing_project_dict: Dict[str, Any]) -> Project:
+        for key, value in update_data_dict.items():
+            existing_project_dict[key] = value
+        existing_project_dict["updated_at"] = datetime.now()
+        # Validate and create the updated Project object
+        return Project(**existing_project_dict)
+
+    # Read, merge and write under the store's write lock, so concurrent updates are not lost
+    updated_project = _modify_project(project_id, apply_update)
+    if updated_project is None:
+        return None # Project not found
+    if GEOMETRY_FIELDS & update_data_dict.keys():
+        _refresh_edge_features(updated_project)
     return updated_project
 
 def get_all_projects() -> List[Project]:
@@ -120,8 +253,61 @@ def get_all_projects() -> List[Project]:
     Returns:
         List of all projects
     """
-    projects_data = _load_projects()
-    return [Project(**proj) for proj in projects_data]
+    global _ALL_PROJECTS
+    with _CACHE_LOCK:
+        version = _validate_cache()
+        projects = _ALL_PROJECTS
+        _CACHE_STATS["hits" if projects is not None else "misses"] += 1
+    if projects is not None:
+        return list(projects)
+
+    projects = [Project(**proj) for proj in _read_all_projects()]
+    with _CACHE_LOCK:
+        if _CACHE_VERSION == version:
+            _ALL_PROJECTS = projects
+            _PROJECT_CACHE.update((project.id, project) for project in projects)
+    return list(projects)
+
+def list_projects_page(
+    cursor: Optional[str],
+    limit: Optional[int],
+    summary: bool = False
+) -> Tuple[List[Union[Project, ProjectSummary]], Optional[str]]:
+    """
+    Get one page of projects ordered by creation time and ID.
+
+    Args:
+        cursor: Cursor returned with the previous page, None for the first page
+        limit: Maximum number of projects, None for all remaining projects
+        summary: Return ProjectSummary objects instead of full projects
+
+    Returns:
+        Tuple (projects of the page, cursor of the next page or None on the last page)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    after = _decode_cursor(cursor) if cursor else None
+
+    if PROJECT_STORE == "json":
+        projects = sorted(get_all_projects(), key=_page_key)
+        page = [project for project in projects if after is None or _page_key(project) > after]
+        page = page[:limit + 1] if limit is not None else page
+        keys = [_page_key(project) for project in page]
+        if summary:
+            page = [ProjectSummary(**project.model_dump(include=set(ProjectSummary.model_fields))) for project in page]
+    else:
+        rows = project_repository.list_project_page(after, limit + 1 if limit is not None else None, summary)
+        keys = [(row["created_at"], row["id"]) for row in rows]
+        page = [ProjectSummary(**row) if summary else Project(**row) for row in rows]
+
+    if limit is None or len(page) <= limit:
+        return page, None
+    return page[:limit], _encode_cursor(keys[limit - 1])
+
+def project_store_version() -> str:
+    """Version of the project store, changes with every write (also by other processes)."""
+    return str(_store_version())
 
 def delete_project(project_id: str) -> None:
     """
@@ -133,45 +319,22 @@ def delete_project(project_id: str) -> None:
     Raises:
         KeyError: If the project is not found
     """
-    projects = _load_projects()
-    projects = [proj for proj in projects if proj.get("id") != project_id]
-    _save_projects(projects)
+    _remove_project(project_id)
 
-def _load_projects_from_disk() -> None:
-    """Load projects from the disk storage"""
-    try:
-        projects_dir = "data/projects"
-        os.makedirs(projects_dir, exist_ok=True)
-        
-        projects_file = os.path.join(projects_dir, "projects.json")
-        
-        if os.path.exists(projects_file):
-            with open(projects_file, "r") as f:
-                projects_data = json.load(f)
-                
-                for project_dict in projects_data:
-                    # Convert dictionary to Project model
-                    project = Project(**project_dict)
-                    PROJECTS[project.id] = project
-                    
-    except Exception as e:
-        print(f"Error loading projects from disk: {str(e)}")
-
-def _save_projects_to_disk() -> None:
-    """Save projects to disk storage"""
+def _page_key(project: Project) -> Tuple[str, str]:
+    """Sort key of the paginated listing in the JSON store"""
+    return (project.created_at.isoformat(), project.id)
+
+def _encode_cursor(key: Tuple[str, str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[str, str]:
     try:
-        projects_dir = "data/projects"
-        os.makedirs(projects_dir, exist_ok=True)
-        
-        projects_file = os.path.join(projects_dir, "projects.json")
-        
-        projects_data = [project.dict() for project in PROJECTS.values()]
-        
-        with open(projects_file, "w") as f:
-            json.dump(projects_data, f, default=str, indent=2)
-            
-    except Exception as e:
-        print(f"Error saving projects to disk: {str(e)}")
-
-# Load projects on module initialization
-_load_projects_from_disk() 
\ No newline at end of file
+        created_at, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (str(created_at), str(project_id))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def _refresh_edge_features(project: Project) -> None:
+    """Precompute the per-edge feature table for the project's current geometries."""
+    refresh_edge_features_async(project.id, project.polygon, project.map_bounds, project.access_routes)
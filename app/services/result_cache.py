@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, time
+from typing import Dict, Tuple, Any
+
+from app.models.simulation import SimulationResult
+from app.services import result_store
+
+# Memory budget for simulation results kept in the API process (in MB)
+SIMULATION_CACHE_MB = float(os.getenv("SIMULATION_CACHE_MB", "256"))
+
+# Rough in-memory footprint of the result objects, used to enforce the budget:
+# one TrafficSegment per segment and time step, coordinates are shared within a day
+SEGMENT_STEP_BYTES = 800
+COORDINATE_POINT_BYTES = 120
+
+# LRU cache of loaded days: (project_id, date) -> (time of day -> SimulationResult, estimated bytes)
+_CACHE: "OrderedDict[Tuple[str, date], Tuple[Dict[time, SimulationResult], int]]" = OrderedDict()
+_CACHE_BYTES = 0
+_CACHE_LOCK = threading.Lock()
+
+def get_day(project_id: str, day: date) -> Dict[time, SimulationResult]:
+    """
+    Get the results of all time steps of one day, loading them from disk on a cache miss.
+
+    Args:
+        project_id: ID of the project
+        day: Date of the results
+
+    Returns:
+        Dictionary time of day -> SimulationResult (empty if nothing is stored)
+    """
+    key = (project_id, day)
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            _CACHE.move_to_end(key)
+            return _CACHE[key][0]
+
+    # Load outside the lock so other requests are not blocked by the disk read
+    results = result_store.read_day(project_id, day)
+    if results:
+        put_day(project_id, day, results)
+    return results
+
+def put_day(project_id: str, day: date, results: Dict[time, SimulationResult]) -> None:
+    """
+    Put the results of one day into the cache and evict the least recently used days.
+
+    Args:
+        project_id: ID of the project
+        day: Date of the results
+        results: Dictionary time of day -> SimulationResult
+    """
+    global _CACHE_BYTES
+    key = (project_id, day)
+    size = _estimate_bytes(results)
+    budget = SIMULATION_CACHE_MB * 1024 * 1024
+
+    with _CACHE_LOCK:
+        if key in _CACHE:
+            _CACHE_BYTES -= _CACHE.pop(key)[1]
+
+        # A single day larger than the budget is served from disk every time
+        if size <= budget:
+            _CACHE[key] = (results, size)
+            _CACHE_BYTES += size
+
+        while _CACHE_BYTES > budget:
+            _, (_, evicted_size) = _CACHE.popitem(last=False)
+            _CACHE_BYTES -= evicted_size
+
+def invalidate(project_id: str) -> None:
+    """Drop all cached days of a project."""
+    global _CACHE_BYTES
+    with _CACHE_LOCK:
+        for key in [key for key in _CACHE if key[0] == project_id]:
+            _CACHE_BYTES -= _CACHE.pop(key)[1]
+
+def cache_info() -> Dict[str, Any]:
+    """Number of cached days and their estimated memory use."""
+    with _CACHE_LOCK:
+        return {
+            "days": len(_CACHE),
+            "estimated_mb": round(_CACHE_BYTES / (1024 * 1024), 2),
+            "budget_mb": SIMULATION_CACHE_MB
+        }
+
+def _estimate_bytes(results: Dict[time, SimulationResult]) -> int:
+    """Estimate the memory footprint of the results of one day."""
+    if not results:
+        return 0
+    segments = next(iter(results.values())).time_steps[0].traffic_segments
+    coordinate_points = sum(len(segment.coordinates) for segment in segments)
+    return len(results) * len(segments) * SEGMENT_STEP_BYTES + coordinate_points * COORDINATE_POINT_BYTES
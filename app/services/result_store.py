@@ -0,0 +1,466 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import numpy as np
+from contextlib import contextmanager
+from filelock import FileLock
+from datetime import datetime, date, time
+from typing import Dict, Iterator, List, Any, Optional
+
+from app.models.simulation import SimulationResult, TrafficSegment, SimulationTimeStep
+
+# Root directory of the stored simulation results
+# Layout: <project_id>/network_<hash>.npz (geometry, once) and <project_id>/<YYYY-MM-DD>.npz (per day)
+SIMULATIONS_DIR = "data/simulations"
+
+# Per-project index of the stored (date, time of day) pairs, so lookups need no day file
+INDEX_FILE_NAME = "index.json"
+
+# Per-segment percentile fields of ensemble runs, stored as extra (T, S) arrays
+PERCENTILE_FIELDS = {
+    "traffic_volume_p10": np.int32,
+    "traffic_volume_p90": np.int32,
+    "congestion_level_p10": np.float64,
+    "congestion_level_p90": np.float64
+}
+
+_INDEX_LOCK = threading.RLock()
+_INDEX_FILE_LOCKS: Dict[str, FileLock] = {}  # One reentrant file lock per project, guards the index between processes
+_LEGACY_CHECKED: set = set()  # Projects checked for legacy JSON results in this process
+
+def project_dir(project_id: str) -> str:
+    """Directory holding the stored results of a project."""
+    return os.path.join(SIMULATIONS_DIR, project_id)
+
+def list_days(project_id: str) -> List[date]:
+    """
+    List the days with stored results of a project.
+
+    Args:
+        project_id: ID of the project
+
+    Returns:
+        Sorted list of dates
+    """
+    return sorted(read_index(project_id))
+
+def read_index(project_id: str) -> Dict[date, List[time]]:
+    """
+    Load the index of stored results of a project, rebuilding it if it is missing.
+
+    Args:
+        project_id: ID of the project
+
+    Returns:
+        Dictionary date -> sorted list of stored time steps (times of day)
+    """
+    index_data = _read_index_data(project_id)
+    if index_data is None:
+        return rebuild_index(project_id)
+
+    return {
+        datetime.strptime(day, "%Y-%m-%d").date(): [_parse_step_time(step_time) for step_time in step_times]
+        for day, step_times in index_data.get("days", {}).items()
+    }
+
+def rebuild_index(project_id: str) -> Dict[date, List[time]]:
+    """Rebuild the index of a project from the metadata of its day files."""
+    index = {}
+    for day in _scan_days(project_id):
+        with np.load(os.path.join(project_dir(project_id), f"{day.isoformat()}.npz")) as data:
+            steps = json.loads(str(data["meta"]))["steps"]
+        index[day] = sorted(datetime.fromisoformat(step["time"]).time() for step in steps)
+
+    if index:
+        with _index_lock(project_id):
+            _write_index(project_id, index)
+    return index
+
+def write_day(project_id: str, day: date, results: List[SimulationResult]) -> None:
+    """
+    Store the results of one day as dense segment x time arrays.
+
+    The network geometry is taken from the first time step and stored once per
+    distinct network; the day file only references it by hash.
+
+    Args:
+        project_id: ID of the project
+        day: Date of the results
+        results: SimulationResult objects of the day, one time step each
+    """
+    if not results:
+        return
+
+    results = sorted(results, key=lambda result: result.time_steps[0].time)
+    segments = results[0].time_steps[0].traffic_segments
+    network_hash = _write_network(project_id, segments)
+    segment_index = {segment.segment_id: i for i, segment in enumerate(segments)}
+
+    traffic_volume = np.array(
+        [[segment.traffic_volume for segment in result.time_steps[0].traffic_segments] for result in results],
+        dtype=np.int32
+    ).reshape(len(results), len(segments))
+    congestion_level = np.array(
+        [[segment.congestion_level for segment in result.time_steps[0].traffic_segments] for result in results],
+        dtype=np.float64
+    ).reshape(len(results), len(segments))
+
+    # Ensemble runs carry percentiles next to the median values
+    percentile_arrays = {}
+    if segments and segments[0].traffic_volume_p10 is not None:
+        percentile_arrays = {
+            field: np.array(
+                [[getattr(segment, field) for segment in result.time_steps[0].traffic_segments] for result in results],
+                dtype=dtype
+            ).reshape(len(results), len(segments))
+            for field, dtype in PERCENTILE_FIELDS.items()
+        }
+
+    meta = {
+        "network_hash": network_hash,
+        "steps": [
+            {
+                "id": result.id,
+                "time": result.time_steps[0].time.isoformat(),
+                "execution_time": result.execution_time.isoformat(),
+                "waiting_areas_status": result.time_steps[0].waiting_areas_status,
+                "congestion_points": [segment_index[point["segment_id"]] for point in result.congestion_points],
+                "stats": result.stats
+            }
+            for result in results
+        ]
+    }
+
+    _atomic_savez(
+        os.path.join(project_dir(project_id), f"{day.isoformat()}.npz"),
+        traffic_volume=traffic_volume,
+        congestion_level=congestion_level,
+        meta=np.array(json.dumps(meta, default=str)),
+        **percentile_arrays
+    )
+
+    with _index_lock(project_id):
+        index = read_index(project_id)
+        index[day] = sorted(result.time_steps[0].time.time() for result in results)
+        _write_index(project_id, index)
+
+def read_day(project_id: str, day: date) -> Dict[time, SimulationResult]:
+    """
+    Load the results of one day.
+
+    Args:
+        project_id: ID of the project
+        day: Date of the results
+
+    Returns:
+        Dictionary time of day -> SimulationResult (empty if nothing is stored)
+    """
+    day_arrays = read_day_arrays(project_id, day)
+    if day_arrays is None:
+        return {}
+
+    network = read_network(project_id, day_arrays["network_hash"])
+    segment_ids = network["segment_id"]
+
+    results = {}
+    for i, step in enumerate(day_arrays["steps"]):
+        volumes = day_arrays["traffic_volume"][i].tolist()
+        congestion = day_arrays["congestion_level"][i].tolist()
+        percentiles = {field: day_arrays[field][i].tolist() for field in PERCENTILE_FIELDS if field in day_arrays}
+
+        # Arrays come from a validated run, so skip the per-segment validation
+        traffic_segments = [
+            TrafficSegment.model_construct(
+                segment_id=segment_id,
+                start_node=network["start_node"][j],
+                end_node=network["end_node"][j],
+                length=network["length"][j],
+                speed_limit=network["speed_limit"][j],
+                traffic_volume=volumes[j],
+                congestion_level=congestion[j],
+                coordinates=network["coordinates"][j],
+                **{field: values[j] for field, values in percentiles.items()}
+            )
+            for j, segment_id in enumerate(segment_ids)
+        ]
+        step_time = datetime.fromisoformat(step["time"])
+
+        results[step_time.time()] = SimulationResult.model_construct(
+            id=step["id"],
+            project_id=project_id,
+            execution_time=datetime.fromisoformat(step["execution_time"]),
+            time_steps=[SimulationTimeStep.model_construct(
+                time=step_time,
+                traffic_segments=traffic_segments,
+                waiting_areas_status=step["waiting_areas_status"]
+            )],
+            traffic_volumes=dict(zip(segment_ids, volumes)),
+            congestion_points=[
+                {
+                    "segment_id": segment_ids[j],
+                    "congestion_level": congestion[j],
+                    "coordinates": network["coordinates"][j]
+                }
+                for j in step["congestion_points"]
+            ],
+            stats=step["stats"]
+        )
+    return results
+
+def read_day_arrays(project_id: str, day: date) -> Optional[Dict[str, Any]]:
+    """
+    Load the raw arrays of one day without building SimulationResult objects.
+
+    Args:
+        project_id: ID of the project
+        day: Date of the results
+
+    Returns:
+        Dictionary with "network_hash", the (T, S) arrays "traffic_volume" and
+        "congestion_level" (plus the percentile arrays of ensemble runs) and the
+        per-step metadata "steps", or None if nothing is stored
+    """
+    path = os.path.join(project_dir(project_id), f"{day.isoformat()}.npz")
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        day_arrays = {
+            "network_hash": meta["network_hash"],
+            "traffic_volume": data["traffic_volume"],
+            "congestion_level": data["congestion_level"],
+            "steps": meta["steps"]
+        }
+        for field in PERCENTILE_FIELDS:
+            if field in data.files:
+                day_arrays[field] = data[field]
+        return day_arrays
+
+def read_input_hashes(project_id: str, days: List[date]) -> Dict[date, str]:
+    """
+    Get the input hashes the stored results of some days were computed from.
+
+    Args:
+        project_id: ID of the project
+        days: Dates to look up
+
+    Returns:
+        Dictionary date -> input hash for the days that are stored with a hash
+    """
+    index = read_index(project_id)
+    input_hashes = {}
+    for day in days:
+        if day not in index:
+            continue
+        with np.load(os.path.join(project_dir(project_id), f"{day.isoformat()}.npz")) as data:
+            steps = json.loads(str(data["meta"]))["steps"]
+        input_hash = steps[0]["stats"].get("input_hash") if steps else None
+        if input_hash:
+            input_hashes[day] = input_hash
+    return input_hashes
+
+def read_network(project_id: str, network_hash: str) -> Dict[str, Any]:
+    """Load a stored network as lists of segment attributes and coordinates."""
+    with np.load(os.path.join(project_dir(project_id), f"network_{network_hash}.npz")) as data:
+        offsets = data["coord_offsets"]
+        coords = data["coords"].tolist()
+        return {
+            "segment_id": data["segment_id"].tolist(),
+            "start_node": data["start_node"].tolist(),
+            "end_node": data["end_node"].tolist(),
+            "length": data["length"].tolist(),
+            "speed_limit": data["speed_limit"].tolist(),
+            "coordinates": [coords[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        }
+
+def migrate_json_results(project_id: str, delete: bool = False) -> List[date]:
+    """
+    Convert a legacy JSON result tree (<project_id>/<date>/<hour>.json) into day files.
+
+    Days that already have a day file are skipped.
+
+    Args:
+        project_id: ID of the project
+        delete: Remove the JSON directories after they were converted
+
+    Returns:
+        List of migrated dates
+    """
+    directory = project_dir(project_id)
+    if not os.path.isdir(directory):
+        return []
+
+    existing_days = set(_scan_days(project_id))
+    migrated = []
+    for date_dir in sorted(os.listdir(directory)):
+        date_path = os.path.join(directory, date_dir)
+        if not os.path.isdir(date_path):
+            continue
+        try:
+            day = datetime.strptime(date_dir, "%Y-%m-%d").date()
+        except ValueError:
+            continue  # Skip if directory name is not a valid date
+
+        if day not in existing_days:
+            results = []
+            for hour_file in os.listdir(date_path):
+                if hour_file.endswith(".json"):
+                    with open(os.path.join(date_path, hour_file), "r") as f:
+                        results.append(SimulationResult(**json.load(f)))
+            write_day(project_id, day, results)
+            migrated.append(day)
+
+        if delete:
+            shutil.rmtree(date_path)
+
+    # Record the conversion, JSON directories kept next to the day files are not scanned again
+    with _index_lock(project_id):
+        _write_index(project_id, read_index(project_id), legacy_migrated=True)
+    return migrated
+
+def migrate_legacy_results(project_id: str) -> None:
+    """
+    Convert legacy JSON results of a project once.
+
+    The index records a completed conversion, so neither this nor a later
+    process scans the project directory again.
+
+    Args:
+        project_id: ID of the project
+    """
+    if project_id in _LEGACY_CHECKED:
+        return
+    if not os.path.isdir(project_dir(project_id)):
+        return  # Nothing stored yet, new results are never written as JSON
+    with _index_lock(project_id):
+        if project_id in _LEGACY_CHECKED:
+            return
+        index_data = _read_index_data(project_id) or {}
+        if not index_data.get("legacy_migrated") and has_legacy_results(project_id):
+            migrate_json_results(project_id)
+        _LEGACY_CHECKED.add(project_id)
+
+def has_legacy_results(project_id: str) -> bool:
+    """Whether a project still has results in the legacy per-hour JSON layout."""
+    directory = project_dir(project_id)
+    return os.path.isdir(directory) and any(
+        os.path.isdir(os.path.join(directory, name)) for name in os.listdir(directory)
+    )
+
+def _scan_days(project_id: str) -> List[date]:
+    """List the days that have a day file on disk."""
+    directory = project_dir(project_id)
+    if not os.path.isdir(directory):
+        return []
+
+    days = []
+    for file_name in os.listdir(directory):
+        if not file_name.endswith(".npz") or file_name.startswith("network_"):
+            continue
+        try:
+            days.append(datetime.strptime(file_name[:-4], "%Y-%m-%d").date())
+        except ValueError:
+            continue  # Not a day file
+    return sorted(days)
+
+def _parse_step_time(value: Any) -> time:
+    """Parse a time step of the index ("HH:MM", or an hour from indexes written before sub-hour steps)."""
+    if isinstance(value, int):
+        return time(hour=value)
+    return datetime.strptime(value, "%H:%M").time()
+
+def _read_index_data(project_id: str) -> Optional[Dict[str, Any]]:
+    """Read the index file of a project, None if it is missing or unreadable."""
+    path = os.path.join(project_dir(project_id), INDEX_FILE_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading result index for project {project_id}: {str(e)}")
+        return None
+
+def _write_index(project_id: str, index: Dict[date, List[time]], legacy_migrated: Optional[bool] = None) -> None:
+    """Write the index of a project atomically, keeping the migration flag unless given (caller holds _index_lock)."""
+    path = os.path.join(project_dir(project_id), INDEX_FILE_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if legacy_migrated is None:
+        legacy_migrated = bool((_read_index_data(project_id) or {}).get("legacy_migrated"))
+
+    index_data: Dict[str, Any] = {
+        "days": {
+            day.isoformat(): [step_time.strftime("%H:%M") for step_time in step_times]
+            for day, step_times in sorted(index.items())
+        }
+    }
+    if legacy_migrated:
+        index_data["legacy_migrated"] = True  # Legacy JSON results were converted (see migrate_legacy_results)
+
+    with _temporary_file(path) as f:
+        f.write(json.dumps(index_data, indent=2).encode("utf-8"))
+
+def _write_network(project_id: str, segments: List[TrafficSegment]) -> str:
+    """Store the geometry of a network once and return its hash."""
+    segment_ids = [segment.segment_id for segment in segments]
+    coord_counts = [len(segment.coordinates) for segment in segments]
+    coords = np.array(
+        [point for segment in segments for point in segment.coordinates], dtype=np.float64
+    ).reshape(-1, 2)
+
+    digest = hashlib.sha1()
+    digest.update("\n".join(segment_ids).encode("utf-8"))
+    digest.update(coords.tobytes())
+    network_hash = digest.hexdigest()[:16]
+
+    path = os.path.join(project_dir(project_id), f"network_{network_hash}.npz")
+    if not os.path.exists(path):
+        _atomic_savez(
+            path,
+            segment_id=np.array(segment_ids, dtype=str),
+            start_node=np.array([segment.start_node for segment in segments], dtype=str),
+            end_node=np.array([segment.end_node for segment in segments], dtype=str),
+            length=np.array([segment.length for segment in segments], dtype=np.float64),
+            speed_limit=np.array([segment.speed_limit for segment in segments], dtype=np.float64),
+            coord_offsets=np.concatenate([[0], np.cumsum(coord_counts)]).astype(np.int64),
+            coords=coords
+        )
+    return network_hash
+
+def _atomic_savez(path: str, **arrays: np.ndarray) -> None:
+    """Write an .npz file via a temporary file so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _temporary_file(path) as f:
+        np.savez(f, **arrays)
+
+@contextmanager
+def _temporary_file(path: str) -> Iterator[Any]:
+    """Open a uniquely named temporary file next to path and move it into place when the block succeeds."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+@contextmanager
+def _index_lock(project_id: str) -> Iterator[None]:
+    """Hold the index of a project against other threads and processes for a read-modify-write."""
+    with _INDEX_LOCK:
+        file_lock = _INDEX_FILE_LOCKS.get(project_id)
+        if file_lock is None:
+            os.makedirs(project_dir(project_id), exist_ok=True)
+            file_lock = _INDEX_FILE_LOCKS[project_id] = FileLock(
+                os.path.join(project_dir(project_id), f"{INDEX_FILE_NAME}.lock")
+            )
+        with file_lock:
+            yield
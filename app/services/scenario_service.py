@@ -0,0 +1,329 @@
+import os
+import json
+import threading
+import time as timer
+import numpy as np
+import pandas as pd
+from datetime import datetime, date
+from typing import Dict, List, Any, Optional
+
+from app.models.scenario import Scenario, ScenarioComparison, ScenarioStepDelta
+from app.services.project_service import get_project
+from app.services.edge_features import load_edge_features, reroute_edge_features
+from app.services.workbook_cache import load_simulation_sheets
+from app.services.delivery_windows import parse_time_windows, step_delivery_counts, minute_of_day
+from app.services.traffic_model import PEAK_HOURS, is_peak_hour, distance_factor
+from app.services.simulation_service import _prepare_edge_data, _deliveries_on, edge_data_hash
+from app.services import result_store
+
+# Named scenarios, one JSON file per project
+SCENARIOS_DIR = "data/scenarios"
+
+# Segments above this congestion level count as congested in the KPIs
+CONGESTED_LEVEL = 0.8
+
+_scenarios_lock = threading.Lock()
+
+def _scenarios_path(project_id: str) -> str:
+    return os.path.join(SCENARIOS_DIR, f"{project_id}.json")
+
+def _load_scenarios(project_id: str) -> List[Dict[str, Any]]:
+    """Load the scenarios of a project from its JSON file"""
+    path = _scenarios_path(project_id)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return []
+
+def _save_scenarios(project_id: str, scenarios: List[Dict[str, Any]]) -> None:
+    """Save the scenarios of a project to its JSON file"""
+    os.makedirs(SCENARIOS_DIR, exist_ok=True)
+    with open(_scenarios_path(project_id), "w", encoding="utf-8") as f:
+        json.dump(scenarios, f, indent=2, default=str, ensure_ascii=False)
+
+def list_scenarios(project_id: str) -> List[Scenario]:
+    """Get all scenarios of a project."""
+    return [Scenario(**scenario) for scenario in _load_scenarios(project_id)]
+
+def get_scenario(project_id: str, name: str) -> Optional[Scenario]:
+    """Get a scenario of a project by name, None if it does not exist."""
+    for scenario in _load_scenarios(project_id):
+        if scenario.get("name") == name:
+            return Scenario(**scenario)
+    return None
+
+def save_scenario(project_id: str, scenario: Scenario) -> Scenario:
+    """
+    Create or replace a named scenario of a project.
+
+    Raises:
+        ValueError: If the project is not found
+    """
+    if not get_project(project_id):
+        raise ValueError(f"Project {project_id} not found")
+    with _scenarios_lock:
+        scenarios = [s for s in _load_scenarios(project_id) if s.get("name") != scenario.name]
+        scenarios.append(scenario.model_dump())
+        _save_scenarios(project_id, scenarios)
+    return scenario
+
+def delete_scenario(project_id: str, name: str) -> bool:
+    """Delete a scenario, returns False if it does not exist."""
+    with _scenarios_lock:
+        scenarios = _load_scenarios(project_id)
+        remaining = [s for s in scenarios if s.get("name") != name]
+        if len(remaining) == len(scenarios):
+            return False
+        _save_scenarios(project_id, remaining)
+    return True
+
+def evaluate_scenario(project_id: str, scenario: Scenario, start_date: date, end_date: date) -> ScenarioComparison:
+    """
+    Compare a scenario with the stored simulation of a project.
+
+    The stored volumes are background traffic plus the delivery component, so the
+    background layer is recovered by subtracting the stored run's delivery
+    component and only the delivery component is recomputed for the scenario.
+    No traffic is simulated again, the cost is a few array operations per day.
+
+    Args:
+        project_id: ID of the project
+        scenario: Scenario to evaluate
+        start_date: First date of the comparison
+        end_date: Last date of the comparison
+
+    Returns:
+        ScenarioComparison with KPIs and the per-step changes of every changed segment
+
+    Raises:
+        ValueError: If the project is not found, has no stored simulation in the date range,
+            or the stored simulation does not match the current edge features (road network,
+            access routes, route shares), was not run with the statistical engine or is an ensemble
+    """
+    started = timer.perf_counter()
+    project = get_project(project_id)
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+    if end_date < start_date:
+        raise ValueError("End date must be after start date")
+
+    days = [day for day in result_store.list_days(project_id) if start_date <= day <= end_date]
+    features = load_edge_features(project_id, project.polygon, project.map_bounds, project.access_routes, build=False)
+    if not days or features is None:
+        raise ValueError("No stored simulation in the date range, run the simulation first")
+
+    edge_data = _prepare_edge_data(features)
+    features_hash = edge_data_hash(edge_data)
+    capacity = edge_data["capacity"]
+    baseline_share = edge_data["delivery_share"]
+    variant_share = baseline_share
+    if scenario.access_routes is not None:
+        shares = reroute_edge_features(features, project.polygon, scenario.access_routes)
+        variant_share = shares["inbound"] + shares["outbound"]
+        if not variant_share.any():
+            variant_share = distance_factor(edge_data["distance_to_site"]) * 2
+
+    deliveries = parse_time_windows(load_simulation_sheets(project.file_path, project.file_hash)["Deliveries"])
+    variant_deliveries = apply_scenario(
+        deliveries, scenario,
+        minute_of_day(project.simulation_start_time, "06:00"), minute_of_day(project.simulation_end_time, "18:00")
+    )
+
+    baseline_kpis, variant_kpis = _KpiTotals(), _KpiTotals()
+    step_deltas = []
+    network_hash = None
+    for day in days:
+        day_arrays = result_store.read_day_arrays(project_id, day)
+        if network_hash != day_arrays["network_hash"]:
+            network_hash = day_arrays["network_hash"]
+            if result_store.read_network(project_id, network_hash)["segment_id"] != edge_data["segment_id"]:
+                raise ValueError(f"Stored simulation of {day} does not match the current road network, run the simulation again")
+
+        steps = day_arrays["steps"]
+        # The delivery part is rebuilt from the current route shares, so they must be the stored run's
+        if steps[0]["stats"].get("features_hash") != features_hash:
+            raise ValueError(
+                f"Stored simulation of {day} was run with other access routes or route shares, run the simulation again"
+            )
+        if steps[0]["stats"].get("engine", "statistical") != "statistical":
+            raise ValueError("Scenarios need a baseline simulated with the statistical engine")
+        if steps[0]["stats"].get("replications", 1) > 1:
+            # Ensemble volumes are medians, not background plus delivery traffic
+            raise ValueError("Scenarios need a baseline simulated with a single replication")
+
+        step_times = [datetime.fromisoformat(step["time"]) for step in steps]
+        step_starts = np.array([t.hour * 60 + t.minute for t in step_times])
+        step_minutes = steps[0]["stats"].get("interval_minutes", 60)
+        step_hours = step_minutes / 60
+
+        # Background traffic: stored volume minus the stored run's (truncated) delivery component
+        baseline_vehicles = np.array([_step_vehicles(step["stats"]) for step in steps], dtype=float)
+        baseline_delivery = np.floor(baseline_vehicles[:, None] * baseline_share[None, :])
+        baseline_volume = day_arrays["traffic_volume"]
+        background = baseline_volume - baseline_delivery
+
+        counts = step_delivery_counts(_deliveries_on(variant_deliveries, day), step_starts, step_minutes)
+        variant_vehicles = counts["vehicles"] * scenario.delivery_factor
+        variant_delivery = np.floor(variant_vehicles[:, None] * variant_share[None, :])
+        variant_volume = (background + variant_delivery).astype(np.int64)
+        variant_congestion = np.zeros(variant_volume.shape)
+        np.divide(variant_volume, capacity, out=variant_congestion, where=capacity > 0)
+        np.minimum(variant_congestion, 1.0, out=variant_congestion)
+
+        peak = is_peak_hour(step_starts / 60)
+        baseline_kpis.add(
+            step_times, baseline_volume, day_arrays["congestion_level"], baseline_delivery,
+            np.array([step["stats"].get("deliveries_count", 0) for step in steps], dtype=float), peak, step_hours
+        )
+        variant_kpis.add(
+            step_times, variant_volume, variant_congestion, variant_delivery,
+            counts["deliveries"] * scenario.delivery_factor, peak, step_hours
+        )
+
+        volume_delta = variant_volume - baseline_volume
+        congestion_delta = variant_congestion - day_arrays["congestion_level"]
+        for i, step_time in enumerate(step_times):
+            changed = np.flatnonzero((volume_delta[i] != 0) | (np.abs(congestion_delta[i]) > 1e-9))
+            step_deltas.append(ScenarioStepDelta(
+                time=step_time,
+                segment_indices=changed.tolist(),
+                traffic_volume_deltas=volume_delta[i, changed].astype(int).tolist(),
+                congestion_level_deltas=np.round(congestion_delta[i, changed], 4).tolist()
+            ))
+
+    baseline, variant = baseline_kpis.result(), variant_kpis.result()
+    return ScenarioComparison(
+        project_id=project_id,
+        scenario=scenario,
+        start_date=start_date,
+        end_date=end_date,
+        network_hash=network_hash,
+        baseline=baseline,
+        variant=variant,
+        difference={
+            key: round(variant[key] - baseline[key], 4)
+            for key in baseline if isinstance(baseline[key], (int, float))
+        },
+        steps=step_deltas,
+        execution_seconds=round(timer.perf_counter() - started, 4)
+    )
+
+def apply_scenario(deliveries: pd.DataFrame, scenario: Scenario, window_start: int, window_end: int) -> pd.DataFrame:
+    """
+    Apply the time window changes of a scenario to the parsed deliveries.
+
+    Args:
+        deliveries: Deliveries with StartMinute and EndMinute columns
+        scenario: Scenario to apply
+        window_start: Earliest start of a moved time window (minute of the day)
+        window_end: Latest end of a moved time window (minute of the day)
+
+    Returns:
+        Copy of the deliveries with the moved time windows
+    """
+    deliveries = deliveries.copy()
+    valid = (deliveries["StartMinute"] >= 0).to_numpy()
+    start = deliveries["StartMinute"].to_numpy(dtype=np.int64).copy()
+    end = deliveries["EndMinute"].to_numpy(dtype=np.int64).copy()
+
+    if scenario.shift_minutes:
+        start[valid] += scenario.shift_minutes
+        end[valid] += scenario.shift_minutes
+
+    if scenario.avoid_peak_hours:
+        shift = _peak_avoiding_shift(start, end, valid, window_start, window_end)
+        start += shift
+        end += shift
+
+    deliveries["StartMinute"] = start
+    deliveries["EndMinute"] = end
+    return deliveries
+
+def _peak_avoiding_shift(
+    start: np.ndarray,
+    end: np.ndarray,
+    valid: np.ndarray,
+    window_start: int,
+    window_end: int
+) -> np.ndarray:
+    """Smallest shift of every time window that moves it out of all peak hours (0 if none fits)."""
+    # Peak hours as [start, end) minute intervals, time windows include their end minute
+    peaks = [(first * 60, (last + 1) * 60) for first, last in PEAK_HOURS]
+    duration = end - start
+
+    def overlaps_peak(window_start_minute: np.ndarray, window_end_minute: np.ndarray) -> np.ndarray:
+        overlap = np.zeros(len(window_start_minute), dtype=bool)
+        for peak_start, peak_end in peaks:
+            overlap |= (window_start_minute < peak_end) & (window_end_minute >= peak_start)
+        return overlap
+
+    needs_move = valid & overlaps_peak(start, end)
+    best = np.full(len(start), np.iinfo(np.int64).max)
+    for peak_start, peak_end in peaks:
+        # Start right after the peak or end right before it
+        for candidate in (np.full(len(start), peak_end), peak_start - 1 - duration):
+            fits = (
+                needs_move & ~overlaps_peak(candidate, candidate + duration) &
+                (candidate >= window_start) & (candidate + duration <= window_end)
+            )
+            shift = candidate - start
+            better = fits & (np.abs(shift) < np.abs(best))
+            best[better] = shift[better]
+    return np.where(best == np.iinfo(np.int64).max, 0, best)
+
+def _step_vehicles(stats: Dict[str, Any]) -> int:
+    """Deliveries with a known vehicle type of a stored step (the ones that add traffic)."""
+    if "vehicle_type_counts" in stats:
+        return sum(stats["vehicle_type_counts"].values())
+    return stats.get("deliveries_count", 0)
+
+class _KpiTotals:
+    """Running KPI totals of one side of a comparison over all compared days."""
+
+    def __init__(self):
+        self.total_traffic = 0.0
+        self.delivery_traffic = 0.0
+        self.congestion_sum = 0.0
+        self.steps = 0
+        self.congested_segment_steps = 0
+        self.deliveries = 0.0
+        self.peak_hour_deliveries = 0.0
+        self.peak_traffic_volume = 0
+        self.peak_time = None
+
+    def add(
+        self,
+        step_times: List[datetime],
+        volume: np.ndarray,
+        congestion: np.ndarray,
+        delivery_volume: np.ndarray,
+        deliveries: np.ndarray,
+        peak: np.ndarray,
+        step_hours: float
+    ) -> None:
+        step_totals = volume.sum(axis=1)
+        self.total_traffic += float(step_totals.sum()) * step_hours
+        self.delivery_traffic += float(delivery_volume.sum()) * step_hours
+        self.congestion_sum += float(congestion.mean(axis=1).sum()) if congestion.size else 0.0
+        self.steps += len(step_times)
+        self.congested_segment_steps += int((congestion > CONGESTED_LEVEL).sum())
+        self.deliveries += float(deliveries.sum())
+        self.peak_hour_deliveries += float(deliveries[peak].sum())
+        if len(step_totals) and step_totals.max() > self.peak_traffic_volume:
+            self.peak_traffic_volume = int(step_totals.max())
+            self.peak_time = step_times[int(step_totals.argmax())]
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "total_traffic": int(round(self.total_traffic)),
+            "delivery_traffic": int(round(self.delivery_traffic)),
+            "average_congestion": round(self.congestion_sum / self.steps, 4) if self.steps else 0.0,
+            "congested_segment_steps": self.congested_segment_steps,
+            "deliveries_count": round(self.deliveries, 2),
+            "peak_hour_deliveries": round(self.peak_hour_deliveries, 2),
+            "peak_traffic_volume": self.peak_traffic_volume,
+            "peak_time": self.peak_time
+        }
@@ -0,0 +1,346 @@
+import time as timer
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Set
+
+from app.models.schedule import ScheduleOptimizationRequest, ScheduleOptimizationResult, ScheduledDelivery
+from app.services.project_service import get_project
+from app.services.edge_features import load_edge_features
+from app.services.workbook_cache import load_simulation_sheets
+from app.services.delivery_windows import parse_time_windows, step_incidence, minute_of_day
+from app.services.traffic_model import expected_base_traffic, is_peak_hour
+from app.services.waiting_area_model import (
+    waiting_area_capacities, unloading_minutes_by_type, unloading_minutes_of, DEFAULT_UNLOADING_MINUTES, UNLOADING_BAYS
+)
+from app.services.simulation_service import _prepare_edge_data
+
+# Names of the weekdays in the project's delivery_days, Monday first
+WEEKDAYS = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
+
+# The objective is evaluated on hourly loads over the whole day
+HOURS = np.arange(24)
+
+# Weight of the mean squared hourly load in the objective, spreads the load where the peak cannot be lowered further
+SMOOTHING_WEIGHT = 0.01
+
+# Objective penalty per hour a delivery is moved, keeps deliveries at their requested time if moving does not help
+SHIFT_PENALTY = 1e-4
+
+# Hours whose peak access-route congestion exceeds this level count as congested
+CONGESTED_LEVEL = 0.8
+
+def optimize_delivery_schedule(request: ScheduleOptimizationRequest) -> ScheduleOptimizationResult:
+    """
+    Propose delivery slots that flatten peak access-route congestion or waiting-area overflow.
+
+    Each delivery keeps the length of its time window and is assigned a start on a
+    full hour within the project's delivery hours; deliveries on days that are not
+    delivery days move to the nearest delivery day in the date range first. Every day is solved by a
+    greedy construction followed by steepest-descent local search over single
+    moves. All moves of an iteration are scored at once on (candidates x hours)
+    load arrays, so each iteration evaluates thousands of candidate schedules.
+    Deliveries without a readable time window are left out.
+
+    Args:
+        request: Project, date range, objective and local search budget
+
+    Returns:
+        ScheduleOptimizationResult with the proposed schedule and the KPIs of both schedules
+
+    Raises:
+        ValueError: If the project is not found, the date range is invalid or the delivery
+            hours are not given as HH:MM
+    """
+    started = timer.perf_counter()
+    project = get_project(request.project_id)
+    if not project:
+        raise ValueError(f"Project {request.project_id} not found")
+    if request.end_date < request.start_date:
+        raise ValueError("End date must be after start date")
+
+    sheets = load_simulation_sheets(project.file_path, project.file_hash)
+    deliveries = parse_time_windows(sheets["Deliveries"]).reset_index(drop=True)
+    delivery_dates = pd.to_datetime(deliveries["Date"], errors="coerce").dt.normalize()
+    selected = (
+        (deliveries["StartMinute"] >= 0) & (deliveries["EndMinute"] >= deliveries["StartMinute"]) &
+        (delivery_dates >= pd.Timestamp(request.start_date)) & (delivery_dates <= pd.Timestamp(request.end_date))
+    ).to_numpy()
+    rows = np.flatnonzero(selected)
+    deliveries = deliveries.iloc[rows]
+
+    delivery_hours = project.delivery_hours or {}
+    window_start = minute_of_day(delivery_hours.get("start"), project.simulation_start_time or "06:00")
+    window_end = minute_of_day(delivery_hours.get("end"), project.simulation_end_time or "18:00")
+    if window_end <= window_start:
+        raise ValueError("Delivery hours must end after they start")
+    allowed_weekdays = {WEEKDAYS.index(day) for day in project.delivery_days or [] if day in WEEKDAYS} or set(range(7))
+
+    features = load_edge_features(project.id, project.polygon, project.map_bounds, project.access_routes)
+    if features is None:
+        raise ValueError(f"Road network of project {project.id} could not be loaded")
+    edge_data = _prepare_edge_data(features)
+
+    vehicle_types = deliveries["VehicleType"] if "VehicleType" in deliveries.columns else pd.Series(None, index=deliveries.index)
+    unloading = unloading_minutes_of(vehicle_types, unloading_minutes_by_type(sheets["Vehicles"]))
+    original_days = np.array(delivery_dates.iloc[rows].dt.date.tolist(), dtype=object)
+    days = np.array([
+        _nearest_delivery_day(day, allowed_weekdays, request.start_date, request.end_date) for day in original_days
+    ])
+
+    context = {
+        "objective": request.objective,
+        "traffic_weight": vehicle_types.notna().to_numpy(dtype=np.int64),  # Only known vehicle types add traffic
+        "unloading": unloading,
+        "service_minutes": UNLOADING_BAYS * 60.0,
+        "mean_unloading": float(unloading.mean()) if len(unloading) else DEFAULT_UNLOADING_MINUTES,
+        "waiting_capacity": int(waiting_area_capacities(project.waiting_areas).sum()),
+        "window_hours": (HOURS >= window_start // 60) & (HOURS <= window_end // 60)
+    }
+    max_load = max([int(context["traffic_weight"][days == day].sum()) for day in set(days)] + [0])
+    context["congestion_table"] = _congestion_table(edge_data["delivery_share"], edge_data["capacity"], max_load)
+
+    original_start = deliveries["StartMinute"].to_numpy(dtype=np.int64)
+    original_end = deliveries["EndMinute"].to_numpy(dtype=np.int64)
+    start, end = original_start.copy(), original_end.copy()
+    candidates_evaluated = 0
+    for day in sorted(set(days)):
+        on_day = np.flatnonzero(days == day)
+        day_result = _optimize_day(
+            original_start[on_day], original_end[on_day], on_day, context, window_start, window_end, request.max_iterations
+        )
+        start[on_day] = day_result["start"]
+        end[on_day] = day_result["start"] + original_end[on_day] - original_start[on_day]
+        candidates_evaluated += day_result["candidates_evaluated"]
+
+    baseline = _schedule_kpis(original_days, original_start, original_end, context)
+    optimized = _schedule_kpis(days, start, end, context)
+    schedule = [
+        ScheduledDelivery(
+            row=int(row),
+            vehicle_type=None if pd.isna(vehicle_type) else str(vehicle_type),
+            original_date=original_days[i],
+            original_time_window=_format_window(original_start[i], original_end[i]),
+            date=days[i],
+            time_window=_format_window(start[i], end[i]),
+            moved=bool(days[i] != original_days[i] or start[i] != original_start[i])
+        )
+        for i, (row, vehicle_type) in enumerate(zip(rows, vehicle_types))
+    ]
+    return ScheduleOptimizationResult(
+        project_id=project.id,
+        objective=request.objective,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        schedule=schedule,
+        baseline=baseline,
+        optimized=optimized,
+        improvement={key: round(baseline[key] - optimized[key], 4) for key in baseline},
+        candidates_evaluated=candidates_evaluated,
+        execution_seconds=round(timer.perf_counter() - started, 4)
+    )
+
+def _optimize_day(
+    original_start: np.ndarray,
+    original_end: np.ndarray,
+    indices: np.ndarray,
+    context: Dict[str, Any],
+    window_start: int,
+    window_end: int,
+    max_iterations: int
+) -> Dict[str, Any]:
+    """
+    Assign the deliveries of one day to hourly slots, greedy first and then by local search.
+
+    Returns:
+        Dictionary with the new "start" minute of every delivery, shape (M,), and
+        the number of "candidates_evaluated"
+    """
+    duration = original_end - original_start
+    slots = np.arange(-(-window_start // 60), window_end // 60 + 1) * 60
+    feasible = (slots[None, :] >= window_start) & (slots[None, :] + duration[:, None] <= window_end)
+    movable = np.flatnonzero(feasible.any(axis=1))
+    fixed = np.flatnonzero(~feasible.any(axis=1))  # Windows longer than the delivery hours stay where they are
+
+    # Hourly traffic and unloading work of every delivery in every slot, (M, S, T)
+    slot_start = np.broadcast_to(slots[None, :], feasible.shape)
+    slot_traffic, slot_work = _hourly_loads(
+        slot_start, slot_start + duration[:, None],
+        context["traffic_weight"][indices][:, None], context["unloading"][indices][:, None]
+    )
+    penalty = np.where(feasible, np.abs(slots[None, :] - original_start[:, None]) / 60 * SHIFT_PENALTY, np.inf)
+
+    fixed_traffic, fixed_work = _hourly_loads(
+        original_start[fixed], original_end[fixed], context["traffic_weight"][indices[fixed]], context["unloading"][indices[fixed]]
+    )
+    base_traffic, base_work = fixed_traffic.sum(axis=0), fixed_work.sum(axis=0)
+    candidates_evaluated = 0
+
+    # Greedy: the most constrained deliveries first, each into the best slot given the ones already placed
+    slot = np.full(len(duration), -1)
+    traffic, work = base_traffic.copy(), base_work.copy()
+    order = movable[np.lexsort((-context["traffic_weight"][indices[movable]], feasible[movable].sum(axis=1)))]
+    for m in order:
+        values = _objective(traffic + slot_traffic[m], work + slot_work[m], context) + penalty[m]
+        candidates_evaluated += len(values)
+        slot[m] = int(np.argmin(values))
+        traffic += slot_traffic[m, slot[m]]
+        work += slot_work[m, slot[m]]
+
+    # Start the local search from the current schedule if the greedy one is not better
+    original_traffic, original_work = _hourly_loads(
+        original_start[movable], original_end[movable], context["traffic_weight"][indices[movable]], context["unloading"][indices[movable]]
+    )
+    original_traffic, original_work = base_traffic + original_traffic.sum(axis=0), base_work + original_work.sum(axis=0)
+    greedy_value = _objective(traffic[None], work[None], context)[0] + penalty[movable, slot[movable]].sum()
+    original_value = _objective(original_traffic[None], original_work[None], context)[0]
+    candidates_evaluated += 2
+    if original_value <= greedy_value:
+        on_slot = (slots[None, :] == original_start[movable, None]) & feasible[movable]
+        if on_slot.any(axis=1).all():
+            slot[movable] = np.argmax(on_slot, axis=1)
+            traffic, work = original_traffic, original_work
+        else:
+            # Windows off the hourly grid or outside the delivery hours cannot be kept, use the greedy schedule
+            original_value = np.inf
+
+    # Steepest descent: score every single move and apply the best one while it improves the schedule
+    value = _objective(traffic[None], work[None], context)[0] + penalty[movable, slot[movable]].sum()
+    for _ in range(max_iterations if len(movable) else 0):
+        current_traffic = slot_traffic[movable, slot[movable]]
+        current_work = slot_work[movable, slot[movable]]
+        candidate_traffic = traffic - current_traffic[:, None, :] + slot_traffic[movable]
+        candidate_work = work - current_work[:, None, :] + slot_work[movable]
+        values = _objective(
+            candidate_traffic.reshape(-1, len(HOURS)), candidate_work.reshape(-1, len(HOURS)), context
+        ).reshape(len(movable), len(slots))
+        values += penalty[movable] - penalty[movable, slot[movable]][:, None] + penalty[movable, slot[movable]].sum()
+        candidates_evaluated += values.size
+
+        best = np.unravel_index(np.argmin(values), values.shape)
+        if values[best] >= value - 1e-12:
+            break
+        m = movable[best[0]]
+        traffic, work = candidate_traffic[best], candidate_work[best]
+        slot[m], value = best[1], values[best]
+
+    start = original_start.copy()
+    if value < original_value:
+        start[movable] = slots[slot[movable]]
+    return {"start": start, "candidates_evaluated": candidates_evaluated}
+
+def _hourly_loads(
+    start: np.ndarray,
+    end: np.ndarray,
+    traffic_weight: np.ndarray,
+    unloading: np.ndarray
+) -> tuple:
+    """
+    Hourly traffic and unloading work of delivery windows.
+
+    Traffic counts a delivery in every hour its window overlaps (as the simulation
+    does); unloading work is spread over the window like the uniformly drawn
+    arrivals of the waiting area model.
+
+    Returns:
+        Tuple of the traffic (int) and work (minutes) arrays, shape start.shape + (T,)
+    """
+    shape = np.broadcast(start, end).shape
+    start = np.broadcast_to(start, shape).ravel()
+    end = np.broadcast_to(end, shape).ravel()
+    step_starts = HOURS * 60
+
+    active = step_incidence(pd.DataFrame({"StartMinute": start, "EndMinute": end}), step_starts, 60)
+    overlap = np.clip(
+        np.minimum(end[:, None], step_starts[None, :] + 60) - np.maximum(start[:, None], step_starts[None, :]), 0, None
+    )
+    duration = (end - start)[:, None]
+    arrivals = np.where(
+        duration > 0, overlap / np.maximum(duration, 1), (start[:, None] >= step_starts) & (start[:, None] < step_starts + 60)
+    )
+
+    traffic = active.astype(np.int64) * np.broadcast_to(traffic_weight, shape).ravel()[:, None]
+    work = arrivals * np.broadcast_to(unloading, shape).ravel()[:, None]
+    return traffic.reshape(shape + (len(HOURS),)), work.reshape(shape + (len(HOURS),))
+
+def _congestion_table(delivery_share: np.ndarray, capacity: np.ndarray, max_load: int) -> np.ndarray:
+    """
+    Peak congestion over the access-route edges for every hour and number of delivery vehicles.
+
+    Entry (t, n) is the highest expected congestion of the edges the delivery routes
+    use in hour t with n delivery vehicles on the road, so the objective is a table
+    lookup per candidate and hour.
+
+    Returns:
+        Array of shape (T, max_load + 1), not capped at 1 so overloads stay comparable
+    """
+    route = (delivery_share > 0) & (capacity > 0)
+    if not route.any():
+        route = capacity > 0
+    share, route_capacity = delivery_share[route], capacity[route]
+    background = expected_base_traffic(HOURS)
+    loads = np.arange(max_load + 1)
+
+    table = np.zeros((len(HOURS), max_load + 1))
+    if not route.any():
+        return table
+    for t in range(len(HOURS)):
+        table[t] = ((background[t] + loads[:, None] * share[None, :]) / route_capacity[None, :]).max(axis=1)
+    return table
+
+def _objective(traffic: np.ndarray, work: np.ndarray, context: Dict[str, Any]) -> np.ndarray:
+    """Objective of candidate schedules from their hourly loads (C, T), lower is better."""
+    if context["objective"] == "waiting":
+        trucks = _waiting_trucks(work, context)
+        overflow = np.maximum(trucks - context["waiting_capacity"], 0)
+        return overflow.sum(axis=1) + SMOOTHING_WEIGHT * (trucks ** 2).mean(axis=1)
+
+    peak = context["congestion_table"][HOURS[None, :], traffic]
+    return peak.max(axis=1) + SMOOTHING_WEIGHT * (peak ** 2).mean(axis=1)
+
+def _waiting_trucks(work: np.ndarray, context: Dict[str, Any]) -> np.ndarray:
+    """Trucks waiting for an unloading bay at the end of every hour, from a fluid queue of the unloading work."""
+    queue = np.zeros(work.shape[0])
+    trucks = np.zeros(work.shape)
+    for t in range(work.shape[1]):
+        queue = np.maximum(queue + work[:, t] - context["service_minutes"], 0)
+        trucks[:, t] = queue / context["mean_unloading"]
+    return trucks
+
+def _schedule_kpis(days: np.ndarray, start: np.ndarray, end: np.ndarray, context: Dict[str, Any]) -> Dict[str, Any]:
+    """KPIs of a schedule summed over its days."""
+    window_hours = context["window_hours"]
+    peak_hours = is_peak_hour(HOURS)
+    traffic, work = _hourly_loads(start, end, context["traffic_weight"], context["unloading"])
+    day_list = sorted(set(days))
+    daily_traffic = np.array([traffic[days == day].sum(axis=0) for day in day_list]).reshape(-1, len(HOURS))
+    daily_work = np.array([work[days == day].sum(axis=0) for day in day_list]).reshape(-1, len(HOURS))
+
+    congestion = np.minimum(context["congestion_table"][HOURS[None, :], daily_traffic], 1.0)[:, window_hours]
+    trucks = _waiting_trucks(daily_work, context)
+    overflow = np.maximum(trucks - context["waiting_capacity"], 0)
+    in_peak_hours = (traffic[:, peak_hours] > 0).any(axis=1) if len(traffic) else np.zeros(0, dtype=bool)
+    return {
+        "peak_route_congestion": round(float(congestion.max()), 4) if congestion.size else 0.0,
+        "average_route_congestion": round(float(congestion.mean()), 4) if congestion.size else 0.0,
+        "congested_route_hours": int((congestion > CONGESTED_LEVEL).sum()),
+        "waiting_overflow_truck_hours": round(float(overflow.sum()), 2),
+        "max_waiting_trucks": round(float(trucks.max()), 2) if trucks.size else 0.0,
+        "deliveries_in_peak_hours": int(in_peak_hours.sum())
+    }
+
+def _nearest_delivery_day(day: date, allowed_weekdays: Set[int], first_day: date, last_day: date) -> date:
+    """
+    The day itself if it is a delivery day, else the nearest delivery day (the earlier one on ties).
+
+    Only days from first_day to last_day are considered, so deliveries stay in the
+    optimized date range; without a delivery day in reach the day is kept.
+    """
+    for offset in range(7):
+        for candidate in (day - timedelta(days=offset), day + timedelta(days=offset)):
+            if first_day <= candidate <= last_day and candidate.weekday() in allowed_weekdays:
+                return candidate
+    return day
+
+def _format_window(start: int, end: int) -> str:
+    return f"{start // 60:02d}:{start % 60:02d}-{end // 60:02d}:{end % 60:02d}"
@@ -1,19 +1,53 @@
 import os
 import json
+import pickle
+import hashlib
+import tempfile
 import pandas as pd
 import geopandas as gpd
 import numpy as np
-import osmnx as ox
 from shapely.geometry import Point, LineString, Polygon
 from datetime import datetime, date, time, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from threading import Event
 
-from app.models.simulation import SimulationRequest, SimulationResult, TrafficSegment, SimulationTimeStep
+from app.models.simulation import (
+    SimulationRequest, SimulationResult, TrafficSegment, SimulationTimeStep,
+    CompactSimulationResult, SimulationNetwork
+)
 from app.services.project_service import get_project
+from app.services import traffic_model
+from app.services.traffic_model import (
+    compute_edge_traffic, compute_edge_traffic_ensemble, ensemble_percentiles, distance_factor
+)
+from app.services import waiting_area_model
+from app.services.waiting_area_model import (
+    waiting_area_capacities, unloading_minutes_by_type, draw_truck_arrivals,
+    simulate_waiting_areas, aggregate_waiting_steps
+)
+from app.services.link_queue_model import prepare_link_queue_network, compute_link_queue_traffic
+from app.services import link_queue_model
+from app.services.edge_features import load_edge_features
+from app.services.workbook_cache import load_simulation_sheets
+from app.services.delivery_windows import parse_time_windows, step_delivery_counts
+from app.services import result_store, result_cache
 
-# In-memory storage for simulation results
-# Structure: project_id -> date -> hour -> SimulationResult
-SIMULATION_RESULTS = {}
+# Number of worker processes used to simulate date ranges (1 disables the process pool)
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", os.cpu_count() or 1))
+
+# Bump when the simulation model changes so stored days are recomputed on the next run;
+# part of every day's random seed, so a new version also draws new random numbers
+SIMULATION_MODEL_VERSION = 3
+
+# Simulation context of a worker process, loaded by _init_simulation_worker
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+# Called with (days_done, days_total) while a date range is simulated
+ProgressCallback = Callable[[int, int], None]
+
+class SimulationCancelled(Exception):
+    """Raised when a running simulation is cancelled through its cancel event."""
 
 def run_simulation(request: SimulationRequest) -> SimulationResult:
     """
@@ -28,6 +62,74 @@ def run_simulation(request: SimulationRequest) -> SimulationResult:
     Raises:
         ValueError: If the project is not found or there's an issue with the input
     """
+    simulation_results = run_simulation_range(request)
+    
+    # For simplicity, return the first result
+    # In a real application, you might return a summary or a specific time step
+    return simulation_results[0] if simulation_results else None
+
+def run_simulation_range(
+    request: SimulationRequest,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[Event] = None,
+    run_stats: Optional[Dict[str, Any]] = None
+) -> List[SimulationResult]:
+    """
+    Run a traffic simulation and store the results of every time step of the whole date range.
+    
+    See iter_simulation_range for how the days are simulated and stored.
+    
+    Args:
+        request: SimulationRequest with simulation parameters
+        progress_callback: Called with (days_done, days_total) as days complete
+        cancel_event: Set from another thread to stop the simulation
+        run_stats: Filled with the number of reused and recomputed days and whether
+            deliveries were spread by distance (fallback_spread)
+        
+    Returns:
+        List of SimulationResult objects, one per time step, in chronological order
+        
+    Raises:
+        ValueError: If the project is not found or there's an issue with the input
+        SimulationCancelled: If cancel_event was set before the simulation finished
+    """
+    simulation_results = []
+    for day_results in iter_simulation_range(request, progress_callback, cancel_event, run_stats):
+        simulation_results.extend(day_results)
+    return simulation_results
+
+def iter_simulation_range(
+    request: SimulationRequest,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[Event] = None,
+    run_stats: Optional[Dict[str, Any]] = None
+) -> Iterator[List[SimulationResult]]:
+    """
+    Run a traffic simulation and yield the results of each day as soon as it is stored.
+    
+    Each day is simulated from the project's simulation_start_time to its
+    simulation_end_time in steps of request.time_interval (or the project's
+    simulation_interval if the request does not set one).
+    
+    Days whose inputs are unchanged since their stored results were computed are
+    reused instead of simulated again (unless request.force_recompute is set).
+    Recomputed days are written to disk before they are yielded, so the caller
+    does not need to keep earlier days in memory.
+    
+    Args:
+        request: SimulationRequest with simulation parameters
+        progress_callback: Called with (days_done, days_total) as days complete
+        cancel_event: Set from another thread to stop the simulation
+        run_stats: Filled with the number of reused and recomputed days and whether
+            deliveries were spread by distance (fallback_spread)
+        
+    Yields:
+        SimulationResult objects of one day, one per time step, in chronological order
+        
+    Raises:
+        ValueError: If the project is not found or there's an issue with the input
+        SimulationCancelled: If cancel_event was set before the simulation finished
+    """
     # Get the project
     project = get_project(request.project_id)
     if not project:
@@ -37,105 +139,331 @@ def run_simulation(request: SimulationRequest) -> SimulationResult:
     if request.end_date < request.start_date:
         raise ValueError("End date must be after start date")
     
-    # Load the Excel data
-    excel_data = pd.read_excel(project.file_path)
+    # Load the workbook sheets (parsed once per upload, then served from the cache)
+    sheets = load_simulation_sheets(project.file_path, project.file_hash)
     
-    # Parse time interval
-    interval_hours = _parse_time_interval(request.time_interval)
+    # Parse time interval and build the time steps of a day
+    interval_hours = _parse_time_interval(request.time_interval or project.simulation_interval or "1h")
+    step_starts, step_minutes = _simulation_steps(
+        project.simulation_start_time, project.simulation_end_time, interval_hours
+    )
+    
+    if run_stats is None:
+        run_stats = {}
     
-    # Create simulation results
-    simulation_results = _simulate_traffic(
+    # Simulate day by day
+    simulated_days = _simulate_traffic(
         project_id=request.project_id,
         polygon=project.polygon,
         waiting_areas=project.waiting_areas,
         access_routes=project.access_routes,
         map_bounds=project.map_bounds,
-        deliveries=pd.read_excel(project.file_path, sheet_name="Deliveries"),
-        vehicles=pd.read_excel(project.file_path, sheet_name="Vehicles"),
-        schedule=pd.read_excel(project.file_path, sheet_name="Schedule"),
+        replications=request.replications,
+        seed=request.seed,
+        engine=request.engine,
+        deliveries=parse_time_windows(sheets["Deliveries"]),
+        vehicles=sheets["Vehicles"],
+        schedule=sheets["Schedule"],
         start_date=request.start_date,
         end_date=request.end_date,
-        interval_hours=interval_hours
+        step_starts=step_starts,
+        step_minutes=step_minutes,
+        progress_callback=progress_callback,
+        cancel_event=cancel_event,
+        reuse_stored_days=not request.force_recompute,
+        run_stats=run_stats
     )
     
-    # Store the results in memory
-    for result in simulation_results:
-        result_date = result.time_steps[0].time.date()
-        result_hour = result.time_steps[0].time.hour
-        
-        if request.project_id not in SIMULATION_RESULTS:
-            SIMULATION_RESULTS[request.project_id] = {}
+    for day_results, reused in simulated_days:
+        # Save the recomputed days to disk and keep them in the result cache
+        if not reused:
+            _save_simulation_results_to_disk(request.project_id, day_results)
+        yield day_results
+
+def summarize_simulation(results: List[SimulationResult], run_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Summarize the results of a simulation run.
+    
+    Args:
+        results: SimulationResult objects of the run, one per time step
+        run_stats: Run statistics filled by run_simulation_range
         
-        if result_date not in SIMULATION_RESULTS[request.project_id]:
-            SIMULATION_RESULTS[request.project_id][result_date] = {}
+    Returns:
+        Dictionary with totals, averages and the peak time step of the run
+    """
+    return summarize_steps(
+        [{"id": result.id, "time": result.time_steps[0].time, "stats": result.stats} for result in results],
+        run_stats
+    )
+
+def summarize_steps(steps: List[Dict[str, Any]], run_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Summarize a simulation run from the id, time and stats of its time steps.
+    
+    Args:
+        steps: One dictionary with "id", "time" and "stats" per time step, in chronological order
+        run_stats: Run statistics filled by run_simulation_range
         
-        SIMULATION_RESULTS[request.project_id][result_date][result_hour] = result
+    Returns:
+        Dictionary with totals, averages and the peak time step of the run
+    """
+    run_counts = {
+        "days_reused": (run_stats or {}).get("days_reused", 0),
+        "days_recomputed": (run_stats or {}).get("days_recomputed", 0),
+        "fallback_spread": (run_stats or {}).get("fallback_spread", False)
+    }
+    if not steps:
+        return {"result_count": 0, "days_simulated": 0, **run_counts}
     
-    # Save the results to disk
-    _save_simulation_results_to_disk(request.project_id)
+    # Volumes are flow rates per hour, weight them by the step length for vehicle totals
+    step_traffic = [step["stats"].get("total_traffic", 0) for step in steps]
+    step_hours = [step["stats"].get("interval_minutes", 60) / 60 for step in steps]
+    peak_index = int(np.argmax(step_traffic))
     
-    # For simplicity, return the first result
-    # In a real application, you might return a summary or a specific time step
-    return simulation_results[0] if simulation_results else None
+    return {
+        **run_counts,
+        "result_count": len(steps),
+        "days_simulated": len({step["time"].date() for step in steps}),
+        "start": steps[0]["time"],
+        "end": steps[-1]["time"],
+        "total_traffic": int(round(sum(traffic * hours for traffic, hours in zip(step_traffic, step_hours)))),
+        "average_congestion": float(np.mean([step["stats"].get("average_congestion", 0) for step in steps])),
+        "deliveries_count": int(sum(step["stats"].get("deliveries_count", 0) for step in steps)),
+        "peak_time": steps[peak_index]["time"],
+        "peak_traffic_volume": int(step_traffic[peak_index]),
+        "first_result_id": steps[0]["id"]
+    }
+
+def iter_compact_simulation_range(
+    request: SimulationRequest,
+    run_stats: Optional[Dict[str, Any]] = None
+) -> Iterator[CompactSimulationResult]:
+    """
+    Run a traffic simulation and yield the compact result of every time step as soon as its day is stored.
+    
+    Only one day is held in memory at a time; the geometry is served by get_simulation_network.
+    
+    Args:
+        request: SimulationRequest with simulation parameters
+        run_stats: Filled with the number of reused and recomputed days and whether
+            deliveries were spread by distance (fallback_spread)
+        
+    Yields:
+        CompactSimulationResult objects in chronological order
+    """
+    for day_results in iter_simulation_range(request, run_stats=run_stats):
+        if day_results:
+            simulation_date = day_results[0].time_steps[0].time.date()
+            yield from get_compact_day_results(request.project_id, simulation_date).values()
 
 def get_simulation_results(
     project_id: str,
     simulation_date: Optional[date] = None,
-    hour: Optional[int] = None
+    hour: Optional[int] = None,
+    step_time: Optional[time] = None
 ) -> Optional[SimulationResult]:
     """
-    Get simulation results for a project, optionally filtered by date and hour.
+    Get simulation results for a project, optionally filtered by date and time step.
     
     Args:
         project_id: ID of the project
         simulation_date: Date to filter results
-        hour: Hour to filter results
+        hour: Hour to filter results (the step starting at full hour)
+        step_time: Start time of the step to filter results, takes precedence over hour
         
     Returns:
         SimulationResult if found, None otherwise
     """
-    if project_id not in SIMULATION_RESULTS:
-        # Try loading from disk first
-        _load_simulation_results_from_disk(project_id)
+    key = _resolve_result_key(project_id, simulation_date, _step_time_filter(hour, step_time))
+    if key is None:
+        return None
+    
+    result_date, result_time = key
+    return result_cache.get_day(project_id, result_date).get(result_time)
+
+def get_day_results(project_id: str, simulation_date: date) -> Dict[time, SimulationResult]:
+    """
+    Get the results of all time steps of a day.
+    
+    Args:
+        project_id: ID of the project
+        simulation_date: Date of the results
+        
+    Returns:
+        Dictionary time of day -> SimulationResult in chronological order (empty if nothing is stored)
+    """
+    if simulation_date not in _load_result_index(project_id):
+        return {}
+    return dict(sorted(result_cache.get_day(project_id, simulation_date).items()))
+
+def get_compact_simulation_results(
+    project_id: str,
+    simulation_date: Optional[date] = None,
+    hour: Optional[int] = None,
+    step_time: Optional[time] = None
+) -> Optional[CompactSimulationResult]:
+    """
+    Get simulation results without geometry, selected like get_simulation_results.
+    
+    The arrays are indexed by segment position in the network returned by
+    get_simulation_network for the result's network_hash.
+    
+    Returns:
+        CompactSimulationResult if found, None otherwise
+    """
+    key = _resolve_result_key(project_id, simulation_date, _step_time_filter(hour, step_time))
+    if key is None:
+        return None
+    
+    result_date, result_time = key
+    return get_compact_day_results(project_id, result_date).get(result_time)
+
+def get_compact_day_results(project_id: str, simulation_date: date) -> Dict[time, CompactSimulationResult]:
+    """
+    Get the results of all time steps of a day without geometry.
+    
+    Args:
+        project_id: ID of the project
+        simulation_date: Date of the results
+        
+    Returns:
+        Dictionary time of day -> CompactSimulationResult (empty if the day has no stored results)
+    """
+    day_arrays = result_store.read_day_arrays(project_id, simulation_date)
+    if day_arrays is None:
+        return {}
+    
+    results = {}
+    for i, step in enumerate(day_arrays["steps"]):
+        step_time = datetime.fromisoformat(step["time"])
+        percentiles = {
+            f"{key}s_{suffix}": day_arrays[f"{key}_{suffix}"][i].tolist()
+            for key in ("traffic_volume", "congestion_level") for suffix in ("p10", "p90")
+            if f"{key}_{suffix}" in day_arrays
+        }
+        results[step_time.time()] = CompactSimulationResult(
+            id=step["id"],
+            project_id=project_id,
+            execution_time=step["execution_time"],
+            time=step_time,
+            network_hash=day_arrays["network_hash"],
+            traffic_volumes=day_arrays["traffic_volume"][i].tolist(),
+            congestion_levels=day_arrays["congestion_level"][i].tolist(),
+            congestion_points=step["congestion_points"],
+            waiting_areas_status=step["waiting_areas_status"],
+            stats=step["stats"],
+            **percentiles
+        )
+    return dict(sorted(results.items()))
+
+def get_simulation_network(project_id: str, network_hash: Optional[str] = None) -> Optional[SimulationNetwork]:
+    """
+    Get the network geometry referenced by compact simulation results.
+    
+    Args:
+        project_id: ID of the project
+        network_hash: Hash of the network, defaults to the network of the most recent day
         
-        if project_id not in SIMULATION_RESULTS:
+    Returns:
+        SimulationNetwork if found, None otherwise
+    """
+    if network_hash is None:
+        days = result_store.list_days(project_id)
+        if not days:
             return None
+        network_hash = result_store.read_day_arrays(project_id, days[-1])["network_hash"]
     
-    # If no date specified, return the most recent result
+    try:
+        network = result_store.read_network(project_id, network_hash)
+    except FileNotFoundError:
+        return None
+    
+    return SimulationNetwork(
+        project_id=project_id,
+        network_hash=network_hash,
+        segment_ids=network["segment_id"],
+        start_nodes=network["start_node"],
+        end_nodes=network["end_node"],
+        lengths=network["length"],
+        speed_limits=network["speed_limit"],
+        coordinates=network["coordinates"]
+    )
+
+def _step_time_filter(hour: Optional[int], step_time: Optional[time]) -> Optional[time]:
+    """Combine the hour and step time filters into one time of day."""
+    if step_time is not None:
+        return step_time
+    return time(hour=hour) if hour is not None else None
+
+def _resolve_result_key(
+    project_id: str,
+    simulation_date: Optional[date] = None,
+    step_time: Optional[time] = None
+) -> Optional[Tuple[date, time]]:
+    """Find the (date, time of day) of the stored result matching the filters, using the result index."""
+    index = _load_result_index(project_id)
+    if not index:
+        return None
+    
+    # If no date specified, use the most recent date
     if simulation_date is None:
-        if not SIMULATION_RESULTS[project_id]:
-            return None
-        
-        # Get the most recent date
-        most_recent_date = max(SIMULATION_RESULTS[project_id].keys())
+        simulation_date = max(index.keys())
         
-        if hour is None:
-            # Get the most recent hour
-            most_recent_hour = max(SIMULATION_RESULTS[project_id][most_recent_date].keys())
-            return SIMULATION_RESULTS[project_id][most_recent_date][most_recent_hour]
-        else:
-            # Get the specified hour
-            if hour in SIMULATION_RESULTS[project_id][most_recent_date]:
-                return SIMULATION_RESULTS[project_id][most_recent_date][hour]
-            else:
-                return None
+        # Without a time, use the most recent step of that date
+        if step_time is None:
+            return simulation_date, max(index[simulation_date])
     
     # If date is specified but doesn't exist
-    if simulation_date not in SIMULATION_RESULTS[project_id]:
+    if simulation_date not in index:
         return None
     
-    # If hour is not specified, return the first hour
-    if hour is None:
-        if not SIMULATION_RESULTS[project_id][simulation_date]:
+    # If time is not specified, use the first step
+    if step_time is None:
+        if not index[simulation_date]:
             return None
-        first_hour = min(SIMULATION_RESULTS[project_id][simulation_date].keys())
-        return SIMULATION_RESULTS[project_id][simulation_date][first_hour]
+        return simulation_date, min(index[simulation_date])
     
-    # If hour is specified but doesn't exist
-    if hour not in SIMULATION_RESULTS[project_id][simulation_date]:
+    # If time is specified but doesn't exist
+    if step_time not in index[simulation_date]:
         return None
     
-    return SIMULATION_RESULTS[project_id][simulation_date][hour]
+    return simulation_date, step_time
+
+def _simulation_steps(
+    start_time: Optional[str],
+    end_time: Optional[str],
+    interval_hours: float
+) -> Tuple[np.ndarray, int]:
+    """
+    Build the time steps of a simulated day.
+    
+    Args:
+        start_time: Start of the simulated window ("HH:MM", default 06:00)
+        end_time: Start of the last step ("HH:MM", default 18:00)
+        interval_hours: Length of a time step in hours
+        
+    Returns:
+        Start of every step in minutes of the day and the step length in minutes
+        
+    Raises:
+        ValueError: If the window or the interval is invalid
+    """
+    step_minutes = int(round(interval_hours * 60))
+    if step_minutes < 1:
+        raise ValueError("Time interval must be at least one minute")
+    
+    try:
+        start = datetime.strptime(start_time or "06:00", "%H:%M")
+        end = datetime.strptime(end_time or "18:00", "%H:%M")
+    except ValueError:
+        raise ValueError("Simulation start and end time must be given as HH:MM")
+    
+    start_minute = start.hour * 60 + start.minute
+    end_minute = end.hour * 60 + end.minute
+    if end_minute < start_minute:
+        raise ValueError("Simulation end time must be after start time")
+    
+    return np.arange(start_minute, end_minute + 1, step_minutes), step_minutes
 
 def _parse_time_interval(interval: str) -> float:
     """Parse a time interval string (e.g., "1h", "30m") to hours."""
@@ -155,191 +483,465 @@ def _simulate_traffic(
     waiting_areas: List[Dict[str, Any]],
     access_routes: List[Dict[str, Any]],
     map_bounds: Dict[str, Any],
+    replications: int,
+    seed: Optional[int],
+    engine: str,
     deliveries: pd.DataFrame,
     vehicles: pd.DataFrame,
     schedule: pd.DataFrame,
     start_date: date,
     end_date: date,
-    interval_hours: float
-) -> List[SimulationResult]:
+    step_starts: np.ndarray,
+    step_minutes: int,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[Event] = None,
+    reuse_stored_days: bool = True,
+    run_stats: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[List[SimulationResult], bool]]:
     """
     Simulate traffic based on project data and deliveries.
     
     This is a simplified simulation for demonstration purposes.
     In a production environment, you would use SUMO or a more sophisticated traffic simulator.
     
-    Returns:
-        List of SimulationResult objects
+    Yields:
+        (SimulationResult objects of one day, whether the day was reused from disk)
+        in chronological order
     """
-    results = []
-    
-    # Convert polygon to shapely geometry
-    site_polygon = _geojson_to_polygon(polygon)
+    if run_stats is None:
+        run_stats = {}
+    dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
     
     # Get the map data using OSMnx
     try:
-        # Get network around the construction site
-        center_point = site_polygon.centroid
-        
-        # Extract the bounding box coordinates
-        north = map_bounds["coordinates"][0][0][1]
-        south = map_bounds["coordinates"][0][2][1]
-        east = map_bounds["coordinates"][0][1][0]
-        west = map_bounds["coordinates"][0][0][0]
+        # Load the precomputed per-edge features of the road network (built on demand)
+        features = load_edge_features(project_id, polygon, map_bounds, access_routes)
+        if features is None or features.empty:
+            raise ValueError("No road network available for the project")
         
-        # Get the road network
-        G = ox.graph_from_bbox(north, south, east, west, network_type="drive")
+        # Edge attributes do not change between time steps, so extract them once
+        edge_data = _prepare_edge_data(features)
         
-        # Convert to GeoDataFrame for easier processing
-        nodes, edges = ox.graph_to_gdfs(G)
+        # Everything the per-day model needs; shipped once to each worker process
+        context = {
+            "project_id": project_id,
+            "step_starts": step_starts,
+            "step_minutes": step_minutes,
+            "hours": step_starts / 60,
+            "delivery_share": edge_data["delivery_share"],
+            "capacity": edge_data["capacity"],
+            "deliveries": deliveries,
+            "schedule": schedule,
+            "waiting_areas": waiting_areas,
+            "waiting_capacity": waiting_area_capacities(waiting_areas),
+            "unloading_minutes": unloading_minutes_by_type(vehicles),
+            "replications": replications,
+            "seed": seed,
+            "engine": engine,
+            "link_queue": None
+        }
+        if engine == "link_queue":
+            # Turning matrix and per-edge storage are built once and shared by all days
+            context["link_queue"] = prepare_link_queue_network(
+                edge_data["start_node"], edge_data["end_node"],
+                edge_data["length"], edge_data["speed_limit"], edge_data["capacity"]
+            )
         
-        # Calculate current date
-        current_date = start_date
-        while current_date <= end_date:
-            # Filter deliveries for the current date
-            date_deliveries = deliveries[deliveries['Date'] == pd.Timestamp(current_date)]
-            
-            # Get the active construction phase
-            active_phase = schedule[(schedule['StartDate'] <= pd.Timestamp(current_date)) & 
-                                  (schedule['EndDate'] >= pd.Timestamp(current_date))]
-            
-            if active_phase.empty:
-                current_date += timedelta(days=1)
-                continue
-            
-            # For each hour of the day (6:00 to 18:00)
-            for hour in range(6, 19):
-                # Create a datetime for this simulation step
-                sim_datetime = datetime.combine(current_date, time(hour=hour))
-                
-                # Filter deliveries for this time window
-                # Assuming TimeWindow is stored as strings like "08:00-10:00"
-                hour_deliveries = date_deliveries[date_deliveries['TimeWindow'].apply(
-                    lambda x: hour >= int(x.split('-')[0].split(':')[0]) and 
-                              hour <= int(x.split('-')[1].split(':')[0])
-                )]
-                
-                # Count deliveries by vehicle type
-                vehicle_counts = hour_deliveries['VehicleType'].value_counts().to_dict()
-                
-                # Simulate traffic on each road segment
-                traffic_segments = []
-                
-                for idx, edge in edges.iterrows():
-                    # Basic traffic formula:
-                    # - Base traffic (higher during peak hours)
-                    # - Additional traffic from construction deliveries
-                    # - Congestion factor based on proximity to construction site
-                    
-                    # Calculate base traffic (simplified model)
-                    if 7 <= hour <= 9 or 16 <= hour <= 18:  # Peak hours
-                        base_traffic = np.random.randint(50, 200)  # Higher during peak
-                    else:
-                        base_traffic = np.random.randint(20, 100)
-                    
-                    # Calculate distance factor (traffic drops with distance from site)
-                    edge_line = edge['geometry']
-                    distance_to_site = edge_line.distance(site_polygon)
-                    distance_factor = max(0.1, min(1.0, 1.0 / (0.1 + distance_factor)))
-                    
-                    # Calculate additional traffic from deliveries
-                    delivery_traffic = sum(vehicle_counts.values()) * distance_factor * 2  # Each delivery is entry + exit
-                    
-                    # Total traffic
-                    total_traffic = int(base_traffic + delivery_traffic)
-                    
-                    # Calculate congestion level (0.0 to 1.0)
-                    # Simplified: assume capacity is proportional to road length
-                    capacity = edge_line.length * 5  # Simplified capacity model
-                    congestion_level = min(1.0, total_traffic / capacity) if capacity > 0 else 0.0
-                    
-                    # Create a TrafficSegment
-                    segment = TrafficSegment(
-                        segment_id=f"{idx[0]}_{idx[1]}",
-                        start_node=str(idx[0]),
-                        end_node=str(idx[1]),
-                        length=edge_line.length,
-                        speed_limit=edge.get('speed_kph', 50),
-                        traffic_volume=total_traffic,
-                        congestion_level=congestion_level,
-                        coordinates=[[p[0], p[1]] for p in edge_line.coords]
-                    )
-                    
-                    traffic_segments.append(segment)
-                
-                # Calculate waiting area status
-                waiting_areas_status = {}
-                for i, area in enumerate(waiting_areas):
-                    # Simulate random occupancy
-                    capacity = 5  # Assumed capacity
-                    occupied = min(capacity, np.random.poisson(len(hour_deliveries) * 0.3))
-                    
-                    waiting_areas_status[f"area_{i}"] = {
-                        "capacity": capacity,
-                        "occupied": occupied,
-                        "available": capacity - occupied
-                    }
-                
-                # Create a time step
-                time_step = SimulationTimeStep(
-                    time=sim_datetime,
-                    traffic_segments=traffic_segments,
-                    waiting_areas_status=waiting_areas_status
-                )
-                
-                # Create traffic volumes summary
-                traffic_volumes = {}
-                congestion_points = []
-                
-                for segment in traffic_segments:
-                    traffic_volumes[segment.segment_id] = segment.traffic_volume
-                    
-                    if segment.congestion_level > 0.8:  # High congestion
-                        congestion_points.append({
-                            "segment_id": segment.segment_id,
-                            "congestion_level": segment.congestion_level,
-                            "coordinates": segment.coordinates
-                        })
-                
-                # Calculate summary statistics
-                stats = {
-                    "total_traffic": sum(traffic_volumes.values()),
-                    "average_congestion": sum(s.congestion_level for s in traffic_segments) / len(traffic_segments) if traffic_segments else 0,
-                    "deliveries_count": len(hour_deliveries),
-                    "construction_phase": active_phase.iloc[0]['Phase'] if not active_phase.empty else None
-                }
-                
-                # Create a simulation result
-                result = SimulationResult(
-                    id=f"{project_id}_{current_date.isoformat()}_{hour}",
-                    project_id=project_id,
-                    execution_time=datetime.now(),
-                    time_steps=[time_step],
-                    traffic_volumes=traffic_volumes,
-                    congestion_points=congestion_points,
-                    stats=stats
-                )
-                
-                results.append(result)
-            
-            # Move to the next day
-            current_date += timedelta(days=1)
+        # Tag every day with a hash of its inputs and reuse stored days with the same hash
+        run_hash = _run_input_hash(context, edge_data)
+        features_hash = edge_data_hash(edge_data)
+        day_hashes = {current_date: _day_input_hash(current_date, context, run_hash) for current_date in dates}
+        reused_dates = set()
+        if reuse_stored_days:
+            stored_hashes = result_store.read_input_hashes(project_id, dates)
+            reused_dates = {current_date for current_date in dates if stored_hashes.get(current_date) == day_hashes[current_date]}
     
     except Exception as e:
         # In a production system, you would log this error
         print(f"Error in traffic simulation: {str(e)}")
         # Fallback to a very simple simulation if OSMnx fails
-        results = _simple_fallback_simulation(
-            project_id, start_date, end_date, deliveries
+        run_stats.update({
+            "days_reused": 0,
+            "days_recomputed": len(dates),
+            "reused_dates": []
+        })
+        for current_date in dates:
+            yield _simple_fallback_simulation(
+                project_id, current_date, current_date, deliveries, step_starts, step_minutes, seed
+            ), False
+        return
+    
+    dates_to_simulate = [current_date for current_date in dates if current_date not in reused_dates]
+    run_stats.update({
+        "days_reused": len(reused_dates),
+        "days_recomputed": len(dates_to_simulate),
+        "reused_dates": sorted(reused_dates),
+        "fallback_spread": edge_data["fallback_spread"]
+    })
+    if edge_data["fallback_spread"]:
+        print(f"No delivery route to the construction site of project {project_id} found, spreading deliveries by distance")
+    
+    def on_progress(days_done: int, days_total: int) -> None:
+        progress_callback(days_done + len(reused_dates), days_total + len(reused_dates))
+    
+    if progress_callback and reused_dates:
+        progress_callback(len(reused_dates), len(dates))
+    
+    # Simulated days arrive in date order; days without an active phase have no record
+    day_records = _iter_simulate_dates_parallel(
+        dates_to_simulate,
+        context,
+        progress_callback=on_progress if progress_callback else None,
+        cancel_event=cancel_event
+    ) if dates_to_simulate else iter(())
+    next_record = next(day_records, None)
+    
+    for current_date in dates:
+        if current_date in reused_dates:
+            yield list(result_cache.get_day(project_id, current_date).values()), True
+        elif next_record is not None and next_record["date"] == current_date:
+            next_record["input_hash"] = day_hashes[current_date]
+            next_record["features_hash"] = features_hash
+            yield _build_day_results(project_id, next_record, edge_data), False
+            next_record = next(day_records, None)
+
+def _iter_simulate_dates_parallel(
+    dates: List[date],
+    context: Dict[str, Any],
+    workers: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Simulate a list of dates, split into chunks across a process pool.
+    
+    The context is pickled once to a temporary file that each worker loads on start-up.
+    Day records are yielded in the order of the input dates as soon as all earlier
+    chunks are done.
+    """
+    workers = min(workers or SIMULATION_WORKERS, len(dates))
+    if workers <= 1:
+        yield from _iter_simulate_dates(dates, context, progress_callback, cancel_event)
+        return
+    
+    chunks = [list(chunk) for chunk in np.array_split(np.array(dates, dtype=object), workers * 2) if len(chunk)]
+    finished: Dict[int, List[Dict[str, Any]]] = {}
+    next_chunk = 0
+    days_done = 0
+    
+    with tempfile.TemporaryDirectory(prefix="simulation_") as payload_dir:
+        payload_path = os.path.join(payload_dir, "context.pkl")
+        with open(payload_path, "wb") as f:
+            pickle.dump(context, f, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_simulation_worker,
+            initargs=(payload_path,)
         )
+        try:
+            futures = {executor.submit(_simulate_date_chunk, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise SimulationCancelled()
+                
+                chunk_index = futures[future]
+                finished[chunk_index] = future.result()
+                days_done += len(chunks[chunk_index])
+                if progress_callback:
+                    progress_callback(days_done, len(dates))
+                
+                # Hand out the chunks that are complete up to the earliest date
+                while next_chunk in finished:
+                    yield from finished.pop(next_chunk)
+                    next_chunk += 1
+        finally:
+            # Drop chunks that have not started yet when cancelled, failed or abandoned
+            executor.shutdown(wait=True, cancel_futures=True)
+
+def _init_simulation_worker(payload_path: str) -> None:
+    """Load the shared simulation context in a worker process."""
+    global _WORKER_CONTEXT
+    with open(payload_path, "rb") as f:
+        _WORKER_CONTEXT = pickle.load(f)
+
+def _simulate_date_chunk(dates: List[date]) -> List[Dict[str, Any]]:
+    """Worker entry point: simulate a chunk of dates with the shared context."""
+    return list(_iter_simulate_dates(dates, _WORKER_CONTEXT))
+
+def _iter_simulate_dates(
+    dates: List[date],
+    context: Dict[str, Any],
+    progress_callback: Optional[ProgressCallback] = None,
+    cancel_event: Optional[Event] = None
+) -> Iterator[Dict[str, Any]]:
+    """Simulate consecutive dates, skipping days without an active construction phase."""
+    for days_done, current_date in enumerate(dates, start=1):
+        if cancel_event is not None and cancel_event.is_set():
+            raise SimulationCancelled()
+        
+        day_record = _simulate_day(current_date, context)
+        
+        if progress_callback:
+            progress_callback(days_done, len(dates))
+        if day_record is not None:
+            yield day_record
+
+def _simulate_day(current_date: date, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Simulate all time steps of one day.
     
-    return results
+    Returns:
+        Day record with (T, E) traffic arrays and per-step waiting area status,
+        or None if no construction phase is active on that date
+    """
+    deliveries = context["deliveries"]
+    schedule = context["schedule"]
+    hours = context["hours"]
+    
+    # Filter deliveries for the current date
+    date_deliveries = _deliveries_on(deliveries, current_date)
+    
+    # Get the active construction phase
+    active_phase = _active_phase(schedule, current_date)
+    
+    if active_phase.empty:
+        return None
+    
+    # Count the deliveries of each time step from the pre-parsed time windows
+    counts = step_delivery_counts(date_deliveries, context["step_starts"], context["step_minutes"])
+    
+    rng = _day_rng(context["project_id"], context["seed"], current_date)
+    replications = context["replications"]
+    percentiles = None
+    
+    # Simulate traffic on all road segments for all time steps at once
+    # (only deliveries with a known vehicle type add traffic)
+    if context["engine"] == "link_queue":
+        traffic = compute_link_queue_traffic(
+            network=context["link_queue"],
+            step_starts=context["step_starts"],
+            step_minutes=context["step_minutes"],
+            deliveries_per_hour=counts["vehicles"],
+            delivery_share=context["delivery_share"],
+            capacity=context["capacity"],
+            replications=replications if replications > 1 else None,
+            rng=rng
+        )
+        if replications > 1:
+            # Ensemble: all replications are propagated together, keep the percentiles
+            volume_percentiles = ensemble_percentiles(traffic["traffic_volume"])
+            congestion_percentiles = ensemble_percentiles(traffic["congestion_level"])
+            traffic_volume = np.rint(volume_percentiles[50]).astype(np.int64)
+            congestion_level = congestion_percentiles[50]
+            percentiles = {
+                "traffic_volume_p10": np.rint(volume_percentiles[10]).astype(np.int64),
+                "traffic_volume_p90": np.rint(volume_percentiles[90]).astype(np.int64),
+                "congestion_level_p10": congestion_percentiles[10],
+                "congestion_level_p90": congestion_percentiles[90]
+            }
+        else:
+            traffic_volume = traffic["traffic_volume"]
+            congestion_level = traffic["congestion_level"]
+    elif replications > 1:
+        # Ensemble: keep the median as the main value and the 10th/90th percentiles
+        traffic = compute_edge_traffic_ensemble(
+            hours=hours,
+            deliveries_per_hour=counts["vehicles"],
+            delivery_share=context["delivery_share"],
+            capacity=context["capacity"],
+            replications=replications,
+            rng=rng
+        )
+        traffic_volume = np.rint(traffic["traffic_volume"][50]).astype(np.int64)
+        congestion_level = traffic["congestion_level"][50]
+        percentiles = {
+            "traffic_volume_p10": np.rint(traffic["traffic_volume"][10]).astype(np.int64),
+            "traffic_volume_p90": np.rint(traffic["traffic_volume"][90]).astype(np.int64),
+            "congestion_level_p10": traffic["congestion_level"][10],
+            "congestion_level_p90": traffic["congestion_level"][90]
+        }
+    else:
+        traffic = compute_edge_traffic(
+            hours=hours,
+            deliveries_per_hour=counts["vehicles"],
+            delivery_share=context["delivery_share"],
+            capacity=context["capacity"],
+            rng=rng
+        )
+        traffic_volume = traffic["traffic_volume"]
+        congestion_level = traffic["congestion_level"]
+    
+    # Queue the day's trucks through the waiting areas (one event simulation per replication)
+    capacities = context["waiting_capacity"]
+    waiting_runs = []
+    for _ in range(replications):
+        trucks = draw_truck_arrivals(date_deliveries, context["unloading_minutes"], rng)
+        waiting_runs.append(aggregate_waiting_steps(
+            simulate_waiting_areas(trucks["arrival"], trucks["service"], capacities),
+            context["step_starts"], context["step_minutes"]
+        ))
+    waiting = {key: np.stack([run[key] for run in waiting_runs]) for key in waiting_runs[0]}
+    if replications > 1:
+        occupancy = ensemble_percentiles(waiting["occupied"])
+        occupied = np.rint(occupancy[50]).astype(int)
+        street_queue = np.rint(np.median(waiting["street_queue"], axis=0)).astype(int)
+        overflow = np.rint(np.median(waiting["overflow"], axis=0)).astype(int)
+    else:
+        occupied, street_queue, overflow = waiting["occupied"][0], waiting["street_queue"][0], waiting["overflow"][0]
+    
+    # Calculate waiting area status (peak occupancy during each step)
+    waiting_areas_status = []
+    for i in range(len(hours)):
+        step_status = {}
+        for j, capacity in enumerate(capacities.tolist()):
+            area_status = {
+                "capacity": capacity,
+                "occupied": int(occupied[i, j]),
+                "available": max(capacity - int(occupied[i, j]), 0)
+            }
+            if percentiles is not None:
+                area_status["occupied_p10"] = float(occupancy[10][i, j])
+                area_status["occupied_p90"] = float(occupancy[90][i, j])
+            step_status[f"area_{j}"] = area_status
+        waiting_areas_status.append(step_status)
+    
+    return {
+        "date": current_date,
+        "step_starts": context["step_starts"],
+        "step_minutes": context["step_minutes"],
+        "traffic_volume": traffic_volume,
+        "congestion_level": congestion_level,
+        "percentiles": percentiles,
+        "replications": replications,
+        "waiting_areas_status": waiting_areas_status,
+        "waiting_stats": [
+            {"waiting_overflow": int(overflow[i]), "street_queue_max": int(street_queue[i])}
+            for i in range(len(hours))
+        ],
+        "deliveries_count": counts["deliveries"].tolist(),
+        "vehicle_type_counts": [
+            {vehicle_type: int(type_counts[i]) for vehicle_type, type_counts in counts["by_vehicle_type"].items()}
+            for i in range(len(hours))
+        ],
+        "construction_phase": active_phase.iloc[0]['Phase'],
+        "engine": context["engine"]
+    }
+
+def _day_rng(project_id: str, seed: Optional[int], current_date: date) -> np.random.Generator:
+    """
+    Random generator of one day, seeded from (project, date, model version, user seed).
+
+    Identical requests therefore give identical results, whether a day is simulated
+    in the API process, in a worker or again after its stored result was deleted.
+    """
+    project_key = int.from_bytes(hashlib.sha1(project_id.encode("utf-8")).digest()[:8], "little")
+    user_key = [0] if seed is None else [1, seed % 2**64]
+    return np.random.default_rng([project_key, current_date.toordinal(), SIMULATION_MODEL_VERSION] + user_key)
+
+def _deliveries_on(deliveries: pd.DataFrame, current_date: date) -> pd.DataFrame:
+    """Deliveries scheduled on a date."""
+    return deliveries[deliveries['Date'] == pd.Timestamp(current_date)]
+
+def _active_phase(schedule: pd.DataFrame, current_date: date) -> pd.DataFrame:
+    """Schedule rows of the construction phases active on a date."""
+    return schedule[(schedule['StartDate'] <= pd.Timestamp(current_date)) & 
+                    (schedule['EndDate'] >= pd.Timestamp(current_date))]
+
+def _run_input_hash(context: Dict[str, Any], edge_data: Dict[str, Any]) -> str:
+    """Hash of the inputs shared by all days of a run: model, parameters and road network."""
+    digest = hashlib.sha1()
+    digest.update(json.dumps(
+        {
+            "model_version": SIMULATION_MODEL_VERSION,
+            "step_starts": context["step_starts"].tolist(),
+            "step_minutes": context["step_minutes"],
+            "engine": context["engine"],
+            "link_queue_parameters": (
+                link_queue_model.EXIT_SHARE, link_queue_model.JAM_DENSITY_PER_M,
+                link_queue_model.MIN_STORAGE_VEHICLES, link_queue_model.WARMUP_MINUTES
+            ) if context["engine"] == "link_queue" else None,
+            "waiting_model_parameters": (
+                waiting_area_model.TRUCK_BAY_AREA_M2, waiting_area_model.UNLOADING_BAYS,
+                waiting_area_model.DEFAULT_UNLOADING_MINUTES, waiting_area_model.UNLOADING_TIME_SHAPE
+            ),
+            "unloading_minutes": context["unloading_minutes"],
+            "peak_hours": traffic_model.PEAK_HOURS,
+            "peak_base_traffic": traffic_model.PEAK_BASE_TRAFFIC,
+            "offpeak_base_traffic": traffic_model.OFFPEAK_BASE_TRAFFIC,
+            "waiting_areas": context["waiting_areas"],
+            "replications": context["replications"],
+            "seed": context["seed"]
+        },
+        sort_keys=True,
+        default=str
+    ).encode("utf-8"))
+    digest.update(edge_data_hash(edge_data).encode("utf-8"))
+    return digest.hexdigest()
+
+def edge_data_hash(edge_data: Dict[str, Any]) -> str:
+    """Hash of the per-edge model inputs: segments, lengths, delivery route shares, capacities and speed limits."""
+    digest = hashlib.sha1()
+    digest.update("\n".join(edge_data["segment_id"]).encode("utf-8"))
+    for key in ("length", "delivery_share", "capacity", "speed_limit"):
+        digest.update(np.ascontiguousarray(edge_data[key], dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+def _day_input_hash(current_date: date, context: Dict[str, Any], run_hash: str) -> str:
+    """Hash of the inputs of one day: its deliveries, the active phase and the run inputs."""
+    date_deliveries = _deliveries_on(context["deliveries"], current_date)
+    active_phase = _active_phase(context["schedule"], current_date)
+    
+    digest = hashlib.sha1(run_hash.encode("utf-8"))
+    digest.update(current_date.isoformat().encode("utf-8"))
+    # Row hashes are sorted so the order of the rows in the workbook does not matter
+    digest.update(np.sort(pd.util.hash_pandas_object(date_deliveries, index=False).to_numpy()).tobytes())
+    digest.update(pd.util.hash_pandas_object(active_phase.head(1), index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+def _build_day_results(
+    project_id: str,
+    day_record: Dict[str, Any],
+    edge_data: Dict[str, Any]
+) -> List[SimulationResult]:
+    """Turn a day record into one SimulationResult per time step."""
+    return [
+        _build_hour_result(
+            project_id=project_id,
+            sim_datetime=datetime.combine(day_record["date"], _minute_to_time(step_start)),
+            edge_data=edge_data,
+            traffic_volume=day_record["traffic_volume"][i],
+            congestion_level=day_record["congestion_level"][i],
+            waiting_areas_status=day_record["waiting_areas_status"][i],
+            deliveries_count=day_record["deliveries_count"][i],
+            construction_phase=day_record["construction_phase"],
+            vehicle_type_counts=day_record["vehicle_type_counts"][i],
+            waiting_stats=day_record["waiting_stats"][i],
+            input_hash=day_record.get("input_hash"),
+            features_hash=day_record.get("features_hash"),
+            percentiles=(
+                {key: values[i] for key, values in day_record["percentiles"].items()}
+                if day_record.get("percentiles") else None
+            ),
+            replications=day_record.get("replications", 1),
+            interval_minutes=day_record["step_minutes"],
+            engine=day_record.get("engine", "statistical")
+        )
+        for i, step_start in enumerate(day_record["step_starts"])
+    ]
+
+def _minute_to_time(minute_of_day: int) -> time:
+    """Convert minutes of the day to a time of day."""
+    return time(hour=int(minute_of_day) // 60, minute=int(minute_of_day) % 60)
 
 def _simple_fallback_simulation(
     project_id: str,
     start_date: date,
     end_date: date,
-    deliveries: pd.DataFrame
+    deliveries: pd.DataFrame,
+    step_starts: np.ndarray,
+    step_minutes: int,
+    seed: Optional[int] = None
 ) -> List[SimulationResult]:
     """
     A very simple fallback simulation if the OSMnx-based simulation fails.
@@ -352,18 +954,15 @@ def _simple_fallback_simulation(
     while current_date <= end_date:
         # Filter deliveries for the current date
         date_deliveries = deliveries[deliveries['Date'] == pd.Timestamp(current_date)]
+        rng = _day_rng(project_id, seed, current_date)
+        
+        # Count the deliveries of each time step of the day
+        step_counts = step_delivery_counts(date_deliveries, step_starts, step_minutes)["deliveries"]
         
-        # For each hour of the day (6:00 to 18:00)
-        for hour in range(6, 19):
+        # For each time step of the day
+        for step_start, hour_count in zip(step_starts.tolist(), step_counts.tolist()):
             # Create a datetime for this simulation step
-            sim_datetime = datetime.combine(current_date, time(hour=hour))
-            
-            # Filter deliveries for this time window
-            # Assuming TimeWindow is stored as strings like "08:00-10:00"
-            hour_deliveries = date_deliveries[date_deliveries['TimeWindow'].apply(
-                lambda x: hour >= int(x.split('-')[0].split(':')[0]) and 
-                        hour <= int(x.split('-')[1].split(':')[0])
-            )]
+            sim_datetime = datetime.combine(current_date, _minute_to_time(step_start))
             
             # Create synthetic traffic segments
             traffic_segments = []
@@ -374,8 +973,8 @@ def _simple_fallback_simulation(
                     end_node=f"node_b_{i}",
                     length=100 + i * 50,  # Synthetic length
                     speed_limit=50,
-                    traffic_volume=50 + len(hour_deliveries) * 2 + np.random.randint(0, 50),
-                    congestion_level=min(1.0, (0.3 + len(hour_deliveries) * 0.05 + np.random.random() * 0.2)),
+                    traffic_volume=50 + hour_count * 2 + int(rng.integers(0, 50)),
+                    congestion_level=min(1.0, (0.3 + hour_count * 0.05 + rng.random() * 0.2)),
                     coordinates=[[0, 0], [100 + i * 50, 0]]  # Synthetic coordinates
                 )
                 traffic_segments.append(segment)
@@ -384,8 +983,8 @@ def _simple_fallback_simulation(
             waiting_areas_status = {
                 "area_0": {
                     "capacity": 5,
-                    "occupied": min(5, len(hour_deliveries)),
-                    "available": max(0, 5 - len(hour_deliveries))
+                    "occupied": min(5, hour_count),
+                    "available": max(0, 5 - hour_count)
                 }
             }
             
@@ -413,13 +1012,14 @@ def _simple_fallback_simulation(
             stats = {
                 "total_traffic": sum(traffic_volumes.values()),
                 "average_congestion": sum(s.congestion_level for s in traffic_segments) / len(traffic_segments),
-                "deliveries_count": len(hour_deliveries),
-                "construction_phase": "Unknown Phase"  # Since we don't have the schedule in this fallback
+                "deliveries_count": hour_count,
+                "construction_phase": "Unknown Phase",  # Since we don't have the schedule in this fallback
+                "interval_minutes": step_minutes
             }
             
             # Create a simulation result
             result = SimulationResult(
-                id=f"{project_id}_{current_date.isoformat()}_{hour}",
+                id=f"{project_id}_{sim_datetime.isoformat(timespec='minutes')}",
                 project_id=project_id,
                 execution_time=datetime.now(),
                 time_steps=[time_step],
@@ -435,6 +1035,124 @@ def _simple_fallback_simulation(
     
     return results
 
+def _prepare_edge_data(features: gpd.GeoDataFrame) -> Dict[str, Any]:
+    """
+    Extract the per-edge attributes used by the traffic model as flat arrays.
+    
+    "fallback_spread" is True when no delivery route reaches the site and the
+    deliveries are spread over all edges by distance instead.
+    """
+    distance_to_site = features["distance_to_site_m"].to_numpy(dtype=float) / 1000.0  # km
+    
+    # Delivery trips follow the routed entry and exit paths; without a route to the
+    # site they are spread over all edges by distance as before
+    delivery_share = (
+        features["inbound_route_share"].to_numpy(dtype=float) + features["outbound_route_share"].to_numpy(dtype=float)
+        if "inbound_route_share" in features.columns else np.zeros(len(features))
+    )
+    fallback_spread = not delivery_share.any()
+    if fallback_spread:
+        delivery_share = distance_factor(distance_to_site) * 2
+    
+    return {
+        "segment_id": features["segment_id"].tolist(),
+        "start_node": features["u"].astype(str).tolist(),
+        "end_node": features["v"].astype(str).tolist(),
+        "length": features["length_m"].to_numpy(dtype=float),
+        "distance_to_site": distance_to_site,
+        "delivery_share": delivery_share,
+        "fallback_spread": fallback_spread,
+        "capacity": features["capacity"].to_numpy(dtype=float),
+        "speed_limit": features["speed_kph"].to_numpy(dtype=float),
+        "coordinates": [[[p[0], p[1]] for p in line.coords] for line in features.geometry]
+    }
+
+def _build_hour_result(
+    project_id: str,
+    sim_datetime: datetime,
+    edge_data: Dict[str, Any],
+    traffic_volume: np.ndarray,
+    congestion_level: np.ndarray,
+    waiting_areas_status: Dict[str, Any],
+    deliveries_count: int,
+    construction_phase: Any,
+    vehicle_type_counts: Optional[Dict[str, int]] = None,
+    waiting_stats: Optional[Dict[str, int]] = None,
+    input_hash: Optional[str] = None,
+    features_hash: Optional[str] = None,
+    percentiles: Optional[Dict[str, np.ndarray]] = None,
+    replications: int = 1,
+    interval_minutes: int = 60,
+    engine: str = "statistical"
+) -> SimulationResult:
+    """Assemble the SimulationResult of one time step from the per-edge model arrays."""
+    volumes = traffic_volume.tolist()
+    congestion = congestion_level.tolist()
+    lengths = edge_data["length"].tolist()
+    speeds = edge_data["speed_limit"].tolist()
+    percentile_values = {key: values.tolist() for key, values in (percentiles or {}).items()}
+    
+    # The arrays are already typed, so skip the per-segment validation
+    traffic_segments = [
+        TrafficSegment.model_construct(
+            segment_id=segment_id,
+            start_node=edge_data["start_node"][i],
+            end_node=edge_data["end_node"][i],
+            length=lengths[i],
+            speed_limit=speeds[i],
+            traffic_volume=volumes[i],
+            congestion_level=congestion[i],
+            coordinates=edge_data["coordinates"][i],
+            **{key: values[i] for key, values in percentile_values.items()}
+        )
+        for i, segment_id in enumerate(edge_data["segment_id"])
+    ]
+    
+    time_step = SimulationTimeStep(
+        time=sim_datetime,
+        traffic_segments=traffic_segments,
+        waiting_areas_status=waiting_areas_status
+    )
+    
+    traffic_volumes = dict(zip(edge_data["segment_id"], volumes))
+    congestion_points = [
+        {
+            "segment_id": edge_data["segment_id"][i],
+            "congestion_level": congestion[i],
+            "coordinates": edge_data["coordinates"][i]
+        }
+        for i in np.flatnonzero(congestion_level > 0.8)  # High congestion
+    ]
+    
+    stats = {
+        "total_traffic": int(traffic_volume.sum()),
+        "average_congestion": float(congestion_level.mean()) if len(congestion) else 0,
+        "deliveries_count": deliveries_count,
+        "construction_phase": construction_phase,
+        "interval_minutes": interval_minutes,  # Volumes are vehicles per hour during the step
+        "engine": engine
+    }
+    if vehicle_type_counts is not None:
+        stats["vehicle_type_counts"] = vehicle_type_counts
+    if waiting_stats is not None:
+        stats.update(waiting_stats)  # Trucks finding all waiting areas full / queueing on the street
+    if input_hash is not None:
+        stats["input_hash"] = input_hash  # Hash of the day's inputs, used to skip unchanged days
+    if features_hash is not None:
+        stats["features_hash"] = features_hash  # Hash of the edge features (route shares), checked by scenarios
+    if replications > 1:
+        stats["replications"] = replications
+    
+    return SimulationResult(
+        id=f"{project_id}_{sim_datetime.isoformat(timespec='minutes')}",
+        project_id=project_id,
+        execution_time=datetime.now(),
+        time_steps=[time_step],
+        traffic_volumes=traffic_volumes,
+        congestion_points=congestion_points,
+        stats=stats
+    )
+
 def _geojson_to_polygon(geojson: Dict[str, Any]) -> Polygon:
     """Convert a GeoJSON polygon to a shapely Polygon."""
     if geojson["type"] == "Polygon":
@@ -444,65 +1162,29 @@ def _geojson_to_polygon(geojson: Dict[str, Any]) -> Polygon:
     else:
         raise ValueError(f"Unsupported GeoJSON type: {geojson['type']}")
 
-def _save_simulation_results_to_disk(project_id: str) -> None:
-    """Save simulation results to disk"""
+def _save_simulation_results_to_disk(project_id: str, results: List[SimulationResult]) -> None:
+    """Save simulation results to the columnar result store, one file per simulated date"""
     try:
-        if project_id not in SIMULATION_RESULTS:
-            return
+        days: Dict[date, Dict[time, SimulationResult]] = {}
+        for result in results:
+            result_time = result.time_steps[0].time
+            days.setdefault(result_time.date(), {})[result_time.time()] = result
         
-        # Create directory structure
-        sim_dir = f"data/simulations/{project_id}"
-        os.makedirs(sim_dir, exist_ok=True)
-        
-        # Save each date's results
-        for date_str, hours in SIMULATION_RESULTS[project_id].items():
-            date_dir = f"{sim_dir}/{date_str}"
-            os.makedirs(date_dir, exist_ok=True)
-            
-            for hour, result in hours.items():
-                file_path = f"{date_dir}/{hour}.json"
-                with open(file_path, "w") as f:
-                    # Convert to dict and serialize
-                    json.dump(result.dict(), f, default=str, indent=2)
+        for result_date, steps in sorted(days.items()):
+            result_store.write_day(project_id, result_date, list(steps.values()))
+            result_cache.put_day(project_id, result_date, steps)
         
     except Exception as e:
         print(f"Error saving simulation results: {str(e)}")
 
-def _load_simulation_results_from_disk(project_id: str) -> None:
-    """Load simulation results from disk"""
+def _load_result_index(project_id: str) -> Dict[date, List[time]]:
+    """Load the index of stored simulation results (date -> times of day) of a project"""
     try:
-        # Check if the directory exists
-        sim_dir = f"data/simulations/{project_id}"
-        if not os.path.exists(sim_dir):
-            return
-        
-        # Initialize the project
-        SIMULATION_RESULTS[project_id] = {}
+        # Convert results still stored as per-hour JSON files (once per project)
+        result_store.migrate_legacy_results(project_id)
         
-        # Iterate through date directories
-        for date_dir in os.listdir(sim_dir):
-            date_path = os.path.join(sim_dir, date_dir)
-            
-            if os.path.isdir(date_path):
-                try:
-                    # Parse the date
-                    current_date = datetime.strptime(date_dir, "%Y-%m-%d").date()
-                    SIMULATION_RESULTS[project_id][current_date] = {}
-                    
-                    # Iterate through hour files
-                    for hour_file in os.listdir(date_path):
-                        if hour_file.endswith(".json"):
-                            hour = int(hour_file.split(".")[0])
-                            file_path = os.path.join(date_path, hour_file)
-                            
-                            with open(file_path, "r") as f:
-                                result_dict = json.load(f)
-                                result = SimulationResult(**result_dict)
-                                SIMULATION_RESULTS[project_id][current_date][hour] = result
-                                
-                except ValueError:
-                    # Skip if directory name is not a valid date
-                    continue
+        return result_store.read_index(project_id)
         
     except Exception as e:
-        print(f"Error loading simulation results: {str(e)}") 
\ No newline at end of file
+        print(f"Error loading simulation result index: {str(e)}")
+        return {}
@@ -0,0 +1,140 @@
+import numpy as np
+from typing import Dict, Optional
+
+# Hours of the day that are treated as rush hours by the traffic model
+PEAK_HOURS = ((7, 9), (16, 18))
+
+# Bounds for the randomly drawn background traffic per edge and hour
+PEAK_BASE_TRAFFIC = (50, 200)
+OFFPEAK_BASE_TRAFFIC = (20, 100)
+
+# Percentiles stored for ensemble runs
+ENSEMBLE_PERCENTILES = (10, 50, 90)
+
+# Upper bound for the (R, H, E) sample arrays of an ensemble, larger networks are split into edge blocks
+ENSEMBLE_BLOCK_VALUES = 4_000_000
+
+def is_peak_hour(hours: np.ndarray) -> np.ndarray:
+    """Return a boolean mask marking the peak hours in an array of times of day in hours (8.25 = 08:15)."""
+    hours = np.floor(np.asarray(hours, dtype=float))
+    mask = np.zeros(hours.shape, dtype=bool)
+    for start, end in PEAK_HOURS:
+        mask |= (hours >= start) & (hours <= end)
+    return mask
+
+def expected_base_traffic(hours: np.ndarray) -> np.ndarray:
+    """Mean of the background traffic drawn per edge by compute_edge_traffic for times of day in hours."""
+    peak = is_peak_hour(hours)
+    return np.where(peak, (PEAK_BASE_TRAFFIC[0] + PEAK_BASE_TRAFFIC[1] - 1) / 2, (OFFPEAK_BASE_TRAFFIC[0] + OFFPEAK_BASE_TRAFFIC[1] - 1) / 2)
+
+def distance_factor(distance_to_site: np.ndarray) -> np.ndarray:
+    """Share of the construction traffic that reaches an edge, decaying with distance to the site (fallback without routes)."""
+    return np.clip(1.0 / (0.1 + np.asarray(distance_to_site, dtype=float)), 0.1, 1.0)
+
+def compute_edge_traffic(
+    hours: np.ndarray,
+    deliveries_per_hour: np.ndarray,
+    delivery_share: np.ndarray,
+    capacity: np.ndarray,
+    replications: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute traffic volumes and congestion for all edges and time steps of a day in one pass.
+
+    Volumes are flow rates in vehicles per hour, independent of the step length.
+
+    Args:
+        hours: Time steps to simulate as times of day in hours (8.25 = 08:15), shape (H,)
+        deliveries_per_hour: Number of construction deliveries active in each step, shape (H,)
+        delivery_share: Delivery trips (entry plus exit) driving on every edge per delivery, shape (E,)
+        capacity: Capacity of every edge in vehicles per hour, shape (E,)
+        replications: Number of ensemble members R, drawn in one batched call
+        rng: Random generator (a fresh unseeded one if not given)
+
+    Returns:
+        Dictionary with the arrays "base_traffic", "delivery_traffic", "traffic_volume" and
+        "congestion_level" (H, E), and the input "delivery_share" (E,); with replications
+        the arrays derived from the random base traffic get a leading (R,) axis
+    """
+    hours = np.asarray(hours)
+    capacity = np.asarray(capacity, dtype=float)
+    n_hours, n_edges = len(hours), len(capacity)
+    size = (n_hours, n_edges) if replications is None else (replications, n_hours, n_edges)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    # Base traffic (higher during peak hours)
+    peak = is_peak_hour(hours)
+    low = np.where(peak, PEAK_BASE_TRAFFIC[0], OFFPEAK_BASE_TRAFFIC[0])[:, None]
+    high = np.where(peak, PEAK_BASE_TRAFFIC[1], OFFPEAK_BASE_TRAFFIC[1])[:, None]
+    base_traffic = rng.integers(low, high, size=size)
+
+    # Additional traffic from deliveries on the edges their routes use (each delivery is entry + exit)
+    delivery_share = np.asarray(delivery_share, dtype=float)
+    deliveries = np.asarray(deliveries_per_hour, dtype=float)[:, None]
+    delivery_traffic = deliveries * delivery_share[None, :]
+
+    traffic_volume = (base_traffic + delivery_traffic).astype(np.int64)
+
+    # Congestion level (0.0 to 1.0), zero for edges without capacity
+    congestion_level = np.zeros(size, dtype=float)
+    np.divide(traffic_volume, capacity, out=congestion_level, where=capacity > 0)
+    np.minimum(congestion_level, 1.0, out=congestion_level)
+
+    return {
+        "base_traffic": base_traffic,
+        "delivery_share": delivery_share,
+        "delivery_traffic": delivery_traffic,
+        "traffic_volume": traffic_volume,
+        "congestion_level": congestion_level
+    }
+
+def compute_edge_traffic_ensemble(
+    hours: np.ndarray,
+    deliveries_per_hour: np.ndarray,
+    delivery_share: np.ndarray,
+    capacity: np.ndarray,
+    replications: int,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, Dict[int, np.ndarray]]:
+    """
+    Compute percentiles of traffic volume and congestion over an ensemble of replications.
+
+    All replications of an edge block are drawn in one call; only the percentiles
+    are kept, not the individual samples.
+
+    Args:
+        hours: Time steps to simulate as times of day in hours (8.25 = 08:15), shape (H,)
+        deliveries_per_hour: Number of construction deliveries active in each step, shape (H,)
+        delivery_share: Delivery trips (entry plus exit) driving on every edge per delivery, shape (E,)
+        capacity: Capacity of every edge in vehicles per hour, shape (E,)
+        replications: Number of ensemble members R
+        rng: Random generator (a fresh unseeded one if not given)
+
+    Returns:
+        Dictionary "traffic_volume" / "congestion_level" -> percentile -> (H, E) array
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    delivery_share = np.asarray(delivery_share, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+    n_hours, n_edges = len(hours), len(capacity)
+    block = max(1, ENSEMBLE_BLOCK_VALUES // (replications * max(n_hours, 1)))
+
+    percentiles = {
+        key: {p: np.zeros((n_hours, n_edges), dtype=float) for p in ENSEMBLE_PERCENTILES}
+        for key in ("traffic_volume", "congestion_level")
+    }
+    for start in range(0, n_edges, block):
+        edges = slice(start, start + block)
+        traffic = compute_edge_traffic(
+            hours, deliveries_per_hour, delivery_share[edges], capacity[edges], replications=replications, rng=rng
+        )
+        for key, values in percentiles.items():
+            for p, block_values in ensemble_percentiles(traffic[key]).items():
+                values[p][:, edges] = block_values
+    return percentiles
+
+def ensemble_percentiles(samples: np.ndarray) -> Dict[int, np.ndarray]:
+    """Percentiles of ensemble samples over the leading replication axis."""
+    values = np.percentile(samples, ENSEMBLE_PERCENTILES, axis=0)
+    return dict(zip(ENSEMBLE_PERCENTILES, values))
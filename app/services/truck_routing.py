@@ -0,0 +1,131 @@
+import numpy as np
+import geopandas as gpd
+import scipy.sparse as sp
+from scipy.sparse.csgraph import dijkstra
+from typing import Dict, Any
+
+# Nodes in the outer band of the network extent (share of its width/height) are entry points for trucks
+ENTRY_BAND_SHARE = 0.05
+
+# Trucks enter on roads of at least this capacity (tertiary and above) if the network has such entries
+ENTRY_MIN_CAPACITY = 700
+
+# Travel time on drawn access routes is multiplied by this factor, so routes follow them where possible
+ACCESS_ROUTE_COST_FACTOR = 0.25
+
+def compute_route_shares(edges_metric: gpd.GeoDataFrame, site_metric: Any) -> Dict[str, np.ndarray]:
+    """
+    Share of the delivery trips that traverse each edge on the way to and from the site.
+
+    Trucks enter at the boundary nodes of the network (weighted by the capacity of
+    the road they arrive on), drive the fastest route to the node closest to the
+    site and leave the same way to a boundary node. Both directions come from one
+    shortest-path tree each (scipy.sparse.csgraph), so the routes of all entries are
+    computed in two Dijkstra runs per project.
+
+    Args:
+        edges_metric: Edge table in a metric CRS with u, v, capacity, speed_kph,
+            length_m and on_access_route columns; geometries run from u to v
+        site_metric: Construction site geometry in the same CRS
+
+    Returns:
+        Dictionary with the "inbound" and "outbound" share of the trips using each
+        edge, shape (E,), 1.0 on edges every truck drives (all zeros if the site
+        cannot be reached)
+    """
+    n_edges = len(edges_metric)
+    _, codes = np.unique(np.concatenate([edges_metric["u"].to_numpy(), edges_metric["v"].to_numpy()]), return_inverse=True)
+    u, v = codes[:n_edges], codes[n_edges:]
+    n_nodes = codes.max() + 1 if n_edges else 0
+    shares = {"inbound": np.zeros(n_edges), "outbound": np.zeros(n_edges)}
+    if n_edges == 0:
+        return shares
+
+    # Node positions from the first and last point of the edge geometries
+    node_x, node_y = np.zeros(n_nodes), np.zeros(n_nodes)
+    starts = edges_metric.geometry.apply(lambda line: line.coords[0])
+    ends = edges_metric.geometry.apply(lambda line: line.coords[-1])
+    node_x[u], node_y[u] = [p[0] for p in starts], [p[1] for p in starts]
+    node_x[v], node_y[v] = [p[0] for p in ends], [p[1] for p in ends]
+
+    # Travel time in seconds; parallel edges keep the fastest one
+    speed = np.maximum(edges_metric["speed_kph"].to_numpy(dtype=float), 5.0) / 3.6
+    cost = np.maximum(edges_metric["length_m"].to_numpy(dtype=float), 1.0) / speed
+    cost = np.where(edges_metric["on_access_route"].to_numpy(dtype=bool), cost * ACCESS_ROUTE_COST_FACTOR, cost)
+    order = np.lexsort((cost, v, u))
+    first = np.ones(n_edges, dtype=bool)
+    first[1:] = (u[order][1:] != u[order][:-1]) | (v[order][1:] != v[order][:-1])
+    fastest = order[first]
+    edge_index = sp.csr_matrix((fastest + 1, (u[fastest], v[fastest])), shape=(n_nodes, n_nodes))
+    graph = sp.csr_matrix((cost[fastest], (u[fastest], v[fastest])), shape=(n_nodes, n_nodes))
+
+    site_node = int(np.argmin(gpd.points_from_xy(node_x, node_y).distance(site_metric)))
+    entry_weight = _entry_weights(u, v, node_x, node_y, edges_metric["capacity"].to_numpy(dtype=float))
+
+    # Inbound: tree of fastest routes from every node to the site (Dijkstra on the reversed graph)
+    distance, next_node = dijkstra(graph.T.tocsr(), indices=site_node, return_predecessors=True)
+    shares["inbound"] = _accumulate_tree(entry_weight, distance, next_node, edge_index, n_edges, towards_root=True)
+
+    # Outbound: tree of fastest routes from the site to every node
+    distance, previous_node = dijkstra(graph, indices=site_node, return_predecessors=True)
+    shares["outbound"] = _accumulate_tree(entry_weight, distance, previous_node, edge_index, n_edges, towards_root=False)
+    return shares
+
+def _entry_weights(
+    u: np.ndarray,
+    v: np.ndarray,
+    node_x: np.ndarray,
+    node_y: np.ndarray,
+    capacity: np.ndarray
+) -> np.ndarray:
+    """Weight of every node as a truck entry: capacity of its largest road for boundary nodes, else 0."""
+    band_x = (node_x.max() - node_x.min()) * ENTRY_BAND_SHARE
+    band_y = (node_y.max() - node_y.min()) * ENTRY_BAND_SHARE
+    boundary = (
+        (node_x <= node_x.min() + band_x) | (node_x >= node_x.max() - band_x) |
+        (node_y <= node_y.min() + band_y) | (node_y >= node_y.max() - band_y)
+    )
+
+    road_capacity = np.zeros(len(node_x))
+    np.maximum.at(road_capacity, u, capacity)
+    np.maximum.at(road_capacity, v, capacity)
+
+    weight = np.where(boundary, road_capacity, 0.0)
+    if (weight >= ENTRY_MIN_CAPACITY).any():
+        weight[weight < ENTRY_MIN_CAPACITY] = 0.0
+    return weight
+
+def _accumulate_tree(
+    entry_weight: np.ndarray,
+    distance: np.ndarray,
+    parent: np.ndarray,
+    edge_index: sp.csr_matrix,
+    n_edges: int,
+    towards_root: bool
+) -> np.ndarray:
+    """
+    Push the entry weights along a shortest-path tree and return the share carried by each edge.
+
+    Nodes are processed from the farthest to the root, so every node passes on the
+    weight of its whole subtree in one step.
+    """
+    reachable = np.isfinite(distance) & (parent >= 0)
+    weight = np.where(np.isfinite(distance), entry_weight, 0.0)
+    total = weight.sum()
+    edge_share = np.zeros(n_edges)
+    if total <= 0:
+        return edge_share
+
+    # Edge between every node and its parent in the tree
+    nodes = np.flatnonzero(reachable)
+    starts, ends = (nodes, parent[nodes]) if towards_root else (parent[nodes], nodes)
+    tree_edge = np.full(len(distance), -1)
+    tree_edge[nodes] = np.asarray(edge_index[starts, ends]).ravel() - 1
+
+    flow = weight / total
+    for node in nodes[np.argsort(-distance[nodes])]:
+        if flow[node] == 0:
+            continue
+        edge_share[tree_edge[node]] += flow[node]
+        flow[parent[node]] += flow[node]
+    return edge_share
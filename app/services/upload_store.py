@@ -0,0 +1,88 @@
+import os
+import uuid
+import hashlib
+from typing import Any, Tuple
+
+# Uploaded activity files, stored once per content: <UPLOADS_DIR>/<hash[:2]>/<hash><extension>
+UPLOADS_DIR = "data/uploads"
+
+# Largest accepted upload (bytes)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "50")) * 1024 * 1024
+
+# Bytes read from the upload per step
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+async def receive_upload(file: Any) -> Tuple[str, str]:
+    """
+    Copy an upload to a temporary file in chunks, hashing it on the way.
+
+    Args:
+        file: The uploaded file (FastAPI UploadFile)
+
+    Returns:
+        Tuple (temporary path, SHA-256 of the content)
+
+    Raises:
+        ValueError: If the upload exceeds MAX_UPLOAD_BYTES
+    """
+    # Reject uploads whose announced size is already too large before copying anything
+    if getattr(file, "size", None) and file.size > MAX_UPLOAD_BYTES:
+        raise ValueError(f"File exceeds the upload limit of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+    tmp_dir = os.path.join(UPLOADS_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}{_extension(file.filename)}")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise ValueError(
+                        f"File exceeds the upload limit of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+    except Exception:
+        discard_upload(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest()
+
+def store_upload(tmp_path: str, file_hash: str) -> str:
+    """
+    Move a received upload to its content-addressed path, keeping an existing copy of the same content.
+
+    Args:
+        tmp_path: Temporary path returned by receive_upload
+        file_hash: SHA-256 returned by receive_upload
+
+    Returns:
+        Path of the stored file
+    """
+    path = upload_path(file_hash, _extension(tmp_path))
+    if os.path.exists(path):
+        discard_upload(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+    return path
+
+def discard_upload(tmp_path: str) -> None:
+    """Remove a received upload that is not stored"""
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+def upload_path(file_hash: str, extension: str = "") -> str:
+    """Content-addressed path of an uploaded file"""
+    return os.path.join(UPLOADS_DIR, file_hash[:2], f"{file_hash}{extension}")
+
+def _extension(filename: str) -> str:
+    """Lower-case extension of a file name, e.g. ".xlsx", empty if there is none"""
+    return os.path.splitext(filename or "")[1].lower()
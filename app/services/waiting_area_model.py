@@ -0,0 +1,239 @@
+import heapq
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from collections import deque
+from shapely.geometry import shape
+from typing import Dict, List, Any, Optional
+
+from app.services.edge_features import METRIC_CRS
+
+# Space one waiting truck needs including manoeuvring (in m²)
+TRUCK_BAY_AREA_M2 = 60.0
+
+# Trucks unloaded at the same time on site
+UNLOADING_BAYS = 2
+
+# Unloading time of vehicle types without an UnloadingMinutes column in the Vehicles sheet
+DEFAULT_UNLOADING_MINUTES = 20.0
+
+# Shape of the gamma distributed unloading times (4 gives a coefficient of variation of 0.5)
+UNLOADING_TIME_SHAPE = 4.0
+
+MINUTES_PER_DAY = 24 * 60
+
+def waiting_area_capacities(waiting_areas: Optional[List[Dict[str, Any]]]) -> np.ndarray:
+    """
+    Number of trucks each waiting area can hold, from its polygon area in the metric CRS.
+
+    Args:
+        waiting_areas: GeoJSON polygons of the waiting areas
+
+    Returns:
+        Capacity of every area (at least one truck), shape (A,)
+    """
+    geometries = []
+    for area in waiting_areas or []:
+        try:
+            geometries.append(shape(area))
+        except Exception:
+            geometries.append(None)  # Invalid geometries still hold one truck
+    if not geometries:
+        return np.zeros(0, dtype=np.int64)
+
+    areas_m2 = gpd.GeoSeries(geometries, crs="EPSG:4326").to_crs(METRIC_CRS).area.fillna(0).to_numpy()
+    return np.maximum(np.floor(areas_m2 / TRUCK_BAY_AREA_M2), 1).astype(np.int64)
+
+def unloading_minutes_by_type(vehicles: pd.DataFrame) -> Dict[str, float]:
+    """
+    Mean unloading time per vehicle type from the optional UnloadingMinutes column of the Vehicles sheet.
+
+    Vehicle types without a value use DEFAULT_UNLOADING_MINUTES; a sheet without
+    the column is reported once per call, i.e. once per simulation run.
+    """
+    if "VehicleType" not in vehicles.columns or "UnloadingMinutes" not in vehicles.columns:
+        print(f"Vehicles sheet has no UnloadingMinutes column, using {DEFAULT_UNLOADING_MINUTES:g} minutes for every vehicle type")
+        return {}
+    minutes = pd.to_numeric(vehicles["UnloadingMinutes"], errors="coerce")
+    return {
+        str(vehicle_type): float(value)
+        for vehicle_type, value in zip(vehicles["VehicleType"], minutes)
+        if pd.notna(vehicle_type) and pd.notna(value) and value > 0
+    }
+
+def unloading_minutes_of(vehicle_types: pd.Series, unloading_minutes: Dict[str, float]) -> np.ndarray:
+    """Mean unloading time of every delivery from its vehicle type, DEFAULT_UNLOADING_MINUTES if unknown."""
+    minutes = vehicle_types.map(unloading_minutes).to_numpy(dtype=float)
+    return np.where(np.isnan(minutes), DEFAULT_UNLOADING_MINUTES, minutes)
+
+def draw_truck_arrivals(
+    deliveries: pd.DataFrame,
+    unloading_minutes: Dict[str, float],
+    rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Draw the arrival and unloading time of every delivery with a readable time window.
+
+    Trucks arrive uniformly within their time window; unloading times are gamma
+    distributed around the mean of their vehicle type.
+
+    Args:
+        deliveries: Deliveries with StartMinute and EndMinute columns
+        unloading_minutes: Mean unloading time per vehicle type
+        rng: Random generator
+
+    Returns:
+        Dictionary with "arrival" and "service" in minutes, shape (N,)
+    """
+    valid = (deliveries["StartMinute"] >= 0) & (deliveries["EndMinute"] >= deliveries["StartMinute"])
+    start = deliveries.loc[valid, "StartMinute"].to_numpy(dtype=float)
+    end = deliveries.loc[valid, "EndMinute"].to_numpy(dtype=float)
+
+    vehicle_types = deliveries.loc[valid, "VehicleType"] if "VehicleType" in deliveries.columns else pd.Series(None, index=range(len(start)), dtype=object)
+    mean_service = unloading_minutes_of(vehicle_types, unloading_minutes)
+
+    return {
+        "arrival": rng.uniform(start, end),
+        "service": rng.gamma(UNLOADING_TIME_SHAPE, mean_service / UNLOADING_TIME_SHAPE)
+    }
+
+def simulate_waiting_areas(
+    arrival: np.ndarray,
+    service: np.ndarray,
+    capacities: np.ndarray,
+    unloading_bays: int = UNLOADING_BAYS,
+    horizon: int = MINUTES_PER_DAY
+) -> Dict[str, np.ndarray]:
+    """
+    Discrete-event simulation of trucks queueing in the waiting areas for a free unloading bay.
+
+    Trucks are unloaded in arrival order. A truck that finds no free bay waits in the
+    first waiting area with space; if all areas are full it waits on the street
+    (overflow) and moves into an area as soon as a place is freed. Arrivals are
+    processed in sorted order and bay releases through a heap, so each truck costs
+    a few heap operations.
+
+    Args:
+        arrival: Arrival times in minutes (any origin, e.g. minutes of the day), shape (N,)
+        service: Unloading times in minutes, shape (N,)
+        capacities: Number of trucks each waiting area holds, shape (A,)
+        unloading_bays: Trucks unloaded at the same time
+        horizon: Number of minutes of the occupancy arrays
+
+    Returns:
+        Dictionary with "occupancy" (minute x area trucks waiting, shape (horizon, A)),
+        "street_queue" (trucks waiting on the street per minute), "overflow" (arrivals
+        per minute that found all areas full), both (horizon,), and "waiting_time"
+        (minutes every truck waited for a bay, in the order of the input, shape (N,))
+    """
+    n_areas = len(capacities)
+    order = np.argsort(arrival, kind="stable")
+    arrival_times = np.asarray(arrival, dtype=float)[order].tolist()
+    service_times = np.asarray(service, dtype=float)[order].tolist()
+
+    free_places = [int(capacity) for capacity in capacities]
+    free_bays = unloading_bays
+    releases: List[float] = []  # Heap of times at which an unloading bay is freed
+    queue: deque = deque()  # Trucks waiting for a bay in arrival order
+    street: deque = deque()  # Trucks waiting for a place in a waiting area
+    location = [-1] * len(arrival_times)  # Area of a waiting truck, n_areas for the street
+    waited_since = [0.0] * len(arrival_times)
+    waiting_time = np.zeros(len(arrival_times))
+
+    # Waiting intervals as (column, start, end) with the street as the last column
+    intervals: List[tuple] = []
+    overflow_times: List[float] = []
+
+    def start_unloading(truck: int, now: float) -> None:
+        nonlocal free_bays
+        free_bays -= 1
+        waiting_time[truck] = now - arrival_times[truck]
+        heapq.heappush(releases, now + service_times[truck])
+
+    def release_bay(now: float) -> None:
+        nonlocal free_bays
+        free_bays += 1
+        if not queue:
+            return
+        truck = queue.popleft()
+        area = location[truck]
+        intervals.append((area, waited_since[truck], now))
+        if area < n_areas:
+            # The freed place goes to the first truck waiting on the street
+            if street:
+                moved = street.popleft()
+                intervals.append((n_areas, waited_since[moved], now))
+                location[moved], waited_since[moved] = area, now
+            else:
+                free_places[area] += 1
+        else:
+            street.remove(truck)
+        start_unloading(truck, now)
+
+    for truck, now in enumerate(arrival_times):
+        while releases and releases[0] <= now:
+            release_bay(heapq.heappop(releases))
+
+        if free_bays > 0 and not queue:
+            start_unloading(truck, now)
+            continue
+
+        area = next((a for a in range(n_areas) if free_places[a] > 0), n_areas)
+        if area < n_areas:
+            free_places[area] -= 1
+        else:
+            street.append(truck)
+            overflow_times.append(now)
+        location[truck], waited_since[truck] = area, now
+        queue.append(truck)
+
+    while queue:
+        release_bay(heapq.heappop(releases))
+
+    # Minute occupancy from the intervals with one difference array per column
+    diff = np.zeros((horizon + 1, n_areas + 1), dtype=np.int64)
+    if intervals:
+        columns, starts, ends = (np.asarray(values) for values in zip(*intervals))
+        starts = np.clip(np.ceil(starts).astype(np.int64), 0, horizon)
+        ends = np.clip(np.ceil(ends).astype(np.int64), 0, horizon)
+        np.add.at(diff, (starts, columns), 1)
+        np.add.at(diff, (ends, columns), -1)
+    occupancy = np.cumsum(diff, axis=0)[:horizon]
+
+    overflow = np.bincount(
+        np.clip(np.floor(overflow_times).astype(np.int64), 0, horizon - 1), minlength=horizon
+    ) if overflow_times else np.zeros(horizon, dtype=np.int64)
+
+    unsorted_waiting_time = np.zeros(len(arrival_times))
+    unsorted_waiting_time[order] = waiting_time
+    return {
+        "occupancy": occupancy[:, :n_areas],
+        "street_queue": occupancy[:, n_areas],
+        "overflow": overflow,
+        "waiting_time": unsorted_waiting_time
+    }
+
+def aggregate_waiting_steps(
+    simulation: Dict[str, np.ndarray],
+    step_starts: np.ndarray,
+    step_minutes: int
+) -> Dict[str, np.ndarray]:
+    """
+    Aggregate the minute results of simulate_waiting_areas to the simulation time steps.
+
+    Args:
+        simulation: Result of simulate_waiting_areas over one day (minutes of the day)
+        step_starts: Start of every time step in minutes of the day, shape (T,)
+        step_minutes: Length of a time step in minutes
+
+    Returns:
+        Dictionary with "occupied" (peak trucks per area, shape (T, A)), "street_queue"
+        (peak trucks on the street) and "overflow" (arrivals finding all areas full), both (T,)
+    """
+    minutes = np.asarray(step_starts)[:, None] + np.arange(step_minutes)[None, :]
+    minutes = np.clip(minutes, 0, len(simulation["street_queue"]) - 1)
+    return {
+        "occupied": simulation["occupancy"][minutes].max(axis=1),
+        "street_queue": simulation["street_queue"][minutes].max(axis=1),
+        "overflow": simulation["overflow"][minutes].sum(axis=1)
+    }
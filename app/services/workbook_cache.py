@@ -0,0 +1,97 @@
+import os
+import hashlib
+import threading
+import pandas as pd
+from typing import Dict, Optional
+
+# Parsed simulation sheets, one directory of parquet files per workbook content hash
+WORKBOOK_CACHE_DIR = "data/prepared/workbooks"
+
+# Sheets of the uploaded workbook used by the simulation
+SIMULATION_SHEETS = ("Deliveries", "Vehicles", "Schedule")
+
+# Column types of the simulation sheets, other columns are kept as they are
+DATE_COLUMNS = {
+    "Deliveries": ["Date"],
+    "Schedule": ["StartDate", "EndDate"]
+}
+TEXT_COLUMNS = {
+    "Deliveries": ["TimeWindow", "VehicleType"],
+    "Vehicles": ["VehicleType"],
+    "Schedule": ["Phase"]
+}
+
+_cache_lock = threading.Lock()
+
+def file_hash(file_path: str) -> str:
+    """SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_simulation_sheets(file_path: str, content_hash: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load the simulation sheets of a workbook, parsing the Excel file at most once per content.
+
+    Args:
+        file_path: Path of the uploaded workbook
+        content_hash: SHA-256 of the workbook if known (Project.file_hash), saves reading the file on a cache hit
+
+    Returns:
+        Dictionary sheet name -> DataFrame with normalised column types
+
+    Raises:
+        ValueError: If one of the simulation sheets is missing
+    """
+    cache_dir = os.path.join(WORKBOOK_CACHE_DIR, content_hash or file_hash(file_path))
+    paths = {name: os.path.join(cache_dir, f"{name}.parquet") for name in SIMULATION_SHEETS}
+
+    if all(os.path.exists(path) for path in paths.values()):
+        try:
+            return {name: pd.read_parquet(path) for name, path in paths.items()}
+        except Exception as e:
+            print(f"Error loading cached workbook {file_path}: {str(e)}")
+
+    # Parse all sheets in one pass over the workbook
+    workbook = pd.read_excel(file_path, sheet_name=None)
+    missing = [name for name in SIMULATION_SHEETS if name not in workbook]
+    if missing:
+        raise ValueError(f"Workbook is missing the sheets: {', '.join(missing)}")
+
+    sheets = {name: _normalise_sheet(name, workbook[name]) for name in SIMULATION_SHEETS}
+
+    try:
+        with _cache_lock:
+            os.makedirs(cache_dir, exist_ok=True)
+            for name, df in sheets.items():
+                # Write to a temporary file first so readers never see a partial table
+                tmp_path = f"{paths[name]}.tmp"
+                df.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, paths[name])
+    except Exception as e:
+        print(f"Error caching workbook {file_path}: {str(e)}")
+
+    return sheets
+
+def _normalise_sheet(name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the known columns of a sheet to typed columns."""
+    df = df.copy()
+    for column in DATE_COLUMNS.get(name, []):
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce").dt.normalize()
+    for column in TEXT_COLUMNS.get(name, []):
+        if column in df.columns:
+            df[column] = _as_text(df[column])
+
+    # Mixed-type columns cannot be stored as parquet, keep them as text
+    for column in df.columns:
+        if df[column].dtype == object and df[column].map(type).nunique() > 1:
+            df[column] = _as_text(df[column])
+    df.columns = [str(column) for column in df.columns]
+    return df
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """Convert values to strings, keeping missing values."""
+    return values.map(lambda value: value if pd.isna(value) else str(value))
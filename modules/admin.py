@@ -3,6 +3,7 @@ import pandas as pd
 import json
 import requests
 import os
+import time
 from datetime import datetime, date
 # import folium # Remove Folium
 # from streamlit_folium import folium_static # Remove streamlit_folium_static
@@ -348,38 +349,125 @@ def show_admin_panel(project):
         with col1: start_date_sim = st.date_input("Startdatum", value=date.today(), key=f"sim_date_start_{project['id']}")
         with col2: end_date_sim = st.date_input("Enddatum", value=date.today() + pd.Timedelta(days=7), key=f"sim_date_end_{project['id']}")
         
+        job_key = f"sim_job_{project['id']}"
         if st.button("Simulation starten"):
             try:
                 simulation_request = {"project_id": project["id"], "start_date": start_date_sim.isoformat(), "end_date": end_date_sim.isoformat(), "time_interval": interval}
-                with st.spinner("Simulation läuft... Dies kann einige Minuten dauern."):
-                    response = requests.post(f"{API_URL}/api/simulation/run", json=simulation_request)
-                    if response.status_code == 200:
-                        simulation_result = response.json()
-                        st.success("Simulation erfolgreich abgeschlossen!")
-                        st.subheader("Simulationszusammenfassung")
-                        st.json(simulation_result.get("stats", "Keine Statistiken verfügbar."))
-                        st.info("Detaillierte Ergebnisse im Dashboard anzeigen.")
-                        if st.button("Zum Dashboard"):
-                            st.session_state.page = "dashboard"
-                            st.rerun()
-                    else:
-                        st.error(f"Simulation konnte nicht ausgeführt werden: {response.status_code} - {response.text}")
+                response = requests.post(f"{API_URL}/api/simulation/run", json=simulation_request)
+                if response.status_code in (200, 202):
+                    st.session_state[job_key] = response.json()["id"]
+                    st.session_state.pop(f"{job_key}_summary", None)
+                else:
+                    st.error(f"Simulation konnte nicht ausgeführt werden: {response.status_code} - {response.text}")
             except Exception as e:
                 st.error(f"Fehler beim Ausführen der Simulation: {str(e)}")
 
+        if st.session_state.get(job_key):
+            show_simulation_job(st.session_state[job_key], job_key)
+        if st.session_state.get(f"{job_key}_summary") is not None:
+            show_simulation_summary(job_key)
+
+def show_simulation_job(job_id, job_key):
+    """Poll a background simulation job and show its progress, a completed job is shown by show_simulation_summary."""
+    if st.button("Simulation abbrechen", key=f"cancel_{job_key}"):
+        try:
+            requests.post(f"{API_URL}/api/simulation/jobs/{job_id}/cancel")
+        except Exception as e:
+            st.error(f"Fehler beim Abbrechen der Simulation: {str(e)}")
+
+    progress_bar = st.progress(0.0, text="Simulation wird gestartet...")
+    completed = False
+    try:
+        while True:
+            response = requests.get(f"{API_URL}/api/simulation/jobs/{job_id}")
+            if response.status_code != 200:
+                st.error(f"Simulationsstatus konnte nicht abgerufen werden: {response.status_code} - {response.text}")
+                break
+            job = response.json()
+            days_total = max(1, job.get("days_total", 1))
+            days_done = job.get("days_done", 0)
+            progress_bar.progress(min(1.0, days_done / days_total), text=f"Simulation läuft... {days_done}/{days_total} Tage")
+
+            if job["status"] == "completed":
+                # Keep the summary for the following runs, where its button can be handled
+                st.session_state[f"{job_key}_summary"] = job.get("summary") or {}
+                del st.session_state[job_key]
+                completed = True
+                break
+            if job["status"] == "cancelled":
+                progress_bar.empty()
+                st.warning("Simulation wurde abgebrochen.")
+                del st.session_state[job_key]
+                break
+            if job["status"] == "failed":
+                progress_bar.empty()
+                st.error(f"Simulation fehlgeschlagen: {job.get('error')}")
+                del st.session_state[job_key]
+                break
+            time.sleep(1)
+    except Exception as e:
+        st.error(f"Fehler beim Abrufen des Simulationsstatus: {str(e)}")
+
+    if completed:
+        st.rerun()
+
+def show_simulation_summary(job_key):
+    """Show the summary of a completed simulation job with a link to the dashboard."""
+    summary_key = f"{job_key}_summary"
+    st.success("Simulation erfolgreich abgeschlossen!")
+    st.subheader("Simulationszusammenfassung")
+    st.json(st.session_state[summary_key] or "Keine Statistiken verfügbar.")
+    st.info("Detaillierte Ergebnisse im Dashboard anzeigen.")
+    if st.button("Zum Dashboard", key=f"dashboard_{job_key}"):
+        del st.session_state[summary_key]
+        st.session_state.page = "dashboard"
+        st.rerun()
+
 def refresh_projects():
-    """Refresh the projects list in the session state"""
+    """Refresh the projects list (names and IDs only) in the session state"""
+    page_size = 200 # Projects per request
     try:
-        response = requests.get(f"{API_URL}/api/projects/")
-        if response.status_code == 200:
-            st.session_state.projects = response.json()
-            if not st.session_state.projects: st.session_state.projects = [] # Ensure it's a list
+        headers = {}
+        if st.session_state.get("projects") and st.session_state.get("projects_etag"):
+            headers["If-None-Match"] = st.session_state.projects_etag # Unchanged list returns 304
+        response = requests.get(
+            f"{API_URL}/api/projects/",
+            params={"fields": "summary", "limit": page_size},
+            headers=headers
+        )
+        if response.status_code == 304:
             return True
-        else:
+        if response.status_code != 200:
             st.error(f"Projekte konnten nicht aktualisiert werden: {response.status_code}")
             st.session_state.projects = []
             return False
+
+        etag = response.headers.get("ETag")
+        projects = response.json() or []
+        # Follow the Link header through the remaining pages
+        while "next" in response.links:
+            response = requests.get(response.links["next"]["url"])
+            if response.status_code != 200:
+                st.error(f"Projekte konnten nicht aktualisiert werden: {response.status_code}")
+                st.session_state.projects = []
+                return False
+            projects.extend(response.json() or [])
+
+        st.session_state.projects = projects
+        st.session_state.projects_etag = etag
+        return True
     except Exception as e:
         st.error(f"Fehler beim Verbinden zur API: {str(e)}")
         st.session_state.projects = []
-        return False 
\ No newline at end of file
+        return False
+
+def load_project(project_id):
+    """Load the complete project (geometries, traffic data) of a project in the list"""
+    try:
+        response = requests.get(f"{API_URL}/api/projects/{project_id}")
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Projekt konnte nicht geladen werden: {response.status_code}")
+    except Exception as e:
+        st.error(f"Fehler beim Verbinden zur API: {str(e)}")
+    return None
\ No newline at end of file
@@ -30,9 +30,10 @@ from utils.dashoboard_utils import (
     get_days_in_week,
     build_hourly_layer_cache,
 )
-from filelock import FileLock
 import re
 from config import API_URL  # Import centralized config
+from app.services.edge_features import DEFAULT_CAPACITY, capacity_for_highway, load_edge_features
+from app.services.network_cache import get_network, bbox_polygon
 
 
 # API_URL is now imported from config.py
@@ -41,22 +42,6 @@ from config import API_URL  # Import centralized config
 DEBUG_COORDS = False 
 DEBUG_OSM = False    
 
-# Define cache directory for OSM data
-CACHE_DIR = "data/prepared/osm_cache"
-if not os.path.exists(CACHE_DIR):
-    os.makedirs(CACHE_DIR)
-
-# Capacity mapping for OSM highway types
-CAPACITY_MAP = {
-    'motorway': 2000, 'trunk': 1800, 'primary': 1500,
-    'secondary': 1000, 'tertiary': 700,
-    'motorway_link': 1000, 'trunk_link': 900, 'primary_link': 750,
-    'secondary_link': 500, 'tertiary_link': 350,
-    'residential': 400, 'unclassified': 300, 'road': 300,
-    'living_street': 100, 'service': 150, 'track': 50, 'path': 30,
-    'cycleway': 50, 'footway': 20, 'pedestrian': 20, 'steps': 10
-}
-DEFAULT_CAPACITY = 200
 
 # --- GLOBAL FEATURE FLAGS ---
 # Disable/enable the dashboard hour animation. When set to False the play/pause
@@ -768,74 +753,71 @@ def get_base_osm_segments(project):
             else:
                  st.sidebar.write(f"OSM: Map bounds for {project_id}: {map_bounds['coordinates'][0][:2]}...") 
 
-        st.session_state.base_osm_segments = generate_osm_traffic_segments(map_bounds, project_id)
+        # Prefer the per-edge feature table precomputed by the backend for this project
+        base_segments = load_project_edge_segments(project)
+        if not base_segments:
+            base_segments = generate_osm_traffic_segments(map_bounds, project_id)
+        st.session_state.base_osm_segments = base_segments
         st.session_state.current_project_id_for_osm = project_id
         if DEBUG_OSM:
             st.sidebar.info(f"OSM: Stored {len(st.session_state.base_osm_segments)} base segments in session state.")
     return st.session_state.base_osm_segments
 
+def load_project_edge_segments(project):
+    """
+    Returns base segments from the project's precomputed edge feature table, or [] if
+    no table exists for the current geometries. Segments carry their access-route flag.
+    """
+    try:
+        features = load_edge_features(
+            project.get("id", "default_project"), project.get("polygon"),
+            project.get("map_bounds"), project.get("access_routes"), build=False
+        )
+    except Exception as e:
+        if DEBUG_OSM: st.sidebar.warning(f"OSM: Could not load edge feature table: {e}")
+        return []
+    if features is None or features.empty:
+        return []
+    if DEBUG_OSM: st.sidebar.info(f"OSM: Loaded {len(features)} segments from edge feature table.")
+    return [
+        {
+            'segment_id': seg_id,
+            'coordinates': [list(coord) for coord in geom.coords],
+            'name': name,
+            'highway_type': highway,
+            'length': float(length_m),
+            'capacity': int(capacity),
+            'on_access_route': bool(on_route)
+        }
+        for seg_id, geom, name, highway, length_m, capacity, on_route in zip(
+            features['segment_id'], features.geometry, features['name'], features['highway'],
+            features['length_m'], features['capacity'], features['on_access_route']
+        )
+    ]
+
 def generate_osm_traffic_segments(project_map_bounds, project_id):
     """
-    Fetches road network data from OpenStreetMap within the given map_bounds,
-    processes it into traffic segments with estimated capacities, and caches the result.
+    Loads the road network within the given map_bounds from the shared network cache,
+    processes it into traffic segments with estimated capacities.
     Coordinates are returned as [[lon, lat], [lon, lat], ...].
     """
     if not project_map_bounds or 'coordinates' not in project_map_bounds or not project_map_bounds['coordinates']:
         if DEBUG_OSM: st.sidebar.warning("OSM: Project map bounds are missing or invalid.")
         return []
 
-    bounds_coords_str = json.dumps(project_map_bounds['coordinates'][0], sort_keys=True)
-    cache_key_input = f"{project_id}_{bounds_coords_str}"
-    cache_filename_base = hashlib.md5(cache_key_input.encode()).hexdigest()
-    cache_file = os.path.join(CACHE_DIR, f"osm_segments_{cache_filename_base}.gpkg")
-    lock = FileLock(cache_file + ".lock")
-
-    with lock:
-        if os.path.exists(cache_file):
-            if DEBUG_OSM: st.sidebar.info(f"OSM: Loading cached road segments from {cache_file}")
-            try:
-                segments_gdf = gpd.read_file(cache_file)
-                if segments_gdf.empty:
-                    if DEBUG_OSM: st.sidebar.warning(f"OSM: Cache file {cache_file} is empty. Refetching.")
-                    os.remove(cache_file) 
-                else:
-                    processed_segments = []
-                    for idx, row in segments_gdf.iterrows(): 
-                        coords_lon_lat = list(row.geometry.coords) if row.geometry and row.geometry.geom_type == 'LineString' else (list(row.geometry.geoms[0].coords) if row.geometry and row.geometry.geom_type == 'MultiLineString' and len(row.geometry.geoms) > 0 else [])
-                        highway_type = row.get('highway', 'unknown')
-                        highway_type = highway_type[0] if isinstance(highway_type, list) and highway_type else highway_type
-                        processed_segments.append({
-                            'segment_id': str(row.get('osmid', f"cached_seg_{idx}")),
-                            'coordinates': coords_lon_lat,
-                            'name': str(row.get('name', '')),
-                            'highway_type': highway_type,
-                            'length': float(row.get('length', 0.0)),
-                            'capacity': int(row.get('capacity', DEFAULT_CAPACITY))
-                        })
-                    if DEBUG_OSM: st.sidebar.info(f"OSM: Loaded {len(processed_segments)} segments from cache.")
-                    return processed_segments
-            except Exception as e:
-                if DEBUG_OSM: st.sidebar.error(f"OSM: Error loading GDF cache: {e}. Refetching.")
-                if os.path.exists(cache_file):
-                    try: os.remove(cache_file); 
-                    except: pass
-    if DEBUG_OSM: st.sidebar.info("OSM: No valid cache. Fetching network...")
     try:
         shapely_poly_coords = project_map_bounds['coordinates'][0]
         if not shapely_poly_coords or len(shapely_poly_coords) < 3: return []
         map_boundary_polygon_shapely = ShapelyPolygon(shapely_poly_coords)
         try:
-            poly_gdf = gpd.GeoDataFrame([{'id':1, 'geometry': map_boundary_polygon_shapely}], crs="EPSG:4326")
-            G = ox.graph_from_polygon(poly_gdf.iloc[0]['geometry'], network_type='drive_service', truncate_by_edge=True, retain_all=False, simplify=True)
+            G = get_network(project_map_bounds, network_type='drive_service', truncate_by_edge=True)
             if G.number_of_edges() == 0: raise ValueError("No roads from graph_from_polygon")
             G_proj = ox.project_graph(G)
             segments_gdf_proj = ox.graph_to_gdfs(G_proj, nodes=False, edges=True, fill_edge_geometry=True)
             segments_gdf = segments_gdf_proj.to_crs("EPSG:4326")
         except Exception as e_poly:
             if DEBUG_OSM: st.sidebar.warning(f"OSM (poly fail): {e_poly}. Fallback to bbox.")
-            min_lon, min_lat, max_lon, max_lat = map_boundary_polygon_shapely.bounds
-            buffer = 0.008
-            G_bbox = ox.graph_from_bbox(max_lat+buffer, min_lat-buffer, max_lon+buffer, min_lon-buffer, network_type='drive_service',truncate_by_edge=True,retain_all=False,simplify=True)
+            G_bbox = get_network(bbox_polygon(project_map_bounds, buffer=0.008), network_type='drive_service', truncate_by_edge=True)
             if G_bbox.number_of_edges() == 0: return []
             G_proj = ox.project_graph(G_bbox)
             segments_gdf_proj = ox.graph_to_gdfs(G_proj, nodes=False, edges=True, fill_edge_geometry=True)
@@ -846,17 +828,11 @@ def generate_osm_traffic_segments(project_map_bounds, project_id):
         if segments_gdf.empty: return []
         existing_cols = [col for col in ['osmid', 'name', 'highway', 'length', 'geometry'] if col in segments_gdf.columns]
         segments_gdf = segments_gdf[existing_cols].copy()
-        def get_cap(ht): return CAPACITY_MAP[ht[0]] if isinstance(ht, list) and ht and ht[0] in CAPACITY_MAP else (CAPACITY_MAP[ht] if ht in CAPACITY_MAP else DEFAULT_CAPACITY)
-        segments_gdf['capacity'] = segments_gdf['highway'].apply(get_cap)
+        segments_gdf['capacity'] = segments_gdf['highway'].apply(capacity_for_highway)
         if 'osmid' not in segments_gdf.columns or segments_gdf['osmid'].isnull().all(): segments_gdf['osmid'] = [f"seg_idx_{i}" for i in range(len(segments_gdf))]
         else: segments_gdf['osmid'] = segments_gdf['osmid'].apply(lambda x: x[0] if isinstance(x, list) and x else x).fillna(pd.Series([f"gen_seg_fill_{i}" for i in range(len(segments_gdf))]))
         if 'length' in segments_gdf: segments_gdf['length'] = segments_gdf['length'].astype(float)
         if 'highway' in segments_gdf: segments_gdf['highway'] = segments_gdf['highway'].apply(lambda x: x[0] if isinstance(x,list) and x else str(x) if pd.notnull(x) else 'unknown')
-        if not segments_gdf.empty:
-            # write cache atomically within lock
-            with lock:
-                segments_gdf.to_file(cache_file, driver="GPKG")
-        else: return []
         processed_segments = []
         for _, row in segments_gdf.iterrows():
             coords_lon_lat_list = [list(coord) for coord in row.geometry.coords] if row.geometry and row.geometry.geom_type == 'LineString' else ([list(coord) for coord in row.geometry.geoms[0].coords] if row.geometry and row.geometry.geom_type == 'MultiLineString' and len(row.geometry.geoms) > 0 else [])
@@ -868,7 +844,7 @@ def generate_osm_traffic_segments(project_map_bounds, project_id):
                 'length': float(row.get('length', 0.0)),
                 'capacity': int(row.get('capacity', DEFAULT_CAPACITY))
             })
-        if DEBUG_OSM: st.sidebar.info(f"OSM: Processed {len(processed_segments)} new segments.")
+        if DEBUG_OSM: st.sidebar.info(f"OSM: Processed {len(processed_segments)} segments.")
         return processed_segments
     except Exception as e:
         if DEBUG_OSM: st.sidebar.error(f"OSM: General fail in fetch/process: {str(e)}"); import traceback; st.sidebar.text(traceback.format_exc())
@@ -1200,6 +1176,12 @@ def _get_access_route_segment_ids(project, base_osm_segments, tol=0.0005):
     if cache_key in st.session_state:
         return st.session_state[cache_key]
 
+    # Segments from the edge feature table already know their access-route membership
+    if base_osm_segments and all('on_access_route' in seg for seg in base_osm_segments):
+        seg_ids = {seg["segment_id"] for seg in base_osm_segments if seg['on_access_route']}
+        st.session_state[cache_key] = seg_ids
+        return seg_ids
+
     # Build shapely objects for the routes first
     route_geoms = []
     for route in project.get("access_routes", []):
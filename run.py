@@ -8,6 +8,7 @@ from threading import Thread
 def run_backend():
     """Run the FastAPI backend server"""
     print("FastAPI Backend wird gestartet...")
+    # A single worker only: simulation jobs run inside the API process (see app/services/job_service.py)
     subprocess.run([sys.executable, "-m", "uvicorn", "app.main:app", "--reload", "--host", "0.0.0.0", "--port", "8000"])
 
 def run_frontend():
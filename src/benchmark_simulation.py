@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark für den Verkehrs-Kernel der Simulation.
+
+Vergleicht die frühere Schleife über `edges.iterrows()` (eine Zufallszahl,
+eine Shapely-Distanz und ein TrafficSegment pro Kante und Stunde) mit dem
+vektorisierten Kernel aus `app.services.traffic_model`, der alle Kanten und
+Stunden eines Tages in einem Durchgang berechnet.
+
+Verwendung:
+    python src/benchmark_simulation.py [anzahl_kanten] [anzahl_tage]
+"""
+
+import os
+import sys
+import time as timer
+from datetime import datetime, date, time, timedelta
+
+import numpy as np
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import LineString, Polygon, mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.simulation import TrafficSegment
+from app.services.simulation_service import _prepare_edge_data, _build_hour_result
+from app.services.edge_features import compute_edge_features
+from app.services.traffic_model import compute_edge_traffic
+
+HOURS = np.arange(6, 19)
+
+def build_synthetic_network(n_edges: int, seed: int = 42):
+    """Erzeugt ein zufälliges Strassennetz um den Hardturm-Perimeter."""
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform([8.490, 47.388], [8.513, 47.399], size=(n_edges, 2))
+    ends = starts + rng.normal(0, 0.0008, size=(n_edges, 2))
+    geometries = [LineString([tuple(s), tuple((s + e) / 2), tuple(e)]) for s, e in zip(starts, ends)]
+    index = pd.MultiIndex.from_arrays(
+        [np.arange(n_edges), np.arange(n_edges) + 1, np.zeros(n_edges, dtype=int)],
+        names=["u", "v", "key"]
+    )
+    edges = gpd.GeoDataFrame({"highway": "residential"}, geometry=geometries, index=index, crs="EPSG:4326")
+    site = Polygon([(8.5029, 47.3928), (8.5057, 47.3928), (8.5057, 47.3939), (8.5029, 47.3939)])
+    return edges, site
+
+def legacy_day(edges, site_polygon, deliveries_per_hour):
+    """Frühere Implementierung: eine Python-Schleife pro Kante und Stunde."""
+    segments_per_hour = []
+    for i, hour in enumerate(HOURS):
+        traffic_segments = []
+        for idx, edge in edges.iterrows():
+            if 7 <= hour <= 9 or 16 <= hour <= 18:
+                base_traffic = np.random.randint(50, 200)
+            else:
+                base_traffic = np.random.randint(20, 100)
+            edge_line = edge['geometry']
+            distance_to_site = edge_line.distance(site_polygon)
+            distance_factor = max(0.1, min(1.0, 1.0 / (0.1 + distance_to_site)))
+            total_traffic = int(base_traffic + deliveries_per_hour[i] * distance_factor * 2)
+            capacity = edge_line.length * 5
+            congestion_level = min(1.0, total_traffic / capacity) if capacity > 0 else 0.0
+            traffic_segments.append(TrafficSegment(
+                segment_id=f"{idx[0]}_{idx[1]}",
+                start_node=str(idx[0]),
+                end_node=str(idx[1]),
+                length=edge_line.length,
+                speed_limit=edge.get('speed_kph', 50),
+                traffic_volume=total_traffic,
+                congestion_level=congestion_level,
+                coordinates=[[p[0], p[1]] for p in edge_line.coords]
+            ))
+        segments_per_hour.append(traffic_segments)
+    return segments_per_hour
+
+def vectorized_day(edge_data, deliveries_per_hour, current_date, build_results=True):
+    """Neue Implementierung: ein Kernel-Aufruf pro Tag."""
+    traffic = compute_edge_traffic(
+        hours=HOURS,
+        deliveries_per_hour=deliveries_per_hour,
+        delivery_share=edge_data["delivery_share"],
+        capacity=edge_data["length"] * 5
+    )
+    if not build_results:
+        return traffic
+    return [
+        _build_hour_result(
+            project_id="benchmark",
+            sim_datetime=datetime.combine(current_date, time(hour=int(hour))),
+            edge_data=edge_data,
+            traffic_volume=traffic["traffic_volume"][i],
+            congestion_level=traffic["congestion_level"][i],
+            waiting_areas_status={},
+            deliveries_count=int(deliveries_per_hour[i]),
+            construction_phase=None
+        )
+        for i, hour in enumerate(HOURS)
+    ]
+
+def main():
+    n_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_days = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f"Benchmark mit {n_edges} Kanten, {n_days} Tagen à {len(HOURS)} Stunden")
+    edges, site = build_synthetic_network(n_edges)
+    deliveries_per_hour = np.random.default_rng(0).integers(0, 6, size=len(HOURS))
+    days = [date(2024, 9, 2) + timedelta(days=d) for d in range(n_days)]
+
+    start = timer.perf_counter()
+    for _ in days:
+        legacy_day(edges, site, deliveries_per_hour)
+    legacy_seconds = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    edge_data = _prepare_edge_data(compute_edge_features(edges, mapping(site)))
+    for current_date in days:
+        vectorized_day(edge_data, deliveries_per_hour, current_date)
+    vectorized_seconds = timer.perf_counter() - start
+
+    start = timer.perf_counter()
+    for current_date in days:
+        vectorized_day(edge_data, deliveries_per_hour, current_date, build_results=False)
+    kernel_seconds = timer.perf_counter() - start
+
+    print(f"  Schleife (iterrows):          {legacy_seconds:8.3f} s")
+    print(f"  Kernel + SimulationResult:    {vectorized_seconds:8.3f} s  ({legacy_seconds / vectorized_seconds:6.1f}x)")
+    print(f"  Nur Kernel:                   {kernel_seconds:8.3f} s  ({legacy_seconds / max(kernel_seconds, 1e-9):6.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Importiert die Projekte aus `data/projects/projects.json` in die SQLite-Datenbank.
+
+Die Datenbank (`data/projects/projects.db`, oder `PROJECTS_DB`) übernimmt die
+JSON-Datei beim ersten Zugriff automatisch, solange sie leer ist. Dieses Skript
+importiert eine Datei erneut oder eine andere Datei; Projekte mit gleicher ID
+werden überschrieben. Ein Journal (`projects.journal`) neben der Datei wird
+mit eingelesen.
+
+Verwendung:
+    python src/import_projects.py [pfad/zur/projects.json]
+"""
+
+import os
+import sys
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import project_repository
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else project_repository.PROJECTS_JSON_FILE
+    if not os.path.exists(path):
+        print(f"Datei {path} nicht gefunden.")
+        return
+
+    count = project_repository.import_json_file(path)
+    print(f"{count} Projekte aus {path} nach {project_repository.PROJECTS_DB} importiert.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migriert gespeicherte Simulationsergebnisse in den spaltenorientierten Speicher.
+
+Das alte Format legt pro Stunde eine JSON-Datei unter
+`data/simulations/<projekt>/<datum>/<stunde>.json` ab und wiederholt darin die
+komplette Geometrie aller Segmente. Das neue Format speichert die Geometrie
+einmal pro Netz (`network_<hash>.npz`) und pro Tag dichte Segment x Zeit-Arrays
+(`<datum>.npz`).
+
+Verwendung:
+    python src/migrate_simulation_results.py [projekt_id ...] [--delete]
+
+Ohne Projekt-IDs werden alle Projekte unter data/simulations migriert.
+Mit --delete werden die JSON-Verzeichnisse nach erfolgreicher Migration entfernt.
+"""
+
+import os
+import sys
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import result_store
+
+def main():
+    args = sys.argv[1:]
+    delete = "--delete" in args
+    project_ids = [arg for arg in args if arg != "--delete"]
+
+    if not project_ids:
+        if not os.path.isdir(result_store.SIMULATIONS_DIR):
+            print(f"Verzeichnis {result_store.SIMULATIONS_DIR} nicht gefunden.")
+            return
+        project_ids = sorted(
+            name for name in os.listdir(result_store.SIMULATIONS_DIR)
+            if os.path.isdir(os.path.join(result_store.SIMULATIONS_DIR, name))
+        )
+
+    for project_id in project_ids:
+        if not result_store.has_legacy_results(project_id):
+            print(f"{project_id}: keine JSON-Ergebnisse gefunden.")
+            continue
+        try:
+            migrated = result_store.migrate_json_results(project_id, delete=delete)
+            print(f"{project_id}: {len(migrated)} Tage migriert" + (" (JSON entfernt)" if delete else ""))
+        except Exception as e:
+            print(f"{project_id}: Fehler bei der Migration: {e}")
+
+if __name__ == "__main__":
+    main()
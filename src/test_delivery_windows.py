@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Lieferfenster der Simulation.
+
+Prüft das Einlesen der Zeitfenster (z.B. "08:30-09:15" oder "8-10"), die
+Grenzen der Zuordnung zu stündlichen und viertelstündlichen Zeitschritten und
+die Zählung pro Fahrzeugtyp.
+
+Verwendung:
+    python src/test_delivery_windows.py
+    python -m pytest -q src/test_delivery_windows.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.delivery_windows import parse_time_windows, step_incidence, step_delivery_counts
+
+DELIVERIES = pd.DataFrame({
+    "TimeWindow": ["08:00-10:00", "08:30-09:15", "unbekannt", "8-9"],
+    "VehicleType": ["LKW", "Kran", "LKW", None]
+})
+
+def test_parse_time_windows():
+    """Zeitfenster werden in Minuten des Tages umgerechnet, unlesbare sind nie aktiv."""
+    deliveries = parse_time_windows(DELIVERIES)
+    assert deliveries["StartMinute"].tolist() == [480, 510, -1, 480]
+    assert deliveries["EndMinute"].tolist() == [600, 555, -2, 540]
+
+def test_step_incidence_boundaries():
+    """Lieferfenster sind am Ende inklusiv und werden minutengenau zugeordnet."""
+    deliveries = parse_time_windows(DELIVERIES)
+
+    hourly = step_incidence(deliveries, np.arange(6, 19) * 60, 60)
+    assert list(np.flatnonzero(hourly[0]) + 6) == [8, 9, 10]
+    assert list(np.flatnonzero(hourly[1]) + 6) == [8, 9]
+    assert not hourly[2].any()
+
+    quarter_starts = np.arange(8 * 60, 10 * 60, 15)
+    quarter = step_incidence(deliveries, quarter_starts, 15)
+    # 08:15-08:30 endet genau beim Fensterbeginn, 09:15 beginnt genau beim Fensterende
+    assert [f"{m // 60:02d}:{m % 60:02d}" for m in quarter_starts[quarter[1]]] == ["08:30", "08:45", "09:00", "09:15"]
+
+def test_counts_per_vehicle_type():
+    """Lieferungen ohne Fahrzeugtyp zählen nur in der Gesamtzahl."""
+    counts = step_delivery_counts(parse_time_windows(DELIVERIES), np.array([8 * 60, 9 * 60, 10 * 60]), 60)
+    assert counts["deliveries"].tolist() == [3, 3, 1]
+    assert counts["vehicles"].tolist() == [2, 2, 1]
+    assert counts["by_vehicle_type"]["LKW"].tolist() == [1, 1, 1]
+    assert counts["by_vehicle_type"]["Kran"].tolist() == [1, 1, 0]
+
+def main():
+    print("Starte Tests für die Lieferfenster...")
+    failed = 0
+    for test in (test_parse_time_windows, test_step_incidence_boundaries, test_counts_per_vehicle_type):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
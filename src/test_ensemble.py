@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testskript für den Ensemble-Modus (Monte-Carlo-Replikationen).
+
+Prüft, dass alle Replikationen in einem Aufruf gezogen werden, die
+Perzentile geordnet sind, die Aufteilung grosser Netze in Kantenblöcke das
+Ergebnis nicht verändert und ein Seed die Ergebnisse festlegt.
+
+Verwendung:
+    python src/test_ensemble.py
+    python -m pytest -q src/test_ensemble.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import traffic_model
+from app.services.traffic_model import compute_edge_traffic, compute_edge_traffic_ensemble
+
+HOURS = np.array([6.0, 8.0, 8.25, 12.0, 17.0])
+DELIVERIES = np.array([0, 2, 2, 1, 0])
+SHARE = np.linspace(0.0, 2.0, 12)
+CAPACITY = np.full(12, 150.0)
+
+def test_replications_axis():
+    """Replikationen erhalten eine führende Achse, die Lieferfahrten nicht."""
+    traffic = compute_edge_traffic(HOURS, DELIVERIES, SHARE, CAPACITY, replications=4, rng=np.random.default_rng(3))
+    assert traffic["traffic_volume"].shape == (4, len(HOURS), len(SHARE))
+    assert traffic["delivery_traffic"].shape == (len(HOURS), len(SHARE))
+
+def test_percentiles_ordered_and_seeded():
+    """p10 <= p50 <= p90, und derselbe Seed liefert dieselben Perzentile."""
+    first = compute_edge_traffic_ensemble(HOURS, DELIVERIES, SHARE, CAPACITY, 50, rng=np.random.default_rng(7))
+    second = compute_edge_traffic_ensemble(HOURS, DELIVERIES, SHARE, CAPACITY, 50, rng=np.random.default_rng(7))
+    for key in ("traffic_volume", "congestion_level"):
+        assert np.all(first[key][10] <= first[key][50]) and np.all(first[key][50] <= first[key][90])
+        for p in first[key]:
+            assert np.array_equal(first[key][p], second[key][p])
+
+def test_edge_blocks_do_not_change_shape():
+    """Kleine Kantenblöcke (wenig Speicher) liefern vollständige (H, E)-Arrays."""
+    saved = traffic_model.ENSEMBLE_BLOCK_VALUES
+    traffic_model.ENSEMBLE_BLOCK_VALUES = 20 * len(HOURS) * 3 # Drei Kanten pro Block
+    try:
+        blocked = compute_edge_traffic_ensemble(HOURS, DELIVERIES, SHARE, CAPACITY, 20, rng=np.random.default_rng(1))
+    finally:
+        traffic_model.ENSEMBLE_BLOCK_VALUES = saved
+    median = blocked["traffic_volume"][50]
+    assert median.shape == (len(HOURS), len(SHARE))
+    # Jede Kante hat eine Grundlast, kein Block bleibt leer
+    assert median.min() >= traffic_model.OFFPEAK_BASE_TRAFFIC[0]
+
+def main():
+    print("Starte Tests für den Ensemble-Modus...")
+    failed = 0
+    for test in (test_replications_axis, test_percentiles_ordered_and_seeded, test_edge_blocks_do_not_change_shape):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
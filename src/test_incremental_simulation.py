@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Testskript für das Wiederverwenden gespeicherter Simulationstage.
+
+Läuft in einem temporären Arbeitsverzeichnis (alle data/-Pfade landen dort)
+auf einem synthetischen Netz und prüft, dass ein zweiter Lauf alle Tage
+wiederverwendet, eine geänderte Lieferung nur ihren Tag neu berechnet und
+force_recompute alle Tage neu berechnet.
+
+Verwendung:
+    python src/test_incremental_simulation.py
+    python -m pytest -q src/test_incremental_simulation.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+from shapely.geometry import mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.simulation import SimulationRequest
+from app.services import simulation_service
+from app.services.edge_features import compute_edge_features
+from src.benchmark_simulation import build_synthetic_network
+
+def run(**options):
+    """Simuliert den 2. bis 4. September und liefert die Laufstatistik und die Verkehrsmengen."""
+    run_stats = {}
+    request = SimulationRequest(project_id="inkrementell", start_date=date(2024, 9, 2), end_date=date(2024, 9, 4), seed=3, **options)
+    results = simulation_service.run_simulation_range(request, run_stats=run_stats)
+    volumes = [[segment.traffic_volume for segment in result.time_steps[0].traffic_segments] for result in results]
+    return run_stats, volumes
+
+def test_rerun_reuses_stored_days():
+    """Unveränderte Tage werden gelesen statt simuliert, geänderte neu berechnet."""
+    edges, site = build_synthetic_network(40)
+    features = compute_edge_features(edges, mapping(site))
+    project = SimpleNamespace(
+        id="inkrementell", file_path="plan.xlsx", file_hash=None, polygon=mapping(site), map_bounds=mapping(site),
+        access_routes=[], waiting_areas=[], simulation_start_time="07:00", simulation_end_time="17:00", simulation_interval="1h"
+    )
+    workbook = {
+        "Deliveries": pd.DataFrame({
+            "Date": pd.to_datetime(["2024-09-02", "2024-09-03", "2024-09-04"]),
+            "TimeWindow": ["08:00-10:00", "09:00-11:00", "14:00-15:00"],
+            "VehicleType": ["LKW", "LKW", "Kran"]
+        }),
+        "Vehicles": pd.DataFrame({"VehicleType": ["LKW", "Kran"], "UnloadingMinutes": [30, 45]}),
+        "Schedule": pd.DataFrame({"Phase": ["Rohbau"], "StartDate": pd.to_datetime(["2024-09-01"]), "EndDate": pd.to_datetime(["2024-09-30"])})
+    }
+
+    saved = {
+        name: getattr(simulation_service, name)
+        for name in ("get_project", "load_simulation_sheets", "load_edge_features", "SIMULATION_WORKERS")
+    }
+    saved_cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="vdss_incremental_"))
+    simulation_service.get_project = lambda project_id: project
+    simulation_service.load_simulation_sheets = lambda path, file_hash=None: workbook
+    simulation_service.load_edge_features = lambda *args, **kwargs: features
+    simulation_service.SIMULATION_WORKERS = 1
+    try:
+        first_stats, first_volumes = run()
+        assert first_stats["days_recomputed"] == 3 and first_stats["days_reused"] == 0
+
+        second_stats, second_volumes = run()
+        assert second_stats["days_reused"] == 3 and second_stats["days_recomputed"] == 0
+        assert second_volumes == first_volumes
+
+        # Eine verschobene Lieferung betrifft nur ihren Tag
+        workbook["Deliveries"] = workbook["Deliveries"].assign(TimeWindow=["08:00-10:00", "12:00-13:00", "14:00-15:00"])
+        changed_stats, _ = run()
+        assert changed_stats["days_recomputed"] == 1
+        assert changed_stats["reused_dates"] == [date(2024, 9, 2), date(2024, 9, 4)]
+
+        forced_stats, _ = run(force_recompute=True)
+        assert forced_stats["days_recomputed"] == 3 and forced_stats["days_reused"] == 0
+    finally:
+        os.chdir(saved_cwd)
+        for name, value in saved.items():
+            setattr(simulation_service, name, value)
+
+def main():
+    print("Starte Tests für das Wiederverwenden gespeicherter Tage...")
+    try:
+        test_rerun_reuses_stored_days()
+        print("  OK      test_rerun_reuses_stored_days")
+    except AssertionError as e:
+        print(f"  FEHLER  test_rerun_reuses_stored_days: {e}")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
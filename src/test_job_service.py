@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Simulations-Jobs im Hintergrund.
+
+Ersetzt die eigentliche Simulation durch eine schrittweise steuerbare
+Attrappe, damit Warteschlange, Fortschritt, Abbruch, Zusammenfassung und das
+Fortsetzen nach einem Neustart ohne Strassennetz geprüft werden können.
+
+Verwendung:
+    python src/test_job_service.py
+    python -m pytest -q src/test_job_service.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.simulation import SimulationRequest
+from app.services import job_service
+from app.services.simulation_service import SimulationCancelled
+
+class SteppedSimulation:
+    """Attrappe für iter_simulation_range: liefert einen Tag pro Freigabe über `release`."""
+
+    def __init__(self):
+        self.release = threading.Semaphore(0)
+
+    def __call__(self, request, progress_callback=None, cancel_event=None, run_stats=None):
+        days = (request.end_date - request.start_date).days + 1
+        for i in range(days):
+            self.release.acquire()
+            if cancel_event is not None and cancel_event.is_set():
+                raise SimulationCancelled()
+            day = datetime.combine(request.start_date + timedelta(days=i), datetime.min.time())
+            steps = [
+                SimpleNamespace(id=f"{i}-{hour}", time_steps=[SimpleNamespace(time=day.replace(hour=hour))], stats={"total_traffic": 100 * hour, "deliveries_count": 1})
+                for hour in (8, 9)
+            ]
+            if progress_callback:
+                progress_callback(i + 1, days)
+            yield steps
+
+def wait_for(job_id, statuses, timeout=10.0):
+    """Wartet, bis der Job einen der Zustände erreicht."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_service.get_job(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} blieb im Zustand {job_service.get_job(job_id).status}")
+
+def setup_jobs():
+    simulation = SteppedSimulation()
+    job_service.JOBS_FILE = os.path.join(tempfile.mkdtemp(prefix="vdss_jobs_"), "jobs.json")
+    job_service.JOBS.clear()
+    job_service.iter_simulation_range = simulation
+    job_service.get_project = lambda project_id: SimpleNamespace(id=project_id)
+    return simulation
+
+def request(days, project_id="p"):
+    return SimulationRequest(project_id=project_id, start_date=date(2024, 9, 2), end_date=date(2024, 9, 1 + days))
+
+def test_job_completes_with_summary():
+    """Ein Job läuft bis completed, meldet den Fortschritt und fasst alle Schritte zusammen."""
+    simulation = setup_jobs()
+    job = job_service.submit_simulation_job(request(3))
+    assert job.days_total == 3
+    # Ein gleicher Auftrag liefert den laufenden Job statt eines neuen
+    assert job_service.submit_simulation_job(request(3)).id == job.id
+
+    for _ in range(3):
+        simulation.release.release()
+    job = wait_for(job.id, {"completed", "failed"})
+    assert job.status == "completed", job.error
+    assert job.days_done == 3
+    assert job.summary["result_count"] == 6 and job.summary["days_simulated"] == 3
+    assert job.summary["peak_traffic_volume"] == 900
+
+    with open(job_service.JOBS_FILE, "r", encoding="utf-8") as f:
+        assert json.load(f)[0]["status"] == "completed"
+
+def test_cancel_running_job():
+    """Ein laufender Job bricht nach dem aktuellen Tag ab."""
+    simulation = setup_jobs()
+    job = job_service.submit_simulation_job(request(5, "q"))
+    simulation.release.release()
+    wait_for(job.id, {"running"})
+    job_service.cancel_job(job.id)
+    simulation.release.release()
+    job = wait_for(job.id, {"cancelled", "completed", "failed"})
+    assert job.status == "cancelled" and job.finished_at is not None
+    # Abgeschlossene Jobs bleiben unverändert
+    assert job_service.cancel_job(job.id).status == "cancelled"
+
+def test_interrupted_job_is_requeued():
+    """Ein beim Neustart laufender Job wird wieder eingereiht und abgeschlossen."""
+    simulation = setup_jobs()
+    interrupted = job_service.SimulationJob(project_id="r", request=request(1, "r"), status="running", days_total=1, days_done=1)
+    with open(job_service.JOBS_FILE, "w", encoding="utf-8") as f:
+        json.dump([interrupted.model_dump()], f, default=str)
+
+    job_service._load_jobs_from_disk()
+    assert job_service.get_job(interrupted.id).days_done == 0
+    simulation.release.release()
+    job = wait_for(interrupted.id, {"completed", "failed"})
+    assert job.status == "completed", job.error
+
+def main():
+    print("Starte Tests für die Simulations-Jobs...")
+    failed = 0
+    for test in (test_job_completes_with_summary, test_cancel_running_job, test_interrupted_job_is_requeued):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
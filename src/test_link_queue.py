@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testskript für das Link-Queue-Modell (Rückstau zwischen Kanten).
+
+Prüft die Abbiegematrix an einer Kreuzung, den Fluss auf einem Ring unter der
+Kapazität (gleiche Mengen wie das statistische Modell) und den Rückstau hinter
+einer Kante mit kleiner Kapazität.
+
+Verwendung:
+    python src/test_link_queue.py
+    python -m pytest -q src/test_link_queue.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.link_queue_model import (
+    build_turning_matrix, prepare_link_queue_network, simulate_link_queue, compute_link_queue_traffic, EXIT_SHARE
+)
+
+STEP_STARTS = np.array([8 * 60, 9 * 60])
+
+def test_turning_matrix():
+    """Abbiegen nach Kapazität, ohne Wenden ausser in Sackgassen."""
+    # Kante 0: a->b, danach b->c (Kapazität 300), b->d (100) oder zurück b->a; c->b endet nur mit Wenden
+    turning = build_turning_matrix(["a", "b", "b", "b", "c"], ["b", "c", "d", "a", "b"], np.array([500, 300, 100, 500, 300])).toarray()
+    assert np.allclose(turning[0], [0, 0.75 * (1 - EXIT_SHARE), 0.25 * (1 - EXIT_SHARE), 0, 0])
+    assert np.isclose(turning[1, 4], 1 - EXIT_SHARE)  # Sackgasse bei c: nur Wenden
+    assert turning[2].sum() == 0  # Keine Kante ab d, alle verlassen das Netz
+    assert np.allclose(turning.sum(axis=1)[[0, 1, 3, 4]], 1 - EXIT_SHARE)
+
+def test_ring_below_capacity():
+    """Auf einem Ring unter der Kapazität fliessen Zufluss / EXIT_SHARE Fahrzeuge pro Stunde."""
+    network = prepare_link_queue_network(["0", "1", "2", "3"], ["1", "2", "3", "0"], np.full(4, 100.0), np.full(4, 50.0), np.full(4, 1000.0))
+    demand = np.full((len(STEP_STARTS), 4, 1), 100.0 * EXIT_SHARE)
+    traffic = simulate_link_queue(network, STEP_STARTS, 60, demand)
+    assert np.allclose(traffic["traffic_volume"], 100.0, rtol=1e-3)
+    assert np.allclose(traffic["congestion_level"], 0.1, rtol=1e-3)
+
+def test_queue_spills_back():
+    """Hinter einer Kante mit 60 Fahrzeugen pro Stunde staut sich der Verkehr auf die vorherige Kante zurück."""
+    network = prepare_link_queue_network(["0", "1"], ["1", "2"], np.array([200.0, 200.0]), np.full(2, 50.0), np.array([1000.0, 60.0]))
+    demand = np.zeros((len(STEP_STARTS), 2, 1))
+    demand[:, 0] = 600.0
+    traffic = simulate_link_queue(network, STEP_STARTS, 60, demand)
+    volume, congestion = traffic["traffic_volume"][..., 0], traffic["congestion_level"][..., 0]
+    assert np.allclose(volume[:, 1], 60.0)
+    assert np.all(volume[:, 0] < 600.0)
+    assert np.allclose(congestion[:, 0], 1.0)
+
+def test_replications_are_seeded():
+    """Mit Replikationen erhält das Ergebnis eine führende Achse, derselbe Seed dieselben Mengen."""
+    network = prepare_link_queue_network(["0", "1", "2"], ["1", "2", "0"], np.full(3, 150.0), np.full(3, 30.0), np.full(3, 800.0))
+    args = (network, STEP_STARTS, 60, np.array([2, 0]), np.array([1.0, 1.0, 0.0]), np.full(3, 800.0))
+    first = compute_link_queue_traffic(*args, replications=4, rng=np.random.default_rng(9))
+    second = compute_link_queue_traffic(*args, replications=4, rng=np.random.default_rng(9))
+    assert first["traffic_volume"].shape == (4, len(STEP_STARTS), 3)
+    assert first["traffic_volume"].dtype == np.int64
+    assert np.array_equal(first["traffic_volume"], second["traffic_volume"])
+
+def main():
+    print("Starte Tests für das Link-Queue-Modell...")
+    failed = 0
+    for test in (test_turning_matrix, test_ring_below_capacity, test_queue_spills_back, test_replications_are_seeded):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
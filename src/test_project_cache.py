@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Testskript für den Projekt-Cache.
+
+Prüft mit der SQLite-Datenbank, dass wiederholte Abfragen die zwischengespeicherten
+Projekte liefern, eigene Schreibzugriffe den Cache direkt nachführen und ein
+Schreibzugriff eines anderen Prozesses (hier eine zweite SQLite-Verbindung) den
+Cache verwirft.
+
+Verwendung:
+    python src/test_project_cache.py
+    python -m pytest -q src/test_project_cache.py
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.project import ProjectCreate, ProjectUpdate
+from app.services import project_repository, project_service
+
+def test_cache_follows_store_version():
+    """Cache-Treffer bis zu einer fremden Änderung, eigene Änderungen ohne Verwerfen."""
+    tmp = tempfile.mkdtemp(prefix="vdss_cache_")
+    project_service.PROJECT_STORE = "sqlite"
+    project_repository.PROJECTS_DB = os.path.join(tmp, "projects.db")
+    project_repository.PROJECTS_JSON_FILE = os.path.join(tmp, "projects.json")
+    project_service._refresh_edge_features = lambda project: None # Kein Strassennetz laden
+    # Der Versionszähler einer neuen Datenbank beginnt wieder bei 0, also den Cache leeren
+    project_service._PROJECT_CACHE.clear()
+    project_service._ALL_PROJECTS = None
+    project_service._CACHE_VERSION = None
+
+    first = project_service.create_project(ProjectCreate(name="Hardturm", file_name="plan.xlsx"), "plan.xlsx")
+    second = project_service.create_project(ProjectCreate(name="Letzigrund", file_name="plan.xlsx"), "plan.xlsx")
+    assert project_service.get_project(first.id) is project_service.get_project(first.id)
+    assert [p.name for p in project_service.get_all_projects()] == ["Hardturm", "Letzigrund"]
+
+    # Eigene Änderungen ersetzen nur den betroffenen Eintrag
+    invalidations = project_service.project_cache_info()["invalidations"]
+    project_service.update_project(first.id, ProjectUpdate(name="Hardturm Ost"))
+    project_service.delete_project(second.id)
+    assert [p.name for p in project_service.get_all_projects()] == ["Hardturm Ost"]
+    info = project_service.project_cache_info()
+    assert info["invalidations"] == invalidations and info["all_projects_cached"]
+
+    # Eine zweite Verbindung steht für einen anderen API-Prozess
+    connection = sqlite3.connect(project_repository.PROJECTS_DB)
+    data = json.loads(connection.execute("SELECT data FROM projects WHERE id = ?", (first.id,)).fetchone()[0])
+    with connection:
+        connection.execute("UPDATE projects SET data = ? WHERE id = ?", (json.dumps({**data, "file_name": "neu.xlsx"}), first.id))
+    connection.close()
+
+    assert project_service.get_project(first.id).file_name == "neu.xlsx"
+    assert project_service.project_cache_info()["invalidations"] == invalidations + 1
+
+def main():
+    print("Starte Tests für den Projekt-Cache...")
+    try:
+        test_cache_follows_store_version()
+        print("  OK      test_cache_follows_store_version")
+    except AssertionError as e:
+        print(f"  FEHLER  test_cache_follows_store_version: {e}")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
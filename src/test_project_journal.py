@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testskript für das Projekt-Journal (PROJECT_STORE=json).
+
+Schreibt Projekte als Journal-Einträge neben einen Snapshot, löscht und
+kompaktiert sie und prüft, dass ein neu gestarteter Prozess (zurückgesetzter
+Zustand) dieselben Projekte liest, auch nach einem abgeschnittenen Eintrag.
+
+Verwendung:
+    python src/test_project_journal.py
+    python -m pytest -q src/test_project_journal.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import project_journal
+
+def project(project_id, name):
+    return {"id": project_id, "name": name, "file_name": "plan.xlsx", "file_path": "plan.xlsx", "created_at": "2024-09-02T08:00:00"}
+
+def names():
+    return [p["name"] for p in project_journal.list_projects()]
+
+def test_put_delete_compact():
+    """Einträge im Journal überstehen Löschen, Kompaktieren und einen Neustart."""
+    saved_file = project_journal.PROJECTS_FILE
+    tmp = tempfile.mkdtemp(prefix="vdss_journal_")
+    project_journal.PROJECTS_FILE = os.path.join(tmp, "projects.json")
+    project_journal._reset_state()
+    journal = project_journal.journal_path(project_journal.PROJECTS_FILE)
+    try:
+        project_journal.put_project(project("a", "A"))
+        project_journal.put_project(project("b", "B"))
+        project_journal.update_project("a", lambda stored: {**stored, "name": "A2"})
+        assert project_journal.delete_project("b") > 0
+        assert project_journal.delete_project("b") == 0
+        assert names() == ["A2"]
+        assert not os.path.exists(project_journal.PROJECTS_FILE) # Bis zur Kompaktierung nur das Journal
+
+        assert project_journal.compact() == 1
+        assert os.path.getsize(journal) == 0
+        with open(project_journal.PROJECTS_FILE, "r", encoding="utf-8") as f:
+            assert [p["name"] for p in json.load(f)] == ["A2"]
+
+        # Ein abgeschnittener Eintrag (Absturz beim Schreiben) wird übersprungen und stört den nächsten nicht
+        with open(journal, "ab") as f:
+            f.write(b'{"op": "put", "project": {"id": "x"')
+        project_journal.put_project(project("c", "C"))
+
+        project_journal._reset_state()
+        assert names() == ["A2", "C"]
+        assert [p["name"] for p in project_journal.read_projects(project_journal.PROJECTS_FILE)] == ["A2", "C"]
+    finally:
+        project_journal.PROJECTS_FILE = saved_file
+        project_journal._reset_state()
+
+def main():
+    print("Starte Tests für das Projekt-Journal...")
+    try:
+        test_put_delete_compact()
+        print("  OK      test_put_delete_compact")
+    except AssertionError as e:
+        print(f"  FEHLER  test_put_delete_compact: {e}")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Projektliste der API (GET /api/projects/).
+
+Legt sieben Projekte an und folgt mit beiden Speichern (SQLite und JSON) den
+Cursor-Seiten über den Link-Header. Prüft ausserdem die Zusammenfassung ohne
+Geometrien und die bedingte Abfrage mit ETag.
+
+Verwendung:
+    python src/test_project_list.py
+    python -m pytest -q src/test_project_list.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.project import ProjectCreate
+from app.services import project_journal, project_repository, project_service
+
+SITE = {"type": "Polygon", "coordinates": [[[8.49, 47.39], [8.5, 47.39], [8.5, 47.395], [8.49, 47.39]]]}
+
+client = TestClient(app) # Ohne Kontextmanager, die Simulations-Jobs werden nicht fortgesetzt
+
+def check_project_list(store):
+    tmp = tempfile.mkdtemp(prefix=f"vdss_list_{store}_")
+    project_service.PROJECT_STORE = store
+    project_journal.PROJECTS_FILE = project_repository.PROJECTS_JSON_FILE = os.path.join(tmp, "projects.json")
+    project_repository.PROJECTS_DB = os.path.join(tmp, "projects.db")
+    project_journal._reset_state()
+    project_service._PROJECT_CACHE.clear()
+    project_service._ALL_PROJECTS = None
+    project_service._CACHE_VERSION = None
+    project_service._refresh_edge_features = lambda project: None # Kein Strassennetz laden
+
+    ids = [
+        project_service.create_project(ProjectCreate(name=f"P{i}", file_name="plan.xlsx", polygon=SITE, map_bounds=SITE), "plan.xlsx").id
+        for i in range(7)
+    ]
+
+    # Seiten über den Link-Header verfolgen, jedes Projekt genau einmal
+    names, pages, url = [], 0, "/api/projects/?fields=summary&limit=3"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert all("polygon" not in project for project in response.json())
+        names += [project["name"] for project in response.json()]
+        pages += 1
+        url = response.links.get("next", {}).get("url")
+    assert pages == 3 and names == [f"P{i}" for i in range(7)]
+
+    full = client.get("/api/projects/?limit=10").json()
+    assert [project["id"] for project in full] == ids and full[0]["polygon"] == SITE
+    assert client.get("/api/projects/?cursor=ungueltig").status_code == 400
+
+    # Unveränderte Liste: 304 ohne Inhalt, nach einer Änderung wieder 200
+    etag = client.get("/api/projects/?fields=summary").headers["ETag"]
+    unchanged = client.get("/api/projects/?fields=summary", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    project_service.delete_project(ids[0])
+    assert client.get("/api/projects/?fields=summary", headers={"If-None-Match": etag}).status_code == 200
+
+def test_project_list_sqlite():
+    """Cursor-Seiten und ETag mit dem SQLite-Speicher."""
+    check_project_list("sqlite")
+
+def test_project_list_json():
+    """Cursor-Seiten und ETag mit dem JSON-Speicher."""
+    check_project_list("json")
+
+def main():
+    print("Starte Tests für die Projektliste...")
+    failed = 0
+    for test in (test_project_list_sqlite, test_project_list_json):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
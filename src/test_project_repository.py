@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Testskript für die SQLite-Projektdatenbank.
+
+Prüft Speichern und Lesen der Projektzeilen (Geometrien als JSON-Blobs), den
+Versionszähler der Trigger, die einmalige Übernahme einer bestehenden
+projects.json und gleichzeitige Änderungen aus mehreren Threads. Jede Prüfung
+verwendet eine eigene Datenbank in einem temporären Verzeichnis.
+
+Verwendung:
+    python src/test_project_repository.py
+    python -m pytest -q src/test_project_repository.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+import threading
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import project_repository
+
+TMP_DIR = tempfile.mkdtemp(prefix="vdss_repository_")
+
+SITE = {"type": "Polygon", "coordinates": [[[8.503, 47.393], [8.506, 47.393], [8.506, 47.394], [8.503, 47.393]]]}
+
+def use_database(name, legacy_projects=None):
+    """Stellt auf eine neue Datenbank um, optional mit einer projects.json zum Übernehmen."""
+    project_repository.PROJECTS_DB = os.path.join(TMP_DIR, f"{name}.db")
+    project_repository.PROJECTS_JSON_FILE = os.path.join(TMP_DIR, f"{name}.json")
+    if legacy_projects is not None:
+        with open(project_repository.PROJECTS_JSON_FILE, "w", encoding="utf-8") as f:
+            json.dump(legacy_projects, f)
+
+def row(project_id, name, created_at="2024-09-02T08:00:00", **fields):
+    return {"id": project_id, "name": name, "file_name": "plan.xlsx", "file_path": "plan.xlsx", "created_at": created_at, **fields}
+
+def test_rows_round_trip():
+    """Geometrien und übrige Felder kommen unverändert zurück, jeder Schreibzugriff erhöht die Version."""
+    use_database("round_trip")
+    version = project_repository.store_version()
+    project_repository.put_project_row(row("a", "Hardturm", polygon=SITE, access_routes=[SITE], delivery_days=["Monday"]))
+    project_repository.put_project_row(row("b", "Letzigrund"))
+    assert project_repository.store_version() == version + 2
+
+    stored = project_repository.get_project_row("a")
+    assert stored["polygon"] == SITE and stored["access_routes"] == [SITE]
+    assert stored["delivery_days"] == ["Monday"]
+    assert project_repository.get_project_row_by_name("Letzigrund")["id"] == "b"
+    assert [p["id"] for p in project_repository.list_project_rows()] == ["a", "b"]
+
+    assert project_repository.delete_project_row("b")
+    assert not project_repository.delete_project_row("b")
+    assert project_repository.get_project_row("b") is None
+    assert project_repository.store_version() == version + 3
+
+def test_legacy_json_imported_once():
+    """Eine bestehende projects.json wird beim ersten Zugriff übernommen, danach nicht mehr."""
+    use_database("legacy", [row("old", "Altprojekt", polygon=SITE)])
+    assert project_repository.get_project_row("old")["polygon"] == SITE
+
+    # Gelöschte Projekte dürfen nicht aus der JSON-Datei zurückkehren
+    project_repository.delete_project_row("old")
+    project_repository._INITIALIZED_PATHS.discard(project_repository.PROJECTS_DB)
+    project_repository._LOCAL.connection = None
+    assert project_repository.list_project_rows() == []
+
+def test_concurrent_updates_are_kept():
+    """Lesen, Ändern und Schreiben in einer Transaktion verliert keine gleichzeitigen Änderungen."""
+    use_database("concurrent")
+    project_repository.put_project_row(row("a", "Zähler", selected_counters=[]))
+
+    def add_counters(worker):
+        for i in range(10):
+            project_repository.update_project_row(
+                "a", lambda project: {**project, "selected_counters": project["selected_counters"] + [f"{worker}-{i}"]}
+            )
+
+    threads = [threading.Thread(target=add_counters, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(project_repository.get_project_row("a")["selected_counters"]) == 40
+    assert project_repository.update_project_row("fehlt", lambda project: project) is None
+
+def main():
+    print("Starte Tests für die Projektdatenbank...")
+    failed = 0
+    for test in (test_rows_round_trip, test_legacy_json_imported_once, test_concurrent_updates_are_kept):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
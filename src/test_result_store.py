@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Testskript für den Ergebnisspeicher der Simulation.
+
+Schreibt die Ergebnisse eines Tages als Tagesdatei (Segmente x Zeitschritte)
+und prüft, dass Index und die wieder gelesenen SimulationResult-Objekte mit
+den geschriebenen übereinstimmen. Alle Dateien
+liegen in einem temporären Verzeichnis.
+
+Verwendung:
+    python src/test_result_store.py
+    python -m pytest -q src/test_result_store.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime, date, time
+
+import numpy as np
+from shapely.geometry import mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services import result_store
+from app.services.edge_features import compute_edge_features
+from app.services.simulation_service import _prepare_edge_data, _build_hour_result
+from app.services.traffic_model import compute_edge_traffic
+from src.benchmark_simulation import build_synthetic_network
+
+DAY = date(2024, 9, 2)
+STEP_TIMES = [time(8, 0), time(8, 15), time(8, 30), time(17, 45)]
+
+def build_day_results():
+    """Berechnet die Viertelstunden-Schritte eines Tages auf einem kleinen synthetischen Netz."""
+    edges, site = build_synthetic_network(30)
+    edge_data = _prepare_edge_data(compute_edge_features(edges, mapping(site)))
+    hours = np.array([step.hour + step.minute / 60 for step in STEP_TIMES])
+    deliveries = np.array([0, 2, 3, 1])
+    traffic = compute_edge_traffic(hours, deliveries, edge_data["delivery_share"], edge_data["capacity"], rng=np.random.default_rng(4))
+    return [
+        _build_hour_result(
+            project_id="test",
+            sim_datetime=datetime.combine(DAY, step),
+            edge_data=edge_data,
+            traffic_volume=traffic["traffic_volume"][i],
+            congestion_level=traffic["congestion_level"][i],
+            waiting_areas_status={},
+            deliveries_count=int(deliveries[i]),
+            construction_phase=None,
+            interval_minutes=15
+        )
+        for i, step in enumerate(STEP_TIMES)
+    ]
+
+def test_day_round_trip():
+    """Eine geschriebene Tagesdatei liefert dieselben Ergebnisse zurück."""
+    saved_dir = result_store.SIMULATIONS_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        result_store.SIMULATIONS_DIR = tmp
+        try:
+            results = build_day_results()
+            # Reihenfolge der Schritte spielt beim Schreiben keine Rolle
+            result_store.write_day("test", DAY, list(reversed(results)))
+
+            assert result_store.read_index("test") == {DAY: STEP_TIMES}
+            assert result_store.list_days("test") == [DAY]
+
+            stored = result_store.read_day("test", DAY)
+            assert list(stored) == STEP_TIMES
+            for result in results:
+                loaded = stored[result.time_steps[0].time.time()]
+                assert loaded.id == result.id
+                assert loaded.traffic_volumes == result.traffic_volumes
+                assert loaded.stats == result.stats
+                assert loaded.congestion_points == result.congestion_points
+                segments, loaded_segments = result.time_steps[0].traffic_segments, loaded.time_steps[0].traffic_segments
+                assert [s.segment_id for s in loaded_segments] == [s.segment_id for s in segments]
+                assert [s.congestion_level for s in loaded_segments] == [s.congestion_level for s in segments]
+                assert [s.coordinates for s in loaded_segments] == [s.coordinates for s in segments]
+
+            # Ein verlorener Index wird aus den Tagesdateien wiederhergestellt
+            os.remove(os.path.join(result_store.project_dir("test"), result_store.INDEX_FILE_NAME))
+            assert result_store.read_index("test") == {DAY: STEP_TIMES}
+            assert result_store.read_day("test", date(2024, 9, 3)) == {}
+        finally:
+            result_store.SIMULATIONS_DIR = saved_dir
+
+def main():
+    print("Starte Tests für den Ergebnisspeicher...")
+    failed = 0
+    for test in (test_day_round_trip,):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Testskript für den Vergleich von Szenarien mit der gespeicherten Simulation.
+
+Simuliert zwei Tage auf einem synthetischen Netz (Datenquellen des Projekts
+ersetzt, Ergebnisse in einem temporären Verzeichnis) und prüft, dass ein
+Szenario ohne Änderungen keine Abweichungen liefert und doppelt so viele
+Lieferungen nur den Lieferverkehr erhöhen.
+
+Verwendung:
+    python src/test_scenario_service.py
+    python -m pytest -q src/test_scenario_service.py
+"""
+
+import os
+import sys
+import uuid
+import tempfile
+from contextlib import ExitStack
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+import pandas as pd
+from shapely.geometry import mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.scenario import Scenario
+from app.models.simulation import SimulationRequest
+from app.services import result_store, scenario_service, simulation_service
+from app.services.edge_features import compute_edge_features
+from src.benchmark_simulation import build_synthetic_network
+
+START, END = date(2024, 9, 2), date(2024, 9, 3)
+
+SHEETS = {
+    "Deliveries": pd.DataFrame({
+        "Date": pd.to_datetime(["2024-09-02", "2024-09-02", "2024-09-03"]),
+        "TimeWindow": ["08:00-10:00", "13:00-14:00", "07:00-09:00"],
+        "VehicleType": ["LKW", "LKW", "Kran"]
+    }),
+    "Vehicles": pd.DataFrame({"VehicleType": ["LKW", "Kran"], "UnloadingMinutes": [30, 45]}),
+    "Schedule": pd.DataFrame({"Phase": ["Rohbau"], "StartDate": pd.to_datetime(["2024-09-01"]), "EndDate": pd.to_datetime(["2024-09-30"])})
+}
+
+def simulated_project():
+    """Simuliert ein Projekt und lässt die ersetzten Datenquellen für die Auswertung aktiv."""
+    edges, site = build_synthetic_network(60)
+    features = compute_edge_features(edges, mapping(site))
+    project = SimpleNamespace(
+        id=f"szenario-{uuid.uuid4().hex[:8]}", file_path="plan.xlsx", file_hash=None,
+        polygon=mapping(site), map_bounds=mapping(site), access_routes=[], waiting_areas=[mapping(site)],
+        simulation_start_time="06:00", simulation_end_time="18:00", simulation_interval="1h"
+    )
+
+    stack = ExitStack()
+    stack.enter_context(mock.patch.object(result_store, "SIMULATIONS_DIR", tempfile.mkdtemp(prefix="vdss_scenario_")))
+    stack.enter_context(mock.patch.object(simulation_service, "SIMULATION_WORKERS", 1))
+    for module in (simulation_service, scenario_service):
+        stack.enter_context(mock.patch.object(module, "get_project", lambda project_id: project))
+        stack.enter_context(mock.patch.object(module, "load_simulation_sheets", lambda path, file_hash=None: SHEETS))
+        stack.enter_context(mock.patch.object(module, "load_edge_features", lambda *args, **kwargs: features))
+
+    with stack.pop_all() as active:
+        simulation_service.run_simulation_range(SimulationRequest(project_id=project.id, start_date=START, end_date=END, seed=5))
+        return project, active.pop_all()
+
+def test_unchanged_scenario_has_no_deltas():
+    """Ein Szenario ohne Änderungen weicht in keinem Schritt und keiner Kennzahl ab."""
+    project, stack = simulated_project()
+    with stack:
+        comparison = scenario_service.evaluate_scenario(project.id, Scenario(name="unverändert"), START, END)
+    assert len(comparison.steps) == 2 * 13
+    assert all(not step.segment_indices for step in comparison.steps)
+    assert all(value == 0 for value in comparison.difference.values() if isinstance(value, (int, float)))
+    assert comparison.baseline["total_traffic"] > 0
+
+def test_more_deliveries_only_add_traffic():
+    """Doppelt so viele Lieferungen erhöhen den Verkehr und nehmen nirgends etwas weg."""
+    project, stack = simulated_project()
+    with stack:
+        comparison = scenario_service.evaluate_scenario(project.id, Scenario(name="doppelt", delivery_factor=2.0), START, END)
+    deltas = [delta for step in comparison.steps for delta in step.traffic_volume_deltas]
+    assert deltas and min(deltas) >= 0
+    assert comparison.difference["total_traffic"] > 0
+
+def main():
+    print("Starte Tests für die Szenarien...")
+    failed = 0
+    for test in (test_unchanged_scenario_has_no_deltas, test_more_deliveries_only_add_traffic):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Optimierung des Lieferplans.
+
+Prüft auf zufälligen Tagen beider Zielfunktionen, dass der vorgeschlagene Plan
+nie schlechter ist als der bestehende, und auf einem Projekt mit ersetzten
+Datenquellen, dass verschobene Lieferungen im Datumsbereich und in den
+Lieferzeiten bleiben.
+
+Verwendung:
+    python src/test_schedule_optimizer.py
+    python -m pytest -q src/test_schedule_optimizer.py
+"""
+
+import os
+import sys
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.models.schedule import ScheduleOptimizationRequest
+from app.services import schedule_optimizer
+from app.services.schedule_optimizer import _optimize_day, _hourly_loads, _objective, _congestion_table
+
+WINDOW_START, WINDOW_END = 7 * 60, 17 * 60
+
+def random_day(rng, objective, n_deliveries):
+    """Lieferungen eines Tages, gehäuft in den Spitzenstunden, mit passendem Kontext."""
+    start = rng.choice([7, 8, 15, 16], n_deliveries) * 60 + rng.choice([0, 0, 30], n_deliveries)
+    end = start + rng.choice([60, 90, 120], n_deliveries)
+    unloading = rng.uniform(10, 60, n_deliveries)
+    context = {
+        "objective": objective,
+        "traffic_weight": np.ones(n_deliveries, dtype=np.int64),
+        "unloading": unloading,
+        "service_minutes": 120.0,
+        "mean_unloading": float(unloading.mean()),
+        "waiting_capacity": 3,
+        "congestion_table": _congestion_table(rng.uniform(0, 1, 40), np.full(40, 300.0), n_deliveries)
+    }
+    return start, end, context
+
+def day_objective(start, end, context):
+    traffic, work = _hourly_loads(start, end, context["traffic_weight"], context["unloading"])
+    return _objective(traffic.sum(axis=0)[None], work.sum(axis=0)[None], context)[0]
+
+def test_objective_never_worse():
+    """Auf 20 zufälligen Tagen ist der Zielwert des Vorschlags höchstens der des bestehenden Plans."""
+    rng = np.random.default_rng(11)
+    for objective in ("congestion", "waiting"):
+        for _ in range(10):
+            n = int(rng.integers(1, 40))
+            start, end, context = random_day(rng, objective, n)
+            result = _optimize_day(start, end, np.arange(n), context, WINDOW_START, WINDOW_END, 200)
+            proposed = result["start"]
+            assert day_objective(proposed, proposed + end - start, context) <= day_objective(start, end, context) + 1e-9
+            assert result["candidates_evaluated"] > 0
+
+def test_deliveries_stay_in_range():
+    """Lieferungen am Wochenende wandern nur auf Liefertage im angefragten Bereich."""
+    deliveries = pd.DataFrame({
+        "Date": pd.to_datetime(["2024-09-07", "2024-09-08", "2024-09-09", "2024-09-09", "2024-09-09"]),
+        "TimeWindow": ["08:00-09:00", "16:00-17:00", "08:00-10:00", "08:00-09:00", "08:30-09:30"],
+        "VehicleType": ["LKW", "LKW", "Kran", "LKW", "LKW"]
+    })
+    project = SimpleNamespace(
+        id="p", file_path="plan.xlsx", file_hash=None, polygon={}, map_bounds={}, access_routes=[], waiting_areas=[],
+        delivery_days=["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag"], delivery_hours={"start": "07:00", "end": "17:00"},
+        simulation_start_time="06:00", simulation_end_time="18:00"
+    )
+    sheets = {"Deliveries": deliveries, "Vehicles": pd.DataFrame({"VehicleType": ["LKW", "Kran"], "UnloadingMinutes": [30, 45]})}
+    edge_data = {"delivery_share": np.array([1.0, 0.5, 0.0]), "capacity": np.array([40.0, 40.0, 600.0])}
+
+    with mock.patch.object(schedule_optimizer, "get_project", return_value=project), \
+         mock.patch.object(schedule_optimizer, "load_simulation_sheets", return_value=sheets), \
+         mock.patch.object(schedule_optimizer, "load_edge_features", return_value=object()), \
+         mock.patch.object(schedule_optimizer, "_prepare_edge_data", return_value=edge_data):
+        result = schedule_optimizer.optimize_delivery_schedule(
+            ScheduleOptimizationRequest(project_id="p", start_date=date(2024, 9, 7), end_date=date(2024, 9, 9))
+        )
+
+    # Der Samstag hat im Bereich keinen früheren Liefertag, beide Wochenendtage gehen auf den Montag
+    assert [delivery.date for delivery in result.schedule] == [date(2024, 9, 9)] * 5
+    assert result.improvement["peak_route_congestion"] >= 0
+    for delivery in result.schedule:
+        start, end = (int(t[:2]) * 60 + int(t[3:]) for t in delivery.time_window.split("-"))
+        original_start, original_end = (int(t[:2]) * 60 + int(t[3:]) for t in delivery.original_time_window.split("-"))
+        assert WINDOW_START <= start and end <= WINDOW_END
+        assert end - start == original_end - original_start
+
+def main():
+    print("Starte Tests für die Optimierung des Lieferplans...")
+    failed = 0
+    for test in (test_objective_never_worse, test_deliveries_stay_in_range):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Testskript für die reproduzierbare Simulation (Seed pro Tag).
+
+Simuliert Tage direkt aus einem Simulationskontext, ohne Projekt und ohne
+Speicher, und prüft, dass gleiche Eingaben gleiche Ergebnisse liefern, auch
+in den Prozessen des Worker-Pools, und dass Seed und Datum die Zufallszahlen
+ändern.
+
+Verwendung:
+    python src/test_seeded_simulation.py
+    python -m pytest -q src/test_seeded_simulation.py
+"""
+
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.delivery_windows import parse_time_windows
+from app.services.link_queue_model import prepare_link_queue_network
+from app.services.simulation_service import (
+    _simulate_day, _iter_simulate_dates_parallel, _simple_fallback_simulation, _day_rng
+)
+
+DATES = [date(2024, 9, 2), date(2024, 9, 3), date(2024, 9, 4), date(2024, 9, 5)]
+STEP_STARTS = np.arange(6 * 60, 18 * 60 + 1, 30)
+
+DELIVERIES = parse_time_windows(pd.DataFrame({
+    "Date": pd.to_datetime(["2024-09-02", "2024-09-02", "2024-09-03", "2024-09-04", "2024-09-05"]),
+    "TimeWindow": ["07:00-09:00", "08:30-09:30", "13:00-15:00", "16:00-17:00", "06:00-18:00"],
+    "VehicleType": ["LKW", "Kran", "LKW", "LKW", "Mischer"]
+}))
+
+def context(engine="statistical", seed=None, replications=1):
+    """Simulationskontext eines Netzes aus sechs Kanten im Ring, wie ihn _simulate_traffic aufbaut."""
+    start_nodes, end_nodes = [str(i) for i in range(6)], [str((i + 1) % 6) for i in range(6)]
+    capacity = np.array([1800.0, 1200.0, 700.0, 700.0, 400.0, 400.0])
+    return {
+        "project_id": "seed",
+        "step_starts": STEP_STARTS,
+        "step_minutes": 30,
+        "hours": STEP_STARTS / 60,
+        "delivery_share": np.array([1.0, 1.0, 0.5, 0.5, 0.0, 0.0]),
+        "capacity": capacity,
+        "deliveries": DELIVERIES,
+        "schedule": pd.DataFrame({"Phase": ["Rohbau"], "StartDate": pd.to_datetime(["2024-09-01"]), "EndDate": pd.to_datetime(["2024-09-30"])}),
+        "waiting_areas": [],
+        "waiting_capacity": np.array([2]),
+        "unloading_minutes": {"LKW": 30.0, "Kran": 60.0},
+        "replications": replications,
+        "seed": seed,
+        "engine": engine,
+        "link_queue": prepare_link_queue_network(start_nodes, end_nodes, np.full(6, 250.0), np.full(6, 50.0), capacity)
+        if engine == "link_queue" else None
+    }
+
+def same_record(first, second):
+    return (
+        np.array_equal(first["traffic_volume"], second["traffic_volume"]) and
+        np.array_equal(first["congestion_level"], second["congestion_level"]) and
+        first["waiting_areas_status"] == second["waiting_areas_status"]
+    )
+
+def test_same_inputs_same_day():
+    """Beide Modelle und Ensembles liefern für dieselben Eingaben dieselben Tage."""
+    for options in ({}, {"engine": "link_queue"}, {"replications": 5, "seed": 7}):
+        for day in DATES:
+            assert same_record(_simulate_day(day, context(**options)), _simulate_day(day, context(**options))), options
+
+def test_worker_pool_matches_api_process():
+    """Tage aus zwei Worker-Prozessen gleichen den im eigenen Prozess simulierten."""
+    sequential = list(_iter_simulate_dates_parallel(DATES, context(seed=11), workers=1))
+    pooled = list(_iter_simulate_dates_parallel(DATES, context(seed=11), workers=2))
+    assert [record["date"] for record in pooled] == DATES
+    assert all(same_record(a, b) for a, b in zip(sequential, pooled))
+
+def test_seed_and_date_change_the_draws():
+    """Ein anderer Seed oder ein anderes Datum zieht andere Zufallszahlen."""
+    day = DATES[0]
+    assert not same_record(_simulate_day(day, context(seed=1)), _simulate_day(day, context(seed=2)))
+    draws = [_day_rng("seed", None, d).random(4).tolist() for d in DATES]
+    assert len({tuple(values) for values in draws}) == len(DATES)
+
+    fallback = [
+        [[segment.traffic_volume for segment in result.time_steps[0].traffic_segments] for result in
+         _simple_fallback_simulation("seed", DATES[0], DATES[1], DELIVERIES, STEP_STARTS, 30, seed=3)]
+        for _ in range(2)
+    ]
+    assert fallback[0] == fallback[1]
+
+def main():
+    print("Starte Tests für die reproduzierbare Simulation...")
+    failed = 0
+    for test in (test_same_inputs_same_day, test_worker_pool_matches_api_process, test_seed_and_date_change_the_draws):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
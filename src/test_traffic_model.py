@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Testskript für den vektorisierten Verkehrs-Kernel.
+
+Vergleicht `compute_edge_traffic` auf einem kleinen synthetischen Netz mit der
+früheren Schleife über Kanten und Stunden und prüft die Grenzen der
+zufälligen Grundlast.
+
+Verwendung:
+    python src/test_traffic_model.py
+    python -m pytest -q src/test_traffic_model.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.traffic_model import (
+    compute_edge_traffic, distance_factor, PEAK_BASE_TRAFFIC, OFFPEAK_BASE_TRAFFIC
+)
+from src.benchmark_simulation import build_synthetic_network, HOURS
+
+def legacy_edge_traffic(edges, site_polygon, deliveries_per_hour, base_traffic):
+    """Frühere Schleife über edges.iterrows(), mit den Grundlast-Ziehungen des Kernels."""
+    traffic_volume = np.zeros((len(HOURS), len(edges)), dtype=np.int64)
+    congestion_level = np.zeros((len(HOURS), len(edges)))
+    for i in range(len(HOURS)):
+        for j, (_, edge) in enumerate(edges.iterrows()):
+            edge_line = edge['geometry']
+            distance_to_site = edge_line.distance(site_polygon)
+            factor = max(0.1, min(1.0, 1.0 / (0.1 + distance_to_site)))
+            total_traffic = int(base_traffic[i, j] + deliveries_per_hour[i] * factor * 2)
+            capacity = edge_line.length * 5
+            traffic_volume[i, j] = total_traffic
+            congestion_level[i, j] = min(1.0, total_traffic / capacity) if capacity > 0 else 0.0
+    return traffic_volume, congestion_level
+
+def test_kernel_matches_legacy_loop():
+    """Der Kernel liefert pro Kante und Stunde dieselben Werte wie die Schleife."""
+    edges, site = build_synthetic_network(40)
+    deliveries_per_hour = np.random.default_rng(0).integers(0, 6, size=len(HOURS))
+    # Planare Distanzen in Grad wie in der Schleife (ohne GeoPandas-Warnung zum geographischen CRS)
+    distances = np.array([geometry.distance(site) for geometry in edges.geometry])
+    capacity = np.array([geometry.length for geometry in edges.geometry]) * 5
+
+    traffic = compute_edge_traffic(
+        hours=HOURS,
+        deliveries_per_hour=deliveries_per_hour,
+        delivery_share=2 * distance_factor(distances),
+        capacity=capacity,
+        rng=np.random.default_rng(1)
+    )
+    traffic_volume, congestion_level = legacy_edge_traffic(edges, site, deliveries_per_hour, traffic["base_traffic"])
+
+    assert traffic["traffic_volume"].shape == (len(HOURS), len(edges))
+    assert np.array_equal(traffic["traffic_volume"], traffic_volume)
+    assert np.allclose(traffic["congestion_level"], congestion_level)
+
+def test_base_traffic_bounds():
+    """Die Grundlast liegt in den Grenzen der Haupt- bzw. Nebenverkehrszeit."""
+    hours = np.array([6.0, 7.0, 8.75, 12.5, 16.0, 18.5, 19.0])
+    traffic = compute_edge_traffic(
+        hours, np.zeros(len(hours)), np.zeros(500), np.ones(500), rng=np.random.default_rng(2)
+    )
+    peak = np.array([False, True, True, False, True, True, False])
+    base = traffic["base_traffic"]
+    assert base[peak].min() >= PEAK_BASE_TRAFFIC[0] and base[peak].max() < PEAK_BASE_TRAFFIC[1]
+    assert base[~peak].min() >= OFFPEAK_BASE_TRAFFIC[0] and base[~peak].max() < OFFPEAK_BASE_TRAFFIC[1]
+
+def main():
+    print("Starte Tests für den Verkehrs-Kernel...")
+    failed = 0
+    for test in (test_kernel_matches_legacy_loop, test_base_traffic_bounds):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Testskript für das Routing der Lieferfahrten zur Baustelle.
+
+Baut ein Gitternetz von 5 x 5 Knoten mit der Baustelle in der Mitte und prüft,
+dass alle Fahrten an der Baustelle ankommen, eine gezeichnete Zufahrt die
+Routen anzieht und ein Netz ohne Weg zur Baustelle auf die Verteilung nach
+Entfernung zurückfällt.
+
+Verwendung:
+    python src/test_truck_routing.py
+    python -m pytest -q src/test_truck_routing.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import LineString, box, mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.edge_features import compute_edge_features
+from app.services.simulation_service import _prepare_edge_data
+
+SIZE = 5
+CENTER = 2 * SIZE + 2
+SITE = mapping(box(8.4918, 47.3918, 8.4922, 47.3922))
+
+# Zufahrt von Westen entlang der mittleren Zeile bis zur Baustelle
+ACCESS_ROUTE = mapping(LineString([(8.490, 47.392), (8.492, 47.392)]))
+
+def node_position(node):
+    row, col = divmod(node, SIZE)
+    return (8.490 + 0.001 * col, 47.390 + 0.001 * row)
+
+def grid_edges(extra=()):
+    """Gitter mit Kanten in beiden Richtungen zwischen benachbarten Knoten."""
+    pairs = []
+    for node in range(SIZE * SIZE):
+        row, col = divmod(node, SIZE)
+        if col + 1 < SIZE:
+            pairs += [(node, node + 1), (node + 1, node)]
+        if row + 1 < SIZE:
+            pairs += [(node, node + SIZE), (node + SIZE, node)]
+    geometries = [LineString([node_position(u), node_position(v)]) for u, v in pairs]
+    for u, v, line in extra:
+        pairs.append((u, v))
+        geometries.append(line)
+    index = pd.MultiIndex.from_tuples([(u, v, 0) for u, v in pairs], names=["u", "v", "key"])
+    return gpd.GeoDataFrame({"highway": "residential"}, geometry=geometries, index=index, crs="EPSG:4326")
+
+def share_on(features, u, v, direction):
+    edge = features[(features["u"] == u) & (features["v"] == v)]
+    return float(edge[f"{direction}_route_share"].iloc[0])
+
+def test_all_trips_reach_the_site():
+    """Die Anteile der Kanten in die Baustelle summieren sich zu 1, ebenso die aus ihr heraus."""
+    features = compute_edge_features(grid_edges(), SITE)
+    into_site = features["v"] == CENTER
+    out_of_site = features["u"] == CENTER
+    assert np.isclose(features.loc[into_site, "inbound_route_share"].sum(), 1.0)
+    assert np.isclose(features.loc[out_of_site, "outbound_route_share"].sum(), 1.0)
+    assert features.loc[into_site, "outbound_route_share"].sum() == 0
+
+def test_access_route_attracts_trips():
+    """Auf der gezeichneten Zufahrt fahren Lieferungen, und zwar mehr als ohne Zufahrt."""
+    plain = compute_edge_features(grid_edges(), SITE)
+    routed = compute_edge_features(grid_edges(), SITE, [ACCESS_ROUTE])
+    route_edges = [(2 * SIZE, 2 * SIZE + 1), (2 * SIZE + 1, CENTER)]
+    assert routed["on_access_route"].sum() >= len(route_edges)
+    for u, v in route_edges:
+        assert share_on(routed, u, v, "inbound") > 0
+        assert share_on(routed, v, u, "outbound") > 0
+    assert share_on(routed, 2 * SIZE + 1, CENTER, "inbound") > share_on(plain, 2 * SIZE + 1, CENTER, "inbound")
+
+def test_unreachable_site_spreads_by_distance():
+    """Ohne Weg zur Baustelle sind alle Anteile 0 und die Simulation verteilt nach Entfernung."""
+    # Einzelne Kante an der Baustelle ohne Verbindung zum Gitter
+    edges = grid_edges([(100, 101, LineString([(8.4920, 47.3920), (8.4921, 47.3920)]))])
+    u, v = edges.index.get_level_values("u"), edges.index.get_level_values("v")
+    features = compute_edge_features(edges[(u != CENTER) & (v != CENTER)], SITE)
+    assert not features["inbound_route_share"].any() and not features["outbound_route_share"].any()
+
+    edge_data = _prepare_edge_data(features)
+    assert edge_data["fallback_spread"]
+    assert edge_data["delivery_share"].all()
+
+def main():
+    print("Starte Tests für das Routing der Lieferfahrten...")
+    failed = 0
+    for test in (test_all_trips_reach_the_site, test_access_route_attracts_trips, test_unreachable_site_spreads_by_distance):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
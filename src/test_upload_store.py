@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Ablage hochgeladener Dateien nach Inhalt.
+
+Prüft, dass gleiche Inhalte nur einmal abgelegt werden (Pfad aus dem
+SHA-256), dass zu grosse Uploads abgewiesen werden, ob mit oder ohne
+angekündigte Grösse, und dass keine temporären Dateien liegen bleiben.
+
+Verwendung:
+    python src/test_upload_store.py
+    python -m pytest -q src/test_upload_store.py
+"""
+
+import io
+import os
+import sys
+import asyncio
+import hashlib
+import tempfile
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from fastapi import UploadFile
+
+from app.services import upload_store
+
+def upload(content, filename="Plan.XLSX", announce_size=False):
+    """Empfängt einen Upload wie der Projekt-Router."""
+    file = UploadFile(io.BytesIO(content), filename=filename, size=len(content) if announce_size else None)
+    return asyncio.run(upload_store.receive_upload(file))
+
+def temp_files():
+    tmp_dir = os.path.join(upload_store.UPLOADS_DIR, "tmp")
+    return os.listdir(tmp_dir) if os.path.isdir(tmp_dir) else []
+
+def test_same_content_stored_once():
+    """Zwei Uploads mit gleichem Inhalt teilen sich eine Datei, ein anderer Inhalt erhält eine eigene."""
+    upload_store.UPLOADS_DIR = tempfile.mkdtemp(prefix="vdss_uploads_")
+    content = b"Vorgangsname;Anfangstermin\n" * 5000
+    tmp_path, file_hash = upload(content)
+    assert file_hash == hashlib.sha256(content).hexdigest()
+    stored = upload_store.store_upload(tmp_path, file_hash)
+    assert stored == os.path.join(upload_store.UPLOADS_DIR, file_hash[:2], f"{file_hash}.xlsx")
+
+    again = upload_store.store_upload(*upload(content, filename="kopie.xlsx"))
+    other = upload_store.store_upload(*upload(content + b"x"))
+    assert again == stored and other != stored
+    with open(stored, "rb") as f:
+        assert f.read() == content
+    assert temp_files() == []
+
+def test_upload_limit():
+    """Zu grosse Uploads werden abgewiesen, beim Kopieren angefangene Dateien entfernt."""
+    upload_store.UPLOADS_DIR = tempfile.mkdtemp(prefix="vdss_uploads_")
+    saved_limit, saved_chunk = upload_store.MAX_UPLOAD_BYTES, upload_store.UPLOAD_CHUNK_BYTES
+    upload_store.MAX_UPLOAD_BYTES, upload_store.UPLOAD_CHUNK_BYTES = 1000, 256
+    try:
+        for announce_size in (True, False):
+            try:
+                upload(b"x" * 1001, announce_size=announce_size)
+                raise AssertionError("Upload über dem Limit wurde angenommen")
+            except ValueError:
+                pass
+        assert temp_files() == []
+        tmp_path, _ = upload(b"x" * 1000)
+        upload_store.discard_upload(tmp_path)
+        assert temp_files() == []
+    finally:
+        upload_store.MAX_UPLOAD_BYTES, upload_store.UPLOAD_CHUNK_BYTES = saved_limit, saved_chunk
+
+def main():
+    print("Starte Tests für die Upload-Ablage...")
+    failed = 0
+    for test in (test_same_content_stored_once, test_upload_limit):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
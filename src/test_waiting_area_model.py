@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testskript für das Wartezonen-Modell.
+
+Prüft die Kapazität der Wartezonen aus ihrer Fläche (floor(Fläche / 60 m²),
+mindestens ein Lastwagen), eine kleine Warteschlange mit bekanntem Ablauf und
+die Entladezeiten pro Fahrzeugtyp samt Standardwert.
+
+Verwendung:
+    python src/test_waiting_area_model.py
+    python -m pytest -q src/test_waiting_area_model.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from shapely.geometry import box, mapping
+
+# Füge das Hauptverzeichnis zum Python-Pfad hinzu, um Module zu importieren
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(current_dir)
+sys.path.append(project_root)
+
+from app.services.edge_features import METRIC_CRS
+from app.services.waiting_area_model import (
+    waiting_area_capacities, simulate_waiting_areas, unloading_minutes_by_type, unloading_minutes_of,
+    TRUCK_BAY_AREA_M2, DEFAULT_UNLOADING_MINUTES
+)
+
+def area_polygon(width_m, height_m):
+    """GeoJSON-Rechteck mit der gegebenen Fläche, in der Nähe des Hardturm-Areals."""
+    x, y = 2681000.0, 1249500.0
+    metric = gpd.GeoSeries([box(x, y, x + width_m, y + height_m)], crs=METRIC_CRS)
+    return mapping(metric.to_crs("EPSG:4326").iloc[0])
+
+def test_capacity_from_area():
+    """Kapazität ist floor(Fläche / 60 m²), kleine und ungültige Flächen halten einen Lastwagen."""
+    areas = [area_polygon(30, 20), area_polygon(25, 25), area_polygon(5, 5), {"type": "Polygon", "coordinates": []}]
+    capacities = waiting_area_capacities(areas)
+    assert capacities.tolist() == [int(600 // TRUCK_BAY_AREA_M2), int(625 // TRUCK_BAY_AREA_M2), 1, 1]
+    assert capacities.tolist() == [10, 10, 1, 1]
+    assert len(waiting_area_capacities([])) == 0
+
+def test_queue_overflows_to_street():
+    """Ein Entladeplatz, eine Wartezone für einen Lastwagen: der dritte wartet auf der Strasse."""
+    result = simulate_waiting_areas(
+        np.array([0.0, 0.0, 0.0]), np.array([10.0, 10.0, 10.0]), np.array([1]), unloading_bays=1, horizon=60
+    )
+    assert result["waiting_time"].tolist() == [0.0, 10.0, 20.0]
+    assert result["overflow"].sum() == 1
+    # Minute 0-9: einer in der Zone, einer auf der Strasse; danach rückt der Strassen-Lastwagen nach
+    assert result["occupancy"][5, 0] == 1 and result["street_queue"][5] == 1
+    assert result["occupancy"][15, 0] == 1 and result["street_queue"][15] == 0
+    assert result["occupancy"][25].sum() == 0
+
+def test_unloading_minutes_default():
+    """Fahrzeugtypen ohne Entladezeit und Blätter ohne die Spalte nutzen den Standardwert."""
+    vehicles = pd.DataFrame({"VehicleType": ["LKW", "Kran", "Mischer"], "UnloadingMinutes": [30, None, "x"]})
+    minutes = unloading_minutes_by_type(vehicles)
+    assert minutes == {"LKW": 30.0}
+    per_delivery = unloading_minutes_of(pd.Series(["LKW", "Kran", None]), minutes)
+    assert per_delivery.tolist() == [30.0, DEFAULT_UNLOADING_MINUTES, DEFAULT_UNLOADING_MINUTES]
+    assert unloading_minutes_by_type(pd.DataFrame({"VehicleType": ["LKW"]})) == {}
+
+def main():
+    print("Starte Tests für das Wartezonen-Modell...")
+    failed = 0
+    for test in (test_capacity_from_area, test_queue_overflows_to_street, test_unloading_minutes_default):
+        try:
+            test()
+            print(f"  OK      {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  FEHLER  {test.__name__}: {e}")
+    if failed:
+        print(f"{failed} Test(s) fehlgeschlagen.")
+        sys.exit(1)
+    print("Alle Tests erfolgreich!")
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ from config import API_URL  # Import centralized config
 
 # --- Imports für Seiten-Module ---
 from modules.project_setup import show_project_setup
-from modules.admin import show_admin_panel, refresh_projects
+from modules.admin import show_admin_panel, refresh_projects, load_project
 from modules.dashboard import show_dashboard
 from modules.resident_info import show_resident_info
 
@@ -163,13 +163,16 @@ def create_sidebar():
             if selected_project_name:
                 selected_project = project_options[selected_project_name]
                 if not st.session_state.get("current_project") or selected_project["id"] != st.session_state.current_project["id"]:
-                    st.session_state.current_project = selected_project
-                    # Reset view flags when project changes
-                    for key in list(st.session_state.keys()):
-                        if key.startswith("view_set_"):
-                            del st.session_state[key]
-                    # Force rerun to update
-                    st.rerun()
+                    # The list only holds summaries, load the complete project
+                    full_project = load_project(selected_project["id"])
+                    if full_project is not None:
+                        st.session_state.current_project = full_project
+                        # Reset view flags when project changes
+                        for key in list(st.session_state.keys()):
+                            if key.startswith("view_set_"):
+                                del st.session_state[key]
+                        # Force rerun to update
+                        st.rerun()
         
         st.sidebar.markdown("---")
         